@@ -63,4 +63,22 @@ class APIWrapper(object):
         :return: API execution result.
         :rtype: str | unicode | bool | int | list | dict
         """
-        return await self._executor.execute(request, response_handler)
+        if not (request.write or request.exclusive):
+            return await self._executor.execute(request, response_handler)
+        caches = [
+            cache for cache in
+            (self._conn.result_cache, self._conn.document_cache)
+            if cache is not None
+        ]
+        if not caches:
+            return await self._executor.execute(request, response_handler)
+
+        # Invalidate before and after the write, so that no read started in
+        # between can cache the results of a partially applied write.
+        for cache in caches:
+            cache.invalidate(request.write, request.exclusive)
+        try:
+            return await self._executor.execute(request, response_handler)
+        finally:
+            for cache in caches:
+                cache.invalidate(request.write, request.exclusive)
@@ -1,10 +1,30 @@
 from __future__ import absolute_import, unicode_literals
 
-__all__ = ['AQL', 'AQLQueryCache']
+__all__ = [
+    'AQL',
+    'AQLQueryCache',
+    'AQLResultCache',
+    'BatchSizeTuner',
+    'PreparedQuery',
+    'QueryPlanCache',
+    'QueryProfiler'
+]
+
+import asyncio
+import csv
+import json
+import sys
+import uuid
+from collections import OrderedDict, deque
+from functools import partial
+from time import monotonic
+
+from six import string_types
 
 from .api import APIWrapper
-from .cursor import Cursor
+from .cursor import Cursor, ParallelCursor, RawCursor
 from .exceptions import (
+    ArangoError,
     AQLQueryExplainError,
     AQLQueryValidateError,
     AQLQueryExecuteError,
@@ -12,6 +32,7 @@ from .exceptions import (
     AQLQueryClearError,
     AQLQueryTrackingGetError,
     AQLQueryKillError,
+    AQLQueryTimeoutError,
     AQLQueryTrackingSetError,
     AQLFunctionCreateError,
     AQLFunctionDeleteError,
@@ -27,6 +48,9 @@ from .formatter import (
     format_aql_tracking
 )
 from .request import Request
+from .utils import get_query_fingerprint
+
+_QUERY_TAG = 'aioarangodb:'
 
 
 class AQL(APIWrapper):
@@ -53,9 +77,18 @@ class AQL(APIWrapper):
         """
         return AQLQueryCache(self._conn, self._executor)
 
-    def explain(self, query, all_plans=False, max_plans=None, opt_rules=None):
+    def explain(self,
+                query,
+                all_plans=False,
+                max_plans=None,
+                opt_rules=None,
+                bind_vars=None):
         """Inspect the query and return its metadata without executing it.
 
+        If the plan cache is enabled (see
+        :func:`arango.aql.AQL.enable_plan_cache`), the optimal plan is
+        recorded in it, unless **opt_rules** is given.
+
         :param query: Query to inspect.
         :type query: str | unicode
         :param all_plans: If set to True, all possible execution plans are
@@ -66,6 +99,8 @@ class AQL(APIWrapper):
         :type max_plans: int
         :param opt_rules: List of optimizer rules.
         :type opt_rules: list
+        :param bind_vars: Bind variables for the query.
+        :type bind_vars: dict
         :return: Execution plan, or plans if **all_plans** was set to True.
         :rtype: dict | list
         :raise arango.exceptions.AQLQueryExplainError: If explain fails.
@@ -75,17 +110,23 @@ class AQL(APIWrapper):
             options['maxNumberOfPlans'] = max_plans
         if opt_rules is not None:
             options['optimizer'] = {'rules': opt_rules}
+        data = {'query': query, 'options': options}
+        if bind_vars is not None:
+            data['bindVars'] = bind_vars
 
         request = Request(
             method='post',
             endpoint='/_api/explain',
-            data={'query': query, 'options': options}
+            data=data
         )
+        plan_cache = self._conn.plan_cache
 
         def response_handler(resp):
             if not resp.is_success:
                 raise AQLQueryExplainError(resp, request)
             if 'plan' in resp.body:
+                if plan_cache is not None and opt_rules is None:
+                    plan_cache.record(query, bind_vars, resp.body['plan'])
                 return resp.body['plan']
             else:
                 return resp.body['plans']
@@ -119,6 +160,79 @@ class AQL(APIWrapper):
 
         return self._execute(request, response_handler)
 
+    @staticmethod
+    def _query_data(query,
+                    count=False,
+                    batch_size=None,
+                    ttl=None,
+                    bind_vars=None,
+                    full_count=None,
+                    max_plans=None,
+                    optimizer_rules=None,
+                    cache=None,
+                    memory_limit=0,
+                    fail_on_warning=None,
+                    profile=None,
+                    max_transaction_size=None,
+                    max_warning_count=None,
+                    intermediate_commit_count=None,
+                    intermediate_commit_size=None,
+                    satellite_sync_wait=None,
+                    stream=None,
+                    skip_inaccessible_cols=None,
+                    max_runtime=None):
+        """Return the cursor request payload of a query.
+
+        See :func:`arango.aql.AQL.execute` for the parameters.
+
+        :return: Request payload.
+        :rtype: dict
+        """
+        data = {'query': query, 'count': count}
+        if batch_size is not None:
+            data['batchSize'] = batch_size
+        if ttl is not None:
+            data['ttl'] = ttl
+        if bind_vars is not None:
+            data['bindVars'] = bind_vars
+        if cache is not None:
+            data['cache'] = cache
+        if memory_limit is not None:
+            data['memoryLimit'] = memory_limit
+
+        options = {}
+        if full_count is not None:
+            options['fullCount'] = full_count
+        if max_plans is not None:
+            options['maxNumberOfPlans'] = max_plans
+        if optimizer_rules is not None:
+            options['optimizer'] = {'rules': optimizer_rules}
+        if fail_on_warning is not None:
+            options['failOnWarning'] = fail_on_warning
+        if profile is not None:
+            options['profile'] = profile
+        if max_transaction_size is not None:
+            options['maxTransactionSize'] = max_transaction_size
+        if max_warning_count is not None:
+            options['maxWarningCount'] = max_warning_count
+        if intermediate_commit_count is not None:
+            options['intermediateCommitCount'] = intermediate_commit_count
+        if intermediate_commit_size is not None:
+            options['intermediateCommitSize'] = intermediate_commit_size
+        if satellite_sync_wait is not None:
+            options['satelliteSyncWait'] = satellite_sync_wait
+        if stream is not None:
+            options['stream'] = stream
+        if skip_inaccessible_cols is not None:
+            options['skipInaccessibleCollections'] = skip_inaccessible_cols
+        if max_runtime is not None:
+            options['maxRuntime'] = max_runtime
+
+        if options:
+            data['options'] = options
+        data.update(options)
+        return data
+
     def execute(self,
                 query,
                 count=False,
@@ -141,7 +255,14 @@ class AQL(APIWrapper):
                 write_collections=None,
                 stream=None,
                 skip_inaccessible_cols=None,
-                max_runtime=None):
+                max_runtime=None,
+                raw=False,
+                local_cache=False,
+                partition_bind_var=None,
+                partition_size=10000,
+                partition_concurrency=4,
+                timeout=None,
+                kill_on_cancel=False):
         """Execute the query and return the result cursor.
 
         :param query: Query to execute.
@@ -233,69 +354,736 @@ class AQL(APIWrapper):
             it is killed. The value is specified in seconds. Default value
             is 0.0 (no timeout).
         :type max_runtime: int | float
+        :param raw: If set to True, a :class:`arango.cursor.RawCursor` is
+            returned which yields the result batches as undecoded JSON bytes
+            instead of individual documents.
+        :type raw: bool
+        :param local_cache: If set to True and the in-process result cache is
+            enabled (see :func:`arango.aql.AQL.enable_result_cache`), the
+            results of this read-only query are served from and stored in the
+            cache. The collections read are taken from **read_collections**,
+            or detected via explain if not given. Queries which write are
+            never cached. Ignored outside of the default execution context.
+        :type local_cache: bool
+        :param partition_bind_var: Name of a bind variable holding a list
+            (e.g. of document keys) which can be split into chunks. If given,
+            the query is executed once per chunk of **partition_size** items,
+            with up to **partition_concurrency** queries running concurrently,
+            and a :class:`arango.cursor.ParallelCursor` yielding the results
+            of the chunks in order is returned. This keeps request bodies and
+            server memory usage bounded. Parameters **count** and
+            **full_count** then apply to each chunk separately.
+        :type partition_bind_var: str | unicode
+        :param partition_size: Max number of items per chunk.
+        :type partition_size: int
+        :param partition_concurrency: Max number of chunks executed
+            concurrently.
+        :type partition_concurrency: int
+        :param timeout: Client-side deadline in seconds for executing the
+            query and fetching all its batches. When it expires, the query is
+            killed on the server, the cursor is closed and
+            :class:`arango.exceptions.AQLQueryTimeoutError` is raised. Unlike
+            **max_runtime**, this also covers network delays and slow
+            consumers of streaming cursors. Applies only to the default
+            execution context. The query bypasses the server-side query
+            results cache.
+        :type timeout: int | float
+        :param kill_on_cancel: If set to True, the query is killed on the
+            server if the coroutine awaiting this method is cancelled, and
+            the cursor is closed if a fetch of the next batch is cancelled.
+            Applies only to the default execution context. The query bypasses
+            the server-side query results cache.
+        :type kill_on_cancel: bool
         :return: Result cursor.
-        :rtype: arango.cursor.Cursor
+        :rtype: arango.cursor.Cursor | arango.cursor.RawCursor |
+            arango.cursor.ParallelCursor
         :raise arango.exceptions.AQLQueryExecuteError: If execute fails.
+        :raise arango.exceptions.AQLQueryTimeoutError: If the deadline
+            expires.
         """
-        data = {'query': query, 'count': count}
-        if batch_size is not None:
-            data['batchSize'] = batch_size
-        if ttl is not None:
-            data['ttl'] = ttl
-        if bind_vars is not None:
-            data['bindVars'] = bind_vars
-        if cache is not None:
-            data['cache'] = cache
-        if memory_limit is not None:
-            data['memoryLimit'] = memory_limit
-
-        options = {}
-        if full_count is not None:
-            options['fullCount'] = full_count
-        if max_plans is not None:
-            options['maxNumberOfPlans'] = max_plans
-        if optimizer_rules is not None:
-            options['optimizer'] = {'rules': optimizer_rules}
-        if fail_on_warning is not None:
-            options['failOnWarning'] = fail_on_warning
-        if profile is not None:
-            options['profile'] = profile
-        if max_transaction_size is not None:
-            options['maxTransactionSize'] = max_transaction_size
-        if max_warning_count is not None:
-            options['maxWarningCount'] = max_warning_count
-        if intermediate_commit_count is not None:
-            options['intermediateCommitCount'] = intermediate_commit_count
-        if intermediate_commit_size is not None:
-            options['intermediateCommitSize'] = intermediate_commit_size
-        if satellite_sync_wait is not None:
-            options['satelliteSyncWait'] = satellite_sync_wait
-        if stream is not None:
-            options['stream'] = stream
-        if skip_inaccessible_cols is not None:
-            options['skipInaccessibleCollections'] = skip_inaccessible_cols
-        if max_runtime is not None:
-            options['maxRuntime'] = max_runtime
-
-        if options:
-            data['options'] = options
-        data.update(options)
+        if partition_bind_var is not None:
+            items = (bind_vars or {}).get(partition_bind_var)
+            assert isinstance(items, (list, tuple)), \
+                'bind variable {} must be a list'.format(partition_bind_var)
+            assert partition_size > 0, 'partition_size must be a positive int'
+            sources = [
+                partial(
+                    self.execute,
+                    query,
+                    count=count,
+                    batch_size=batch_size,
+                    ttl=ttl,
+                    bind_vars=dict(bind_vars, **{
+                        partition_bind_var:
+                            items[index:index + partition_size]
+                    }),
+                    full_count=full_count,
+                    max_plans=max_plans,
+                    optimizer_rules=optimizer_rules,
+                    cache=cache,
+                    memory_limit=memory_limit,
+                    fail_on_warning=fail_on_warning,
+                    profile=profile,
+                    max_transaction_size=max_transaction_size,
+                    max_warning_count=max_warning_count,
+                    intermediate_commit_count=intermediate_commit_count,
+                    intermediate_commit_size=intermediate_commit_size,
+                    satellite_sync_wait=satellite_sync_wait,
+                    read_collections=read_collections,
+                    write_collections=write_collections,
+                    stream=stream,
+                    skip_inaccessible_cols=skip_inaccessible_cols,
+                    max_runtime=max_runtime,
+                    raw=raw,
+                    local_cache=local_cache,
+                    timeout=timeout,
+                    kill_on_cancel=kill_on_cancel
+                )
+                for index in range(0, len(items), partition_size)
+            ]
+            return _resolve(ParallelCursor(
+                sources,
+                partition_concurrency,
+                ordered=True
+            ))
+
+        tuner = self._conn.batch_tuner
+        profiler = self._conn.profiler
+        plan_cache = self._conn.plan_cache
+        fingerprint = call_site = None
+        if tuner is not None or profiler is not None or \
+                plan_cache is not None:
+            fingerprint = get_query_fingerprint(query)
+        if plan_cache is not None and self.context == 'default' and \
+                plan_cache.claim(fingerprint):
+            self._conn.cursors.spawn(self._explain_once(
+                query,
+                bind_vars,
+                plan_cache,
+                fingerprint
+            ))
+        if profiler is not None:
+            call_site = profiler.call_site()
+        if tuner is not None and batch_size is None and not raw:
+            batch_size = tuner.batch_size(fingerprint)
+        else:
+            tuner = None
+
+        tag = deadline = None
+        if self.context == 'default' and (timeout or kill_on_cancel):
+            # Tag the query so that its server-side ID can be looked up. The
+            # tag is unique, so the query never hits the server-side query
+            # results cache, which is keyed by query text.
+            tag = uuid.uuid4().hex
+            query = '{} /* {}{} */'.format(query, _QUERY_TAG, tag)
+            if timeout:
+                deadline = monotonic() + timeout
+
+        data = self._query_data(
+            query,
+            count,
+            batch_size,
+            ttl,
+            bind_vars,
+            full_count,
+            max_plans,
+            optimizer_rules,
+            cache,
+            memory_limit,
+            fail_on_warning,
+            profile,
+            max_transaction_size,
+            max_warning_count,
+            intermediate_commit_count,
+            intermediate_commit_size,
+            satellite_sync_wait,
+            stream,
+            skip_inaccessible_cols,
+            max_runtime
+        )
 
         request = Request(
             method='post',
             endpoint='/_api/cursor',
             data=data,
             read=read_collections,
-            write=write_collections
+            write=write_collections,
+            deserialize=not raw
         )
 
         def response_handler(resp):
             if not resp.is_success:
+                if raw:
+                    resp = self._conn.prep_response(resp)
+                if profiler is not None:
+                    profiler.record_error(fingerprint, call_site)
                 raise AQLQueryExecuteError(resp, request)
-            return Cursor(self._conn, resp.body)
-
+            cursor_class = RawCursor if raw else Cursor
+            cursor = cursor_class(
+                self._conn,
+                resp.body,
+                ttl=ttl,
+                response=resp,
+                started=started,
+                deadline=deadline,
+                kill_on_cancel=tag is not None and kill_on_cancel
+            )
+            if tuner is not None:
+                cursor.add_done_callback(partial(tuner.record, fingerprint))
+            if profiler is not None:
+                cursor.add_done_callback(
+                    partial(profiler.record, fingerprint, call_site)
+                )
+            return cursor
+
+        started = monotonic()
+        cache = self._conn.result_cache
+        caches = [
+            item for item in (cache, self._conn.document_cache)
+            if item is not None
+        ]
+        if caches and write_collections is None:
+            # Writes declared via write_collections invalidate the caches in
+            # _execute. Otherwise, clear them if the query turns out to write.
+            def response_handler(resp, handler=response_handler):
+                cursor = handler(resp)
+                stats = cursor.statistics()
+                if stats and stats.get('modified'):
+                    for item in caches:
+                        item.clear()
+                return cursor
+
+        if cache is not None and write_collections is None:
+            if local_cache and not raw and self.context == 'default' \
+                    and tag is None:
+                return self._execute_cached(
+                    request,
+                    response_handler,
+                    read_collections
+                )
+
+        if tag is not None:
+            return self._execute_tracked(request, response_handler, tag,
+                                         deadline)
         return self._execute(request, response_handler)
 
+    async def _execute_tracked(self, request, response_handler, tag, deadline):
+        """Execute a tagged query, killing it if the caller gives up on it.
+
+        :param request: Query request.
+        :type request: arango.request.Request
+        :param response_handler: Query response handler.
+        :type response_handler: callable
+        :param tag: Unique tag in the query text.
+        :type tag: str | unicode
+        :param deadline: Time (as returned by :func:`time.monotonic`) by which
+            the query must complete, or None for no deadline.
+        :type deadline: float | None
+        :return: Result cursor.
+        :rtype: arango.cursor.Cursor | arango.cursor.RawCursor
+        :raise arango.exceptions.AQLQueryTimeoutError: If the deadline
+            expires.
+        """
+        try:
+            return await asyncio.wait_for(
+                self._execute(request, response_handler),
+                None if deadline is None else deadline - monotonic()
+            )
+        except asyncio.TimeoutError:
+            self._conn.cursors.spawn(self._kill_tagged(tag))
+            raise AQLQueryTimeoutError('query deadline expired')
+        except asyncio.CancelledError:
+            self._conn.cursors.spawn(self._kill_tagged(tag))
+            raise
+
+    async def _kill_tagged(self, tag, attempts=3, interval=0.1):
+        """Kill the running queries with the given tag.
+
+        The query may not be registered on the server yet when the client
+        gives up on it, so the lookup is retried a few times.
+
+        :param tag: Unique tag in the query text.
+        :type tag: str | unicode
+        :param attempts: Max number of lookups.
+        :type attempts: int
+        :param interval: Seconds between lookups.
+        :type interval: int | float
+        :return: Number of queries killed.
+        :rtype: int
+        """
+        marker = _QUERY_TAG + tag
+        for attempt in range(attempts):
+            if attempt:
+                await asyncio.sleep(interval)
+            try:
+                queries = await self.queries()
+            except ArangoError:
+                return 0
+            ids = [q['id'] for q in queries if marker in q['query']]
+            killed = 0
+            for query_id in ids:
+                try:
+                    await self.kill(query_id)
+                    killed += 1
+                except ArangoError:
+                    pass
+            if ids:
+                return killed
+        return 0
+
+    async def _explain_once(self, query, bind_vars, plan_cache, fingerprint):
+        """Record the plan of a new query fingerprint in the plan cache.
+
+        :param query: Query.
+        :type query: str | unicode
+        :param bind_vars: Bind variables of the query.
+        :type bind_vars: dict | None
+        :param plan_cache: Plan cache holding the claim on the fingerprint.
+        :type plan_cache: arango.aql.QueryPlanCache
+        :param fingerprint: Query fingerprint.
+        :type fingerprint: str | unicode
+        """
+        try:
+            await self.explain(query, bind_vars=bind_vars)
+        except ArangoError:
+            # Invalid queries fail on execution as well.
+            pass
+        finally:
+            # Let a later execution explain the fingerprint again if this
+            # one failed.
+            plan_cache.release(fingerprint)
+
+    async def _collections(self, query, bind_vars):
+        """Return the collections accessed by a query, detected via explain.
+
+        :param query: Query.
+        :type query: str | unicode
+        :param bind_vars: Bind variables of the query.
+        :type bind_vars: dict | None
+        :return: Names of the collections read, or None if the query writes.
+        :rtype: [str | unicode] | None
+        :raise arango.exceptions.AQLQueryExplainError: If explain fails.
+        """
+        cache = self._conn.result_cache
+        key = cache.key({'query': query, 'bindVars': {
+            name: value for name, value in (bind_vars or {}).items()
+            if name.startswith('@')
+        }})
+        try:
+            return cache.collections[key]
+        except KeyError:
+            pass
+
+        request = Request(
+            method='post',
+            endpoint='/_api/explain',
+            data={'query': query, 'bindVars': bind_vars or {}}
+        )
+
+        def response_handler(resp):
+            if not resp.is_success:
+                raise AQLQueryExplainError(resp, request)
+            collections = resp.body['plan']['collections']
+            if any(col['type'] != 'read' for col in collections):
+                return None
+            return sorted(col['name'] for col in collections)
+
+        collections = await self._execute(request, response_handler)
+        if len(cache.collections) >= cache.max_size:
+            cache.collections.clear()
+        cache.collections[key] = collections
+        return collections
+
+    async def _execute_cached(self, request, response_handler, collections):
+        """Serve a read-only query from the in-process result cache.
+
+        :param request: Query request.
+        :type request: arango.request.Request
+        :param response_handler: Query response handler.
+        :type response_handler: callable
+        :param collections: Names of the collections read by the query, or
+            None to detect them via explain.
+        :type collections: str | unicode | [str | unicode] | None
+        :return: Result cursor.
+        :rtype: arango.cursor.Cursor
+        """
+        cache = self._conn.result_cache
+        key = cache.key(request.data)
+        data = cache.get(key)
+        if data is not None:
+            # Deserialize a copy per hit, so that callers modifying their
+            # results do not modify the cached ones.
+            return Cursor(self._conn, self._conn.deserialize(data))
+
+        if collections is None:
+            collections = await self._collections(
+                request.data['query'],
+                request.data.get('bindVars')
+            )
+            if collections is None:
+                return await self._execute(request, response_handler)
+        elif isinstance(collections, string_types):
+            collections = [collections]
+
+        generation = cache.generation(collections)
+        cursor = await self._execute(request, response_handler)
+        data = {
+            'result': [doc async for doc in cursor],
+            'hasMore': False,
+            'extra': {}
+        }
+        if cursor.count() is not None:
+            data['count'] = cursor.count()
+        if cursor.statistics() is not None:
+            data['extra']['stats'] = cursor.statistics()
+        if cursor.warnings() is not None:
+            data['extra']['warnings'] = cursor.warnings()
+        if cursor.profile() is not None:
+            data['extra']['profile'] = cursor.profile()
+        cache.put(
+            key,
+            self._conn.serialize(dict(data, cached=True)),
+            collections,
+            generation
+        )
+        return Cursor(self._conn, dict(data, cached=False))
+
+    def enable_result_cache(self, max_size=1000, ttl=60):
+        """Enable the in-process result cache for read-only queries.
+
+        The cache is shared by all API wrappers of the connection. Queries are
+        served from the cache only if executed with **local_cache** set to
+        True. Cached results are invalidated whenever this client writes to a
+        collection the query read from. Writes by other clients are not
+        detected, so choose the **ttl** accordingly.
+
+        :param max_size: Max number of cached query results. The least
+            recently used results are evicted first.
+        :type max_size: int
+        :param ttl: Time-to-live of the cached results in seconds, or None
+            for no expiry.
+        :type ttl: int | float | None
+        :return: Result cache.
+        :rtype: arango.aql.AQLResultCache
+        """
+        self._conn.result_cache = AQLResultCache(max_size, ttl)
+        return self._conn.result_cache
+
+    def disable_result_cache(self):
+        """Disable and clear the in-process result cache."""
+        self._conn.result_cache = None
+
+    @property
+    def result_cache(self):
+        """Return the in-process result cache.
+
+        :return: Result cache, or None if not enabled.
+        :rtype: arango.aql.AQLResultCache | None
+        """
+        return self._conn.result_cache
+
+    async def execute_many(self, queries, concurrency=8, **options):
+        """Execute many independent queries with bounded concurrency.
+
+        The cursor of each query is fully read and closed, so this is meant
+        for queries with small results (e.g. one lookup per user).
+
+        :param queries: Queries. Each query is either a query string, a
+            (query, bind_vars) tuple or a dictionary of parameters of
+            :func:`arango.aql.AQL.execute`.
+        :type queries: [str | unicode | tuple | dict]
+        :param concurrency: Max number of queries executed concurrently.
+        :type concurrency: int
+        :param options: Options of :func:`arango.aql.AQL.execute` applied to
+            all queries (e.g. **batch_size**), unless overridden per query.
+        :return: Results of each query in order. If a query fails, its
+            exception object is returned in its place instead of being raised.
+        :rtype: [list | arango.exceptions.ArangoError]
+        """
+        assert concurrency > 0, 'concurrency must be a positive int'
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(query):
+            if isinstance(query, dict):
+                kwargs = dict(options, **query)
+            elif isinstance(query, tuple):
+                kwargs = dict(options, query=query[0], bind_vars=query[1])
+            else:
+                kwargs = dict(options, query=query)
+
+            async with semaphore:
+                cursor = None
+                try:
+                    cursor = await self.execute(**kwargs)
+                    return [item async for item in cursor]
+                except ArangoError as err:
+                    return err
+                finally:
+                    # Queries with a partitioned bind variable return a
+                    # ParallelCursor, which closes its open sources.
+                    if isinstance(cursor, ParallelCursor):
+                        await cursor.close()
+                    elif cursor is not None and cursor.has_more():
+                        await cursor.close(ignore_missing=True)
+
+        tasks = [asyncio.ensure_future(run(query)) for query in queries]
+        try:
+            return await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def execute_partitioned(self,
+                                  query,
+                                  collection,
+                                  attribute='_key',
+                                  partitions=None,
+                                  concurrency=4,
+                                  bind_vars=None,
+                                  **options):
+        """Execute the query over ranges of a collection concurrently.
+
+        The values of **attribute** in **collection** are split into ranges
+        of roughly equal document counts. The query is executed once per
+        range, with the bounds of the range passed as bind variables
+        ``@lower`` (inclusive) and ``@upper`` (exclusive), e.g.:
+
+        .. code-block:: none
+
+            FOR doc IN students
+                FILTER doc._key >= @lower AND doc._key < @upper
+                RETURN doc
+
+        The query should filter on an indexed attribute. The ranges are
+        bounded by ``null`` and ``[]`` (the lowest value and the lowest
+        array in AQL type order), so documents whose attribute is an array
+        or object are not matched.
+
+        The bounds are computed upfront by one query per bound, which skips
+        to the value of **attribute** at the bound's offset in sort order.
+        These queries use a persistent or skiplist index on **attribute** if
+        there is one (the primary index for "_key"); otherwise each of them
+        reads the whole collection, keeping only the values up to its offset
+        in server memory.
+
+        There are several ranges per concurrent cursor by default, so that
+        workers finishing early pick up the remaining ranges. The results of
+        the cursors are merged in no particular order.
+
+        :param query: Query template using the bind variables ``@lower`` and
+            ``@upper``.
+        :type query: str | unicode
+        :param collection: Name of the collection to partition.
+        :type collection: str | unicode
+        :param attribute: Top-level attribute to partition on (e.g. "_key"
+            or a numeric attribute).
+        :type attribute: str | unicode
+        :param partitions: Number of ranges. Default value is four times the
+            value of **concurrency**.
+        :type partitions: int
+        :param concurrency: Max number of cursors fetched concurrently.
+        :type concurrency: int
+        :param bind_vars: Other bind variables for the query.
+        :type bind_vars: dict
+        :param options: Other options of :func:`arango.aql.AQL.execute`
+            (e.g. **batch_size** or **stream**).
+        :return: Cursor merging the results of all ranges.
+        :rtype: arango.cursor.ParallelCursor
+        :raise arango.exceptions.AQLQueryExecuteError: If execute fails.
+        """
+        partitions = partitions or concurrency * 4
+        assert partitions > 0, 'partitions must be a positive int'
+
+        cursor = await self.execute(
+            'RETURN LENGTH(@@collection)',
+            bind_vars={'@collection': collection}
+        )
+        count = await cursor.next()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def bound(offset):
+            # Each bound is read on its own, so that the server only keeps
+            # the values up to the offset instead of the whole collection.
+            async with semaphore:
+                cursor = await self.execute(
+                    'FOR doc IN @@collection SORT doc.@attribute '
+                    'LIMIT @offset, 1 RETURN doc.@attribute',
+                    bind_vars={
+                        '@collection': collection,
+                        'attribute': attribute,
+                        'offset': offset
+                    }
+                )
+                return [value async for value in cursor]
+
+        values = await asyncio.gather(*[
+            bound(count * index // partitions)
+            for index in range(1, partitions)
+        ])
+        bounds = [None]
+        for value in sum(values, []):
+            if value is not None and value != bounds[-1]:
+                bounds.append(value)
+        bounds.append([])
+
+        sources = []
+        for lower, upper in zip(bounds, bounds[1:]):
+            partition_vars = dict(bind_vars or {}, lower=lower, upper=upper)
+            sources.append(partial(
+                self.execute,
+                query,
+                bind_vars=partition_vars,
+                **options
+            ))
+        return ParallelCursor(sources, concurrency)
+
+    def enable_batch_tuning(self, **kwargs):
+        """Enable adaptive batch sizes for queries without **batch_size**.
+
+        The batch size of each query is tuned across executions toward a
+        target response size and latency, and remembered per query
+        fingerprint (see :func:`arango.utils.get_query_fingerprint`). The
+        tuner is shared by all API wrappers of the connection.
+
+        :param kwargs: Parameters of :class:`arango.aql.BatchSizeTuner` (e.g.
+            **target_size** or **target_latency**).
+        :return: Batch size tuner.
+        :rtype: arango.aql.BatchSizeTuner
+        """
+        self._conn.batch_tuner = BatchSizeTuner(**kwargs)
+        return self._conn.batch_tuner
+
+    def disable_batch_tuning(self):
+        """Disable adaptive batch sizes and forget the tuned values."""
+        self._conn.batch_tuner = None
+
+    @property
+    def batch_tuner(self):
+        """Return the batch size tuner.
+
+        :return: Batch size tuner, or None if not enabled.
+        :rtype: arango.aql.BatchSizeTuner | None
+        """
+        return self._conn.batch_tuner
+
+    def enable_profiler(self, **kwargs):
+        """Enable the client-side query profiler.
+
+        Executions of queries and prepared queries are aggregated per query
+        fingerprint once their cursors are depleted or closed. The profiler
+        is shared by all API wrappers of the connection.
+
+        :param kwargs: Parameters of :class:`arango.aql.QueryProfiler` (e.g.
+            **call_sites**).
+        :return: Query profiler.
+        :rtype: arango.aql.QueryProfiler
+        """
+        self._conn.profiler = QueryProfiler(**kwargs)
+        return self._conn.profiler
+
+    def disable_profiler(self):
+        """Disable the client-side query profiler."""
+        self._conn.profiler = None
+
+    @property
+    def profiler(self):
+        """Return the client-side query profiler.
+
+        :return: Query profiler, or None if not enabled.
+        :rtype: arango.aql.QueryProfiler | None
+        """
+        return self._conn.profiler
+
+    def enable_plan_cache(self, **kwargs):
+        """Enable the query plan cache and regression detector.
+
+        The plan of each new query fingerprint executed in the default
+        context is explained once in the background and cached as its
+        baseline. Plans explained later (e.g. via
+        :func:`arango.aql.AQL.check_plans` after a deployment) are compared
+        against the baselines. The cache is shared by all API wrappers of the
+        connection.
+
+        :param kwargs: Parameters of :class:`arango.aql.QueryPlanCache` (e.g.
+            **cost_threshold**).
+        :return: Query plan cache.
+        :rtype: arango.aql.QueryPlanCache
+        """
+        self._conn.plan_cache = QueryPlanCache(**kwargs)
+        return self._conn.plan_cache
+
+    def disable_plan_cache(self):
+        """Disable and clear the query plan cache."""
+        self._conn.plan_cache = None
+
+    @property
+    def plan_cache(self):
+        """Return the query plan cache.
+
+        :return: Query plan cache, or None if not enabled.
+        :rtype: arango.aql.QueryPlanCache | None
+        """
+        return self._conn.plan_cache
+
+    async def check_plans(self):
+        """Explain all queries in the plan cache again and detect regressions.
+
+        Queries which fail to explain (e.g. because a collection was dropped)
+        are reported as regressions too.
+
+        :return: Regression details with the fingerprint, query, reasons, and
+            summaries of the baseline and latest plans.
+        :rtype: [dict]
+        """
+        plan_cache = self._conn.plan_cache
+        assert plan_cache is not None, 'plan cache not enabled'
+        failures = []
+        for query, bind_vars in plan_cache.queries():
+            fingerprint = get_query_fingerprint(query)
+            # The entry may be evicted or cleared while explaining.
+            entry = plan_cache.get(fingerprint) or {}
+            try:
+                await self.explain(query, bind_vars=bind_vars)
+            except ArangoError as err:
+                failures.append({
+                    'fingerprint': fingerprint,
+                    'query': query,
+                    'reasons': ['explain failed: {}'.format(err.message)],
+                    'baseline': entry.get('baseline'),
+                    'plan': None
+                })
+        failed = {failure['fingerprint'] for failure in failures}
+        return failures + [
+            regression for regression in plan_cache.regressions()
+            if regression['fingerprint'] not in failed
+        ]
+
+    async def prepare(self, query, raw=False, **options):
+        """Validate the query once and return it prepared for execution.
+
+        The request payload of the query and its options is serialized once,
+        so that executing the prepared query only serializes the bind
+        variables. The collections read and written by the query are taken
+        from its syntax tree and declared on each execution.
+
+        :param query: Query to prepare.
+        :type query: str | unicode
+        :param raw: If set to True, executions return a
+            :class:`arango.cursor.RawCursor`.
+        :type raw: bool
+        :param options: Options of :func:`arango.aql.AQL.execute` (e.g.
+            **batch_size** or **stream**), except for **bind_vars**,
+            **read_collections**, **write_collections** and **local_cache**.
+        :return: Prepared query.
+        :rtype: arango.aql.PreparedQuery
+        :raise arango.exceptions.AQLQueryValidateError: If validation fails.
+        """
+        assert 'bind_vars' not in options, \
+            'bind_vars must be passed to PreparedQuery.execute'
+        data = self._query_data(query, **options)
+        details = await self.validate(query)
+        return PreparedQuery(self._conn, self._executor, data, details, raw)
+
     async def kill(self, query_id):
         """Kill a running query.
 
@@ -522,6 +1310,17 @@ class AQL(APIWrapper):
         return await self._execute(request, response_handler)
 
 
+async def _resolve(value):
+    """Return the value from a coroutine.
+
+    :param value: Value.
+    :type value: object
+    :return: Value.
+    :rtype: object
+    """
+    return value
+
+
 class AQLQueryCache(APIWrapper):
     """AQL Query Cache API wrapper."""
 
@@ -636,3 +1435,928 @@ class AQLQueryCache(APIWrapper):
             return True
 
         return await self._execute(request, response_handler)
+
+
+class AQLResultCache(object):
+    """In-process cache of the results of read-only AQL queries.
+
+    Results are stored fully materialized and serialized, keyed by the query
+    text, bind variables and options. Each cursor served from the cache gets
+    its own deserialized copy, so modifying its documents does not affect
+    the cached results.
+
+    :param max_size: Max number of cached query results. The least recently
+        used results are evicted first.
+    :type max_size: int
+    :param ttl: Time-to-live of the cached results in seconds, or None for no
+        expiry.
+    :type ttl: int | float | None
+    """
+
+    # Options which do not affect the query results.
+    _ignored = ('batchSize', 'ttl', 'stream')
+
+    def __init__(self, max_size=1000, ttl=60):
+        assert max_size > 0, 'max_size must be a positive int'
+        self._max_size = max_size
+        self._ttl = ttl
+        self._entries = OrderedDict()
+        self._keys = {}
+        self._generations = {}
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+        self._epoch = 0
+        # Collections accessed per query, as detected via explain.
+        self.collections = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return '<AQLResultCache {}>'.format(len(self._entries))
+
+    @property
+    def max_size(self):
+        """Return the max number of cached query results.
+
+        :return: Max number of cached query results.
+        :rtype: int
+        """
+        return self._max_size
+
+    @property
+    def ttl(self):
+        """Return the time-to-live of the cached results in seconds.
+
+        :return: Time-to-live, or None for no expiry.
+        :rtype: int | float | None
+        """
+        return self._ttl
+
+    @classmethod
+    def key(cls, data):
+        """Return the cache key of a query.
+
+        :param data: Query request payload.
+        :type data: dict
+        :return: Cache key.
+        :rtype: str | unicode
+        """
+        return json.dumps(
+            {k: v for k, v in data.items() if k not in cls._ignored},
+            sort_keys=True,
+            default=repr
+        )
+
+    def get(self, key):
+        """Return the cached results of a query.
+
+        :param key: Cache key.
+        :type key: str | unicode
+        :return: Serialized cursor initialization data, or None if not
+            cached.
+        :rtype: str | unicode | None
+        """
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] is not None \
+                and entry[0] < monotonic():
+            self._remove(key)
+            entry = None
+        if entry is None:
+            self._misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return entry[2]
+
+    def generation(self, collections):
+        """Return the write generation of the collections.
+
+        :param collections: Collection names.
+        :type collections: [str | unicode]
+        :return: Opaque value which changes whenever any of the collections
+            is invalidated.
+        :rtype: tuple
+        """
+        return (self._epoch,) + tuple(
+            self._generations.get(name, 0) for name in collections
+        )
+
+    def put(self, key, data, collections, generation=None):
+        """Cache the results of a query.
+
+        :param key: Cache key.
+        :type key: str | unicode
+        :param data: Serialized cursor initialization data with all results.
+        :type data: str | unicode
+        :param collections: Names of the collections read by the query.
+        :type collections: [str | unicode]
+        :param generation: Write generation of the collections taken before
+            the query was executed. If any of them was invalidated since, the
+            results are not cached.
+        :type generation: tuple
+        :return: True if the results were cached.
+        :rtype: bool
+        """
+        if generation is not None and \
+                generation != self.generation(collections):
+            return False
+        self._remove(key)
+        expires = None if self._ttl is None else monotonic() + self._ttl
+        self._entries[key] = (expires, tuple(collections), data)
+        for name in collections:
+            self._keys.setdefault(name, set()).add(key)
+        while len(self._entries) > self._max_size:
+            self._remove(next(iter(self._entries)))
+            self._evictions += 1
+        return True
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        for name in entry[1]:
+            keys = self._keys.get(name)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys[name]
+        return True
+
+    def invalidate(self, *collections):
+        """Drop the cached results of queries reading from the collections.
+
+        :param collections: Collection names, or lists of names. None values
+            are ignored.
+        :type collections: str | unicode | [str | unicode] | None
+        :return: Number of cached results dropped.
+        :rtype: int
+        """
+        count = 0
+        for names in collections:
+            if names is None:
+                continue
+            if isinstance(names, string_types):
+                names = [names]
+            for name in names:
+                self._generations[name] = self._generations.get(name, 0) + 1
+                for key in list(self._keys.get(name, ())):
+                    count += self._remove(key)
+        self._invalidations += count
+        return count
+
+    def clear(self):
+        """Drop all cached results."""
+        self._epoch += 1
+        self._invalidations += len(self._entries)
+        self._entries.clear()
+        self._keys.clear()
+        self.collections.clear()
+
+    def stats(self):
+        """Return the cache statistics.
+
+        :return: Number of cached results, hits, misses, evictions (due to
+            the size limit) and invalidations (due to writes).
+        :rtype: dict
+        """
+        return {
+            'size': len(self._entries),
+            'max_size': self._max_size,
+            'ttl': self._ttl,
+            'hits': self._hits,
+            'misses': self._misses,
+            'evictions': self._evictions,
+            'invalidations': self._invalidations
+        }
+
+
+_MODIFICATION_NODES = {'insert', 'update', 'replace', 'remove', 'upsert'}
+
+
+def _modified_collections(node, names):
+    """Collect the collections modified in the syntax tree of a query.
+
+    :param node: Syntax tree node.
+    :type node: dict
+    :param names: Names of the modified collections, or of the bind
+        parameters holding them (prefixed with "@").
+    :type names: set
+    """
+    sub_nodes = node.get('subNodes', ())
+    if node.get('type') in _MODIFICATION_NODES:
+        for sub_node in sub_nodes:
+            if sub_node.get('type') == 'collection':
+                names.add(sub_node['name'])
+            elif 'datasource' in sub_node.get('type', ''):
+                names.add('@' + sub_node['name'].lstrip('@'))
+    for sub_node in sub_nodes:
+        _modified_collections(sub_node, names)
+
+
+class PreparedQuery(APIWrapper):
+    """AQL query validated once and prepared for repeated execution.
+
+    Use :func:`arango.aql.AQL.prepare` to create prepared queries. They are
+    cheap to execute and may be reused across any number of executions.
+
+    :param connection: HTTP connection.
+    :type connection: arango.connection.Connection
+    :param executor: API executor.
+    :type executor: arango.executor.Executor
+    :param data: Request payload of the query without bind variables.
+    :type data: dict
+    :param details: Query details returned by :func:`arango.aql.AQL.validate`.
+    :type details: dict
+    :param raw: If set to True, executions return raw cursors.
+    :type raw: bool
+    """
+
+    def __init__(self, connection, executor, data, details, raw=False):
+        super(PreparedQuery, self).__init__(connection, executor)
+        self._data = data
+        self._details = details
+        self._raw = raw
+
+        body = connection.serialize(data)
+        assert body.endswith('}'), 'serializer must produce a JSON object'
+        self._body = body
+        self._prefix = body[:-1] + ',"bindVars":'
+
+        modified = set()
+        ast = details.get('ast', ())
+        for node in ast if isinstance(ast, list) else [ast]:
+            _modified_collections(node, modified)
+        self._write = sorted(n for n in modified if not n.startswith('@'))
+        self._write_params = sorted(n for n in modified if n.startswith('@'))
+        self._read = sorted(
+            name for name in details.get('collections', ())
+            if name not in modified
+        )
+
+    def __repr__(self):
+        return '<PreparedQuery in {}>'.format(self._conn.db_name)
+
+    @property
+    def query(self):
+        """Return the query text.
+
+        :return: Query text.
+        :rtype: str | unicode
+        """
+        return self._data['query']
+
+    @property
+    def bind_vars(self):
+        """Return the names of the bind variables of the query.
+
+        :return: Bind variable names.
+        :rtype: [str | unicode]
+        """
+        return self._details.get('bind_vars', [])
+
+    def using(self, db):
+        """Return the prepared query bound to another API execution context.
+
+        The query is neither validated nor serialized again.
+
+        :param db: Database API wrapper (e.g. a transaction database).
+        :type db: arango.database.Database
+        :return: Prepared query.
+        :rtype: arango.aql.PreparedQuery
+        """
+        query = object.__new__(PreparedQuery)
+        query.__dict__.update(self.__dict__)
+        query._conn = db.conn
+        query._executor = db._executor
+        return query
+
+    def collections(self, bind_vars=None):
+        """Return the collections read and written by the query.
+
+        The result can be passed on to
+        :func:`arango.database.StandardDatabase.begin_transaction` to declare
+        the collections of a stream transaction.
+
+        :param bind_vars: Bind variables, used to resolve collections given as
+            bind parameters (e.g. "@@collection").
+        :type bind_vars: dict
+        :return: Names of the collections read and written, keyed by "read"
+            and "write".
+        :rtype: dict
+        """
+        write = self._write
+        if self._write_params:
+            bind_vars = bind_vars or {}
+            write = write + [
+                bind_vars[name] for name in self._write_params
+                if name in bind_vars
+            ]
+        read = [name for name in self._read if name not in write]
+        return {'read': read, 'write': write}
+
+    def execute(self, bind_vars=None):
+        """Execute the prepared query and return the result cursor.
+
+        :param bind_vars: Bind variables for the query.
+        :type bind_vars: dict
+        :return: Result cursor.
+        :rtype: arango.cursor.Cursor | arango.cursor.RawCursor
+        :raise arango.exceptions.AQLQueryExecuteError: If execute fails.
+        """
+        if bind_vars is None:
+            data = self._body
+        else:
+            data = self._prefix + self._conn.serialize(bind_vars) + '}'
+        collections = self.collections(bind_vars)
+        raw = self._raw
+        profiler = self._conn.profiler
+        if profiler is not None:
+            fingerprint = get_query_fingerprint(self.query)
+            call_site = profiler.call_site()
+
+        request = Request(
+            method='post',
+            endpoint='/_api/cursor',
+            data=data,
+            read=collections['read'] or None,
+            write=collections['write'] or None,
+            deserialize=not raw
+        )
+
+        def response_handler(resp):
+            if not resp.is_success:
+                if raw:
+                    resp = self._conn.prep_response(resp)
+                if profiler is not None:
+                    profiler.record_error(fingerprint, call_site)
+                raise AQLQueryExecuteError(resp, request)
+            cursor_class = RawCursor if raw else Cursor
+            cursor = cursor_class(
+                self._conn,
+                resp.body,
+                ttl=self._data.get('ttl'),
+                response=resp,
+                started=started
+            )
+            if profiler is not None:
+                cursor.add_done_callback(
+                    partial(profiler.record, fingerprint, call_site)
+                )
+            return cursor
+
+        started = monotonic()
+        return self._execute(request, response_handler)
+
+
+class BatchSizeTuner(object):
+    """Tuner of query batch sizes, remembered per query fingerprint.
+
+    ArangoDB fixes the batch size of a cursor when the query is executed, so
+    the batch size is tuned across executions: each completed cursor reports
+    the size and latency of its batches, from which the batch size of the
+    next execution of the same query fingerprint is derived. Until a
+    fingerprint was measured, the server default batch size is used.
+
+    :param target_size: Target size of a batch response in bytes.
+    :type target_size: int
+    :param target_latency: Target round-trip time of a batch in seconds.
+    :type target_latency: int | float
+    :param min_size: Min batch size.
+    :type min_size: int
+    :param max_size: Max batch size.
+    :type max_size: int
+    :param smoothing: Weight of the latest measurement, between 0 and 1.
+    :type smoothing: float
+    :param max_entries: Max number of fingerprints remembered. The least
+        recently used fingerprints are forgotten first.
+    :type max_entries: int
+    """
+
+    def __init__(self,
+                 target_size=1 << 20,
+                 target_latency=0.1,
+                 min_size=10,
+                 max_size=10000,
+                 smoothing=0.5,
+                 max_entries=1000):
+        assert 0 < min_size <= max_size, 'invalid min_size or max_size'
+        assert 0 < smoothing <= 1, 'smoothing must be between 0 and 1'
+        self._target_size = target_size
+        self._target_latency = target_latency
+        self._min_size = min_size
+        self._max_size = max_size
+        self._smoothing = smoothing
+        self._max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return '<BatchSizeTuner {}>'.format(len(self._entries))
+
+    def batch_size(self, fingerprint):
+        """Return the tuned batch size for a query fingerprint.
+
+        :param fingerprint: Query fingerprint.
+        :type fingerprint: str | unicode
+        :return: Batch size, or None if the fingerprint was not measured yet.
+        :rtype: int | None
+        """
+        entry = self._entries.get(fingerprint)
+        if entry is None:
+            return None
+        self._entries.move_to_end(fingerprint)
+        return entry['batch_size']
+
+    def record(self, fingerprint, cursor):
+        """Tune the batch size of a query fingerprint using a cursor.
+
+        :param fingerprint: Query fingerprint.
+        :type fingerprint: str | unicode
+        :param cursor: Depleted or closed cursor of the query.
+        :type cursor: arango.cursor.Cursor
+        :return: New batch size, or None if nothing was measured.
+        :rtype: int | None
+        """
+        batches = [b for b in cursor.timings()['batches'] if b['count']]
+        if not batches:
+            return None
+
+        count = sum(b['count'] for b in batches)
+        bytes_per_doc = sum(b['size'] for b in batches) / count
+        ideal = self._target_size / max(bytes_per_doc, 1)
+
+        # The first batch includes the query execution time.
+        fetched = [b for b in batches[1:] if b['latency']]
+        latency_per_doc = None
+        if fetched:
+            latency_per_doc = (
+                sum(b['latency'] for b in fetched) /
+                sum(b['count'] for b in fetched)
+            )
+            ideal = min(ideal, self._target_latency / latency_per_doc)
+
+        entry = self._entries.get(fingerprint)
+        if entry is not None:
+            ideal = (
+                entry['batch_size'] * (1 - self._smoothing) +
+                ideal * self._smoothing
+            )
+        batch_size = int(max(self._min_size, min(self._max_size, ideal)))
+
+        self._entries[fingerprint] = {
+            'batch_size': batch_size,
+            'samples': entry['samples'] + 1 if entry else 1,
+            'bytes_per_doc': bytes_per_doc,
+            'latency_per_doc': latency_per_doc
+        }
+        self._entries.move_to_end(fingerprint)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+        return batch_size
+
+    def report(self):
+        """Return the tuned batch sizes and latest measurements.
+
+        :return: Batch size, number of samples, bytes per document and
+            latency per document (in seconds) keyed by query fingerprint.
+        :rtype: dict
+        """
+        return {key: dict(entry) for key, entry in self._entries.items()}
+
+    def clear(self):
+        """Forget all tuned batch sizes."""
+        self._entries.clear()
+
+
+def _percentile(values, fraction):
+    """Return the percentile of sorted values (nearest rank).
+
+    :param values: Sorted values.
+    :type values: [float]
+    :param fraction: Percentile as a fraction (e.g. 0.95).
+    :type fraction: float
+    :return: Percentile, or None if there are no values.
+    :rtype: float | None
+    """
+    if not values:
+        return None
+    index = int(round(fraction * (len(values) - 1)))
+    return values[index]
+
+
+class QueryProfiler(object):
+    """Client-side profiler aggregating AQL query executions per fingerprint.
+
+    Queries are normalized into fingerprints (see
+    :func:`arango.utils.get_query_fingerprint`), so that executions differing
+    only in bind variables or literal values are aggregated together, in the
+    spirit of PostgreSQL's ``pg_stat_statements``.
+
+    :param max_entries: Max number of fingerprints tracked. The least
+        recently executed fingerprints are dropped first.
+    :type max_entries: int
+    :param max_samples: Number of most recent latencies kept per fingerprint
+        to compute percentiles.
+    :type max_samples: int
+    :param call_sites: If set to True, the call sites (file and line outside
+        this library) executing each fingerprint are counted too.
+    :type call_sites: bool
+    """
+
+    # Fields of the report rows, in order.
+    fields = (
+        'fingerprint',
+        'calls',
+        'errors',
+        'total_time',
+        'mean_time',
+        'p50_time',
+        'p95_time',
+        'p99_time',
+        'server_time',
+        'p50_server_time',
+        'p95_server_time',
+        'p99_server_time',
+        'rows',
+        'bytes',
+        'scanned_full',
+        'scanned_index',
+        'warnings',
+        'call_sites'
+    )
+
+    # Fields the report rows can be sorted by.
+    sort_fields = fields[1:-1]
+
+    def __init__(self, max_entries=1000, max_samples=1000, call_sites=False):
+        self._max_entries = max_entries
+        self._max_samples = max_samples
+        self._call_sites = call_sites
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return '<QueryProfiler {}>'.format(len(self._entries))
+
+    def call_site(self):
+        """Return the call site of the current query execution.
+
+        :return: "file:line" of the first frame outside this library, or None
+            if call sites are not tracked.
+        :rtype: str | unicode | None
+        """
+        if not self._call_sites:
+            return None
+        package = __name__.split('.')[0]
+        frame = sys._getframe(1)
+        while frame is not None:
+            module = frame.f_globals.get('__name__', '')
+            if module.split('.')[0] != package or \
+                    module.startswith(package + '.tests'):
+                return '{}:{}'.format(
+                    frame.f_code.co_filename,
+                    frame.f_lineno
+                )
+            frame = frame.f_back
+        return None
+
+    def _entry(self, fingerprint):
+        entry = self._entries.get(fingerprint)
+        if entry is None:
+            entry = self._entries[fingerprint] = {
+                'calls': 0,
+                'errors': 0,
+                'total_time': 0.0,
+                'times': deque(maxlen=self._max_samples),
+                'server_time': 0.0,
+                'server_times': deque(maxlen=self._max_samples),
+                'rows': 0,
+                'bytes': 0,
+                'scanned_full': 0,
+                'scanned_index': 0,
+                'warnings': 0,
+                'call_sites': {}
+            }
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        else:
+            self._entries.move_to_end(fingerprint)
+        return entry
+
+    def record(self, fingerprint, call_site, cursor):
+        """Record a completed query execution.
+
+        :param fingerprint: Query fingerprint.
+        :type fingerprint: str | unicode
+        :param call_site: Call site of the execution, or None.
+        :type call_site: str | unicode | None
+        :param cursor: Depleted or closed cursor of the query.
+        :type cursor: arango.cursor.Cursor
+        """
+        entry = self._entry(fingerprint)
+        timings = cursor.timings()
+        elapsed = timings['fetch_time'] + timings['deserialize_time']
+        entry['calls'] += 1
+        entry['total_time'] += elapsed
+        entry['times'].append(elapsed)
+        entry['rows'] += timings['count']
+        entry['bytes'] += timings['size']
+
+        stats = cursor.statistics() or {}
+        server_time = stats.get('execution_time')
+        if server_time is not None:
+            entry['server_time'] += server_time
+            entry['server_times'].append(server_time)
+        entry['scanned_full'] += stats.get('scanned_full', 0)
+        entry['scanned_index'] += stats.get('scanned_index', 0)
+        entry['warnings'] += len(cursor.warnings() or ())
+        if call_site is not None:
+            sites = entry['call_sites']
+            sites[call_site] = sites.get(call_site, 0) + 1
+
+    def record_error(self, fingerprint, call_site):
+        """Record a failed query execution.
+
+        :param fingerprint: Query fingerprint.
+        :type fingerprint: str | unicode
+        :param call_site: Call site of the execution, or None.
+        :type call_site: str | unicode | None
+        """
+        entry = self._entry(fingerprint)
+        entry['errors'] += 1
+        if call_site is not None:
+            sites = entry['call_sites']
+            sites[call_site] = sites.get(call_site, 0) + 1
+
+    def report(self, sort_by='total_time', limit=None):
+        """Return the aggregated statistics per query fingerprint.
+
+        Times are in seconds. Client times cover the round trips and
+        deserialization of all batches, but not the time spent by the
+        consumer between fetches.
+
+        :param sort_by: Numeric field to sort the rows by, in descending
+            order (see :attr:`arango.aql.QueryProfiler.sort_fields`).
+        :type sort_by: str | unicode
+        :param limit: Max number of rows returned.
+        :type limit: int
+        :return: Report rows with the fields listed in
+            :attr:`arango.aql.QueryProfiler.fields`.
+        :rtype: [dict]
+        """
+        assert sort_by in self.sort_fields, \
+            'sort_by must be one of {}'.format(', '.join(self.sort_fields))
+        rows = []
+        for fingerprint, entry in self._entries.items():
+            times = sorted(entry['times'])
+            server_times = sorted(entry['server_times'])
+            calls = entry['calls']
+            rows.append({
+                'fingerprint': fingerprint,
+                'calls': calls,
+                'errors': entry['errors'],
+                'total_time': entry['total_time'],
+                'mean_time': entry['total_time'] / calls if calls else None,
+                'p50_time': _percentile(times, 0.5),
+                'p95_time': _percentile(times, 0.95),
+                'p99_time': _percentile(times, 0.99),
+                'server_time': entry['server_time'],
+                'p50_server_time': _percentile(server_times, 0.5),
+                'p95_server_time': _percentile(server_times, 0.95),
+                'p99_server_time': _percentile(server_times, 0.99),
+                'rows': entry['rows'],
+                'bytes': entry['bytes'],
+                'scanned_full': entry['scanned_full'],
+                'scanned_index': entry['scanned_index'],
+                'warnings': entry['warnings'],
+                'call_sites': dict(entry['call_sites'])
+            })
+        rows.sort(key=lambda row: row[sort_by] or 0, reverse=True)
+        return rows[:limit] if limit is not None else rows
+
+    def export(self, file, fmt='json', **kwargs):
+        """Write the report to a file object.
+
+        :param file: Text file object to write to.
+        :type file: io.TextIOBase
+        :param fmt: Format ("json" or "csv"). In CSV format, the call sites
+            are serialized as JSON.
+        :type fmt: str | unicode
+        :param kwargs: Parameters of :func:`arango.aql.QueryProfiler.report`.
+        """
+        assert fmt in ('json', 'csv'), 'fmt must be "json" or "csv"'
+        rows = self.report(**kwargs)
+        if fmt == 'json':
+            json.dump(rows, file, indent=2)
+        elif fmt == 'csv':
+            writer = csv.DictWriter(file, fieldnames=self.fields)
+            writer.writeheader()
+            for row in rows:
+                writer.writerow(dict(
+                    row,
+                    call_sites=json.dumps(row['call_sites'])
+                ))
+
+    def reset(self):
+        """Drop all recorded statistics."""
+        self._entries.clear()
+
+
+class QueryPlanCache(object):
+    """Cache of AQL execution plans per fingerprint with regression detection.
+
+    The first plan explained for a query fingerprint (see
+    :func:`arango.utils.get_query_fingerprint`) becomes its baseline. Later
+    plans of the same fingerprint are compared against it, and flagged as
+    regressions if they scan a collection fully where the baseline did not
+    (e.g. after an index was dropped), or if their estimated cost grew by more
+    than **cost_threshold**.
+
+    :param max_entries: Max number of fingerprints cached. The least recently
+        explained fingerprints are dropped first.
+    :type max_entries: int
+    :param cost_threshold: Ratio of the estimated cost of a plan to that of
+        the baseline above which the plan is flagged.
+    :type cost_threshold: int | float
+    """
+
+    def __init__(self, max_entries=1000, cost_threshold=1.5):
+        assert cost_threshold >= 1, 'cost_threshold must be at least 1'
+        self._max_entries = max_entries
+        self._cost_threshold = cost_threshold
+        self._entries = OrderedDict()
+        self._pending = set()
+
+    def __contains__(self, fingerprint):
+        return fingerprint in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return '<QueryPlanCache {}>'.format(len(self._entries))
+
+    @staticmethod
+    def summarize(plan):
+        """Return the details of an execution plan relevant for comparisons.
+
+        :param plan: Execution plan as returned by
+            :func:`arango.aql.AQL.explain`.
+        :type plan: dict
+        :return: Estimated cost, collections scanned fully, indexes used
+            (as "collection/index") and optimizer rules applied.
+        :rtype: dict
+        """
+        full_scans = set()
+        indexes = set()
+        for node in plan.get('nodes', ()):
+            if node['type'] == 'EnumerateCollectionNode':
+                full_scans.add(node['collection'])
+            elif node['type'] == 'IndexNode':
+                for index in node.get('indexes', ()):
+                    indexes.add('{}/{}'.format(
+                        node.get('collection'),
+                        index.get('name', index.get('id'))
+                    ))
+        return {
+            'cost': plan.get('estimatedCost'),
+            'full_scans': sorted(full_scans),
+            'indexes': sorted(indexes),
+            'rules': list(plan.get('rules', ()))
+        }
+
+    def claim(self, fingerprint):
+        """Claim a fingerprint not explained yet, so it is explained once.
+
+        :param fingerprint: Query fingerprint.
+        :type fingerprint: str | unicode
+        :return: True if the fingerprint is new and was not claimed before.
+        :rtype: bool
+        """
+        if fingerprint in self._entries or fingerprint in self._pending:
+            return False
+        self._pending.add(fingerprint)
+        return True
+
+    def release(self, fingerprint):
+        """Release the claim on a fingerprint (e.g. after explain failed).
+
+        :param fingerprint: Query fingerprint.
+        :type fingerprint: str | unicode
+        """
+        self._pending.discard(fingerprint)
+
+    def get(self, fingerprint):
+        """Return the cached plans of a fingerprint.
+
+        :param fingerprint: Query fingerprint.
+        :type fingerprint: str | unicode
+        :return: Query, bind variables, and summaries of the baseline and
+            latest plans, or None if the fingerprint is not cached.
+        :rtype: dict | None
+        """
+        entry = self._entries.get(fingerprint)
+        return None if entry is None else dict(entry)
+
+    def _compare(self, fingerprint, entry):
+        baseline, latest = entry['baseline'], entry['latest']
+        reasons = []
+        for name in latest['full_scans']:
+            if name not in baseline['full_scans']:
+                reasons.append('full scan of collection "{}"'.format(name))
+        if baseline['cost'] and latest['cost'] is not None and \
+                latest['cost'] > baseline['cost'] * self._cost_threshold:
+            reasons.append('estimated cost rose from {} to {}'.format(
+                baseline['cost'],
+                latest['cost']
+            ))
+        if not reasons:
+            return None
+        return {
+            'fingerprint': fingerprint,
+            'query': entry['query'],
+            'reasons': reasons,
+            'baseline': baseline,
+            'plan': latest
+        }
+
+    def record(self, query, bind_vars, plan):
+        """Record an explained plan and compare it against the baseline.
+
+        :param query: Query explained.
+        :type query: str | unicode
+        :param bind_vars: Bind variables the query was explained with.
+        :type bind_vars: dict | None
+        :param plan: Execution plan.
+        :type plan: dict
+        :return: Regression details, or None if the plan did not regress.
+        :rtype: dict | None
+        """
+        fingerprint = get_query_fingerprint(query)
+        self._pending.discard(fingerprint)
+        summary = self.summarize(plan)
+        entry = self._entries.get(fingerprint)
+        if entry is None:
+            self._entries[fingerprint] = {
+                'query': query,
+                'bind_vars': bind_vars,
+                'baseline': summary,
+                'latest': summary
+            }
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+            return None
+        self._entries.move_to_end(fingerprint)
+        entry['latest'] = summary
+        return self._compare(fingerprint, entry)
+
+    def regressions(self):
+        """Return the fingerprints whose latest plan regressed.
+
+        :return: Regression details with the fingerprint, query, reasons, and
+            summaries of the baseline and latest plans.
+        :rtype: [dict]
+        """
+        regressions = []
+        for fingerprint, entry in self._entries.items():
+            regression = self._compare(fingerprint, entry)
+            if regression is not None:
+                regressions.append(regression)
+        return regressions
+
+    def accept(self, fingerprint=None):
+        """Make the latest plans the new baselines (e.g. after a review).
+
+        :param fingerprint: Query fingerprint. If not given, the latest plans
+            of all fingerprints are accepted.
+        :type fingerprint: str | unicode
+        """
+        if fingerprint is None:
+            entries = self._entries.values()
+        else:
+            entries = [self._entries[fingerprint]]
+        for entry in entries:
+            entry['baseline'] = entry['latest']
+
+    def queries(self):
+        """Return the cached queries, e.g. to explain them again.
+
+        :return: Query and bind variables per cached fingerprint.
+        :rtype: [(str | unicode, dict | None)]
+        """
+        return [
+            (entry['query'], entry['bind_vars'])
+            for entry in self._entries.values()
+        ]
+
+    def clear(self):
+        """Drop all cached plans."""
+        self._entries.clear()
+        self._pending.clear()
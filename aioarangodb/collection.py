@@ -1,12 +1,27 @@
 from __future__ import absolute_import, unicode_literals
 
-__all__ = ['StandardCollection', 'VertexCollection', 'EdgeCollection']
-
+__all__ = [
+    'StandardCollection',
+    'VertexCollection',
+    'EdgeCollection',
+    'DocumentCache'
+]
+
+import asyncio
+import mmap
+import os
+from collections import OrderedDict
 from numbers import Number
+from time import monotonic
+
+from six import string_types
 
 from .api import APIWrapper
+from .aql import AQL
 from .cursor import Cursor
 from .exceptions import (
+    ArangoError,
+    AQLQueryExecuteError,
     CollectionChecksumError,
     CollectionConfigureError,
     CollectionLoadError,
@@ -44,10 +59,12 @@ from .formatter import (
 )
 from .request import Request
 from .utils import (
+    compute_patch,
     get_doc_id,
     is_none_or_int,
     is_none_or_str,
 )
+from .writer import BufferedWriter
 
 
 class Collection(APIWrapper):
@@ -170,6 +187,160 @@ class Collection(APIWrapper):
             else:
                 return doc_id, doc_id, {'If-Match': rev}
 
+    @staticmethod
+    def _for_clause(bind_vars, index_hint):
+        """Return the AQL clause iterating over the collection.
+
+        :param bind_vars: Bind variables, updated in place.
+        :type bind_vars: dict
+        :param index_hint: Name(s) of the index(es) to prefer, or None.
+        :type index_hint: str | unicode | [str | unicode] | None
+        :return: AQL FOR clause.
+        :rtype: str | unicode
+        """
+        if index_hint is None:
+            return 'FOR doc IN @@collection'
+        bind_vars['index_hint'] = index_hint
+        return 'FOR doc IN @@collection OPTIONS {indexHint: @index_hint}'
+
+    @staticmethod
+    def _limit_clause(bind_vars, skip, limit):
+        """Return the AQL clause skipping and limiting the documents.
+
+        :param bind_vars: Bind variables, updated in place.
+        :type bind_vars: dict
+        :param skip: Number of documents to skip, or None.
+        :type skip: int | None
+        :param limit: Max number of documents returned, or None.
+        :type limit: int | None
+        :return: AQL LIMIT clause, or an empty string.
+        :rtype: str | unicode
+        """
+        if skip is None and limit is None:
+            return ''
+        bind_vars['skip'] = 0 if skip is None else skip
+        bind_vars['limit'] = 2147483647 if limit is None else limit  # 2^31-1
+        return 'LIMIT @skip, @limit'
+
+    @staticmethod
+    def _return_clause(bind_vars, fields):
+        """Return the AQL clause returning the documents.
+
+        :param bind_vars: Bind variables, updated in place.
+        :type bind_vars: dict
+        :param fields: Names of the top-level fields to return, or None to
+            return whole documents.
+        :type fields: [str | unicode] | None
+        :return: AQL RETURN clause.
+        :rtype: str | unicode
+        """
+        if fields is None:
+            return 'RETURN doc'
+        assert all(isinstance(field, string_types) for field in fields), \
+            'fields must be a list of str'
+        attributes = []
+        for index, field in enumerate(fields):
+            bind_vars['field{}'.format(index)] = field
+            attributes.append('[@field{0}]: doc.@field{0}'.format(index))
+        return 'RETURN {' + ', '.join(attributes) + '}'
+
+    async def _query(self,
+                     query,
+                     bind_vars,
+                     batch_size,
+                     ttl,
+                     stream,
+                     error_class=DocumentGetError):
+        """Execute an AQL query over the collection.
+
+        The query is executed via :func:`arango.aql.AQL.execute`, so the batch
+        size tuner, query profiler and plan cache of the connection apply to
+        it. Outside of the default and transaction contexts, the returned job
+        raises :class:`arango.exceptions.AQLQueryExecuteError` on failure
+        instead of **error_class**.
+
+        :param query: AQL query.
+        :type query: str | unicode
+        :param bind_vars: Bind variables.
+        :type bind_vars: dict
+        :param batch_size: Max number of results fetched in one round trip.
+        :type batch_size: int | None
+        :param ttl: Time-to-live for the cursor on the server.
+        :type ttl: int | None
+        :param stream: Compute the results lazily on the server as they are
+            fetched, instead of upfront. Streaming cursors do not include the
+            result count.
+        :type stream: bool
+        :param error_class: Exception raised if the query fails.
+        :type error_class: type
+        :return: Result cursor.
+        :rtype: arango.cursor.Cursor
+        """
+        assert is_none_or_int(batch_size), \
+            'batch_size must be a non-negative int'
+        try:
+            return await AQL(self._conn, self._executor).execute(
+                query,
+                count=not stream,
+                batch_size=batch_size,
+                ttl=ttl,
+                bind_vars=bind_vars,
+                read_collections=[self.name],
+                stream=True if stream else None
+            )
+        except AQLQueryExecuteError as err:
+            raise error_class(err.response, err.request)
+
+    async def _get_cached(self, cache, doc_id, endpoint, field=None):
+        """Return a document through the document cache.
+
+        Fresh entries are returned without a request. Stale entries are
+        revalidated with their revision via the "If-None-Match" header.
+
+        :param cache: Document cache.
+        :type cache: arango.collection.DocumentCache
+        :param doc_id: Document ID.
+        :type doc_id: str | unicode
+        :param endpoint: Endpoint returning the document.
+        :type endpoint: str | unicode
+        :param field: Field of the response body holding the document, or None
+            if the response body is the document.
+        :type field: str | unicode
+        :return: Document, or None if not found.
+        :rtype: dict | None
+        :raise arango.exceptions.DocumentGetError: If retrieval fails.
+        """
+        entry = cache.get(doc_id)
+        if entry is not None and entry[2]:
+            return self._conn.deserialize(entry[0])
+
+        generation = cache.generation(doc_id)
+        request = Request(
+            method='get',
+            endpoint=endpoint,
+            headers={} if entry is None else {'If-None-Match': entry[1]},
+            read=self.name
+        )
+
+        def response_handler(resp):
+            if resp.status_code == 304 and entry is not None:
+                cache.touch(doc_id)
+                return self._conn.deserialize(entry[0])
+            if resp.error_code == 1202:
+                cache.discard(doc_id)
+                return None
+            if not resp.is_success:
+                raise DocumentGetError(resp, request)
+            if field is None:
+                doc, data = resp.body, resp.raw_body
+            else:
+                doc = resp.body[field]
+                data = self._conn.serialize(doc)
+            cache.put(doc_id, doc['_rev'], data, generation)
+            return doc
+
+        return await self._execute(request, response_handler)
+
     def _ensure_key_in_body(self, body):
         """Return the document body with "_key" field populated.
 
@@ -202,6 +373,109 @@ class Collection(APIWrapper):
             body['_key'] = doc_id[len(self._id_prefix):]
         return body
 
+    def _chunk(self, documents, chunk_size, chunk_bytes):
+        """Split documents into serialized JSON arrays.
+
+        :param documents: Documents.
+        :type documents: list
+        :param chunk_size: Max number of documents per chunk.
+        :type chunk_size: int
+        :param chunk_bytes: Max serialized size of a chunk. Chunks with a
+            single document may exceed it.
+        :type chunk_bytes: int
+        :return: Number of documents and serialized array per chunk.
+        :rtype: [(int, str | unicode)]
+        """
+        chunks = []
+        parts = []
+        size = 2
+        for document in documents:
+            part = self._conn.serialize(document)
+            if parts and (len(parts) == chunk_size or
+                          size + len(part) > chunk_bytes):
+                chunks.append((len(parts), '[' + ','.join(parts) + ']'))
+                parts = []
+                size = 2
+            parts.append(part)
+            size += len(part) + 1
+        if parts or not chunks:
+            chunks.append((len(parts), '[' + ','.join(parts) + ']'))
+        return chunks
+
+    async def _execute_bulk(self,
+                            request,
+                            response_handler,
+                            chunk_size,
+                            chunk_bytes,
+                            concurrency):
+        """Execute a bulk document request in concurrent chunks.
+
+        Outside of the default execution context, the request is executed as
+        is. Otherwise, its documents are split by count and serialized size
+        and the chunks are sent concurrently (spread over the hosts by the
+        host resolver). The results are reassembled in the original order.
+        If a whole chunk fails, its exception is returned in place of the
+        results of each of its documents, unless all chunks fail, in which
+        case it is raised.
+
+        :param request: Bulk request with the list of documents as payload.
+        :type request: arango.request.Request
+        :param response_handler: Response handler, returning a list of
+            results or True.
+        :type response_handler: callable
+        :param chunk_size: Max number of documents per request.
+        :type chunk_size: int
+        :param chunk_bytes: Max serialized size of the documents per request.
+        :type chunk_bytes: int
+        :param concurrency: Max number of concurrent requests.
+        :type concurrency: int
+        :return: Results per document, or True if all chunks returned True.
+        :rtype: [dict | ArangoError | bool] | bool
+        """
+        if self.context != 'default':
+            return await self._execute(request, response_handler)
+
+        assert chunk_size > 0, 'chunk_size must be a positive int'
+        assert concurrency > 0, 'concurrency must be a positive int'
+        chunks = self._chunk(request.data, chunk_size, chunk_bytes)
+        if len(chunks) == 1:
+            request.data = chunks[0][1]
+            return await self._execute(request, response_handler)
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def execute(data):
+            chunk_request = Request(
+                method=request.method,
+                endpoint=request.endpoint,
+                headers=request.headers,
+                params=request.params,
+                data=data,
+                read=request.read,
+                write=request.write
+            )
+            async with semaphore:
+                try:
+                    return await self._execute(chunk_request, response_handler)
+                except ArangoError as err:
+                    return err
+
+        outcomes = await asyncio.gather(*[
+            execute(data) for _, data in chunks
+        ])
+        if all(isinstance(outcome, ArangoError) for outcome in outcomes):
+            raise outcomes[0]
+        if all(outcome is True for outcome in outcomes):
+            return True
+
+        results = []
+        for (count, _), outcome in zip(chunks, outcomes):
+            if isinstance(outcome, list):
+                results.extend(outcome)
+            else:
+                results.extend([outcome] * count)
+        return results
+
     @property
     def name(self):
         """Return collection name.
@@ -492,7 +766,8 @@ class Collection(APIWrapper):
         """
         request = Request(
             method='put',
-            endpoint='/_api/collection/{}/truncate'.format(self.name)
+            endpoint='/_api/collection/{}/truncate'.format(self.name),
+            write=self.name
         )
 
         def response_handler(resp):
@@ -558,55 +833,84 @@ class Collection(APIWrapper):
 
         return await self._execute(request, response_handler)
 
-    async def ids(self):
+    async def ids(self, batch_size=None, ttl=None, stream=False):
         """Return the IDs of all documents in the collection.
 
+        :param batch_size: Max number of documents fetched by the cursor in
+            one round trip.
+        :type batch_size: int
+        :param ttl: Time-to-live for the cursor on the server.
+        :type ttl: int
+        :param stream: Compute the documents lazily on the server as they are
+            fetched, instead of upfront. Recommended for large collections.
+            Streaming cursors do not include the document count.
+        :type stream: bool
         :return: Document ID cursor.
         :rtype: arango.cursor.Cursor
         :raise arango.exceptions.DocumentIDsError: If retrieval fails.
         """
-        request = Request(
-            method='put',
-            endpoint='/_api/simple/all-keys',
-            data={'collection': self.name, 'type': 'id'},
-            read=self.name
+        return await self._query(
+            'FOR doc IN @@collection RETURN doc._id',
+            {'@collection': self.name},
+            batch_size,
+            ttl,
+            stream,
+            DocumentIDsError
         )
 
-        def response_handler(resp):
-            if not resp.is_success:
-                raise DocumentIDsError(resp, request)
-            return Cursor(self._conn, resp.body)
-
-        return await self._execute(request, response_handler)
-
-    async def keys(self):
+    async def keys(self, batch_size=None, ttl=None, stream=False):
         """Return the keys of all documents in the collection.
 
+        :param batch_size: Max number of documents fetched by the cursor in
+            one round trip.
+        :type batch_size: int
+        :param ttl: Time-to-live for the cursor on the server.
+        :type ttl: int
+        :param stream: Compute the documents lazily on the server as they are
+            fetched, instead of upfront. Recommended for large collections.
+            Streaming cursors do not include the document count.
+        :type stream: bool
         :return: Document key cursor.
         :rtype: arango.cursor.Cursor
         :raise arango.exceptions.DocumentKeysError: If retrieval fails.
         """
-        request = Request(
-            method='put',
-            endpoint='/_api/simple/all-keys',
-            data={'collection': self.name, 'type': 'key'},
-            read=self.name
+        return await self._query(
+            'FOR doc IN @@collection RETURN doc._key',
+            {'@collection': self.name},
+            batch_size,
+            ttl,
+            stream,
+            DocumentKeysError
         )
 
-        def response_handler(resp):
-            if not resp.is_success:
-                raise DocumentKeysError(resp, request)
-            return Cursor(self._conn, resp.body)
-
-        return await self._execute(request, response_handler)
-
-    async def all(self, skip=None, limit=None):
+    async def all(self,
+                  skip=None,
+                  limit=None,
+                  batch_size=None,
+                  ttl=None,
+                  stream=False,
+                  fields=None,
+                  index_hint=None):
         """Return all documents in the collection.
 
         :param skip: Number of documents to skip.
         :type skip: int
         :param limit: Max number of documents returned.
         :type limit: int
+        :param batch_size: Max number of documents fetched by the cursor in
+            one round trip.
+        :type batch_size: int
+        :param ttl: Time-to-live for the cursor on the server.
+        :type ttl: int
+        :param stream: Compute the documents lazily on the server as they are
+            fetched, instead of upfront. Recommended for large collections.
+            Streaming cursors do not include the document count.
+        :type stream: bool
+        :param fields: Names of the top-level fields to return. Other fields
+            are not read nor transferred.
+        :type fields: [str | unicode]
+        :param index_hint: Name(s) of the index(es) the query should prefer.
+        :type index_hint: str | unicode | [str | unicode]
         :return: Document cursor.
         :rtype: arango.cursor.Cursor
         :raise arango.exceptions.DocumentGetError: If retrieval fails.
@@ -614,25 +918,13 @@ class Collection(APIWrapper):
         assert is_none_or_int(skip), 'skip must be a non-negative int'
         assert is_none_or_int(limit), 'limit must be a non-negative int'
 
-        data = {'collection': self.name}
-        if skip is not None:
-            data['skip'] = skip
-        if limit is not None:
-            data['limit'] = limit
-
-        request = Request(
-            method='put',
-            endpoint='/_api/simple/all',
-            data=data,
-            read=self.name
-        )
-
-        def response_handler(resp):
-            if not resp.is_success:
-                raise DocumentGetError(resp, request)
-            return Cursor(self._conn, resp.body)
-
-        return await self._execute(request, response_handler)
+        bind_vars = {'@collection': self.name}
+        query = ' '.join(filter(None, [
+            self._for_clause(bind_vars, index_hint),
+            self._limit_clause(bind_vars, skip, limit),
+            self._return_clause(bind_vars, fields)
+        ]))
+        return await self._query(query, bind_vars, batch_size, ttl, stream)
 
     async def export(
             self,
@@ -693,19 +985,48 @@ class Collection(APIWrapper):
         def response_handler(resp):
             if not resp.is_success:
                 raise DocumentGetError(resp, request)
-            return Cursor(self._conn, resp.body, 'export')
+            return Cursor(
+                self._conn,
+                resp.body,
+                'export',
+                ttl=ttl,
+                response=resp
+            )
 
         return await self._execute(request, response_handler)
 
-    async def find(self, filters, skip=None, limit=None):
+    async def find(self,
+                   filters,
+                   skip=None,
+                   limit=None,
+                   batch_size=None,
+                   ttl=None,
+                   stream=False,
+                   fields=None,
+                   index_hint=None):
         """Return all documents that match the given filters.
 
-        :param filters: Document filters.
+        :param filters: Document filters. Nested dictionaries and field names
+            with dots match nested fields.
         :type filters: dict
         :param skip: Number of documents to skip.
         :type skip: int
         :param limit: Max number of documents returned.
         :type limit: int
+        :param batch_size: Max number of documents fetched by the cursor in
+            one round trip.
+        :type batch_size: int
+        :param ttl: Time-to-live for the cursor on the server.
+        :type ttl: int
+        :param stream: Compute the documents lazily on the server as they are
+            fetched, instead of upfront. Recommended for large collections.
+            Streaming cursors do not include the document count.
+        :type stream: bool
+        :param fields: Names of the top-level fields to return. Other fields
+            are not read nor transferred.
+        :type fields: [str | unicode]
+        :param index_hint: Name(s) of the index(es) the query should prefer.
+        :type index_hint: str | unicode | [str | unicode]
         :return: Document cursor.
         :rtype: arango.cursor.Cursor
         :raise arango.exceptions.DocumentGetError: If retrieval fails.
@@ -714,29 +1035,32 @@ class Collection(APIWrapper):
         assert is_none_or_int(skip), 'skip must be a non-negative int'
         assert is_none_or_int(limit), 'limit must be a non-negative int'
 
-        data = {
-            'collection': self.name,
-            'example': filters,
-            'skip': skip,
-        }
-        if limit is not None:
-            data['limit'] = limit
-
-        request = Request(
-            method='put',
-            endpoint='/_api/simple/by-example',
-            data=data,
-            read=self.name
+        bind_vars = {'@collection': self.name}
+        clauses = [self._for_clause(bind_vars, index_hint)]
+        for index, (path, value) in enumerate(_filter_paths(filters)):
+            attributes = []
+            for depth, name in enumerate(path):
+                var = 'attr{}_{}'.format(index, depth)
+                bind_vars[var] = name
+                attributes.append('@' + var)
+            bind_vars['value{}'.format(index)] = value
+            clauses.append('FILTER doc.{} == @value{}'.format(
+                '.'.join(attributes), index
+            ))
+        clauses.append(self._limit_clause(bind_vars, skip, limit))
+        clauses.append(self._return_clause(bind_vars, fields))
+        return await self._query(
+            ' '.join(filter(None, clauses)), bind_vars, batch_size, ttl, stream
         )
 
-        def response_handler(resp):
-            if not resp.is_success:
-                raise DocumentGetError(resp, request)
-            return Cursor(self._conn, resp.body)
-
-        return await self._execute(request, response_handler)
-
-    async def find_near(self, latitude, longitude, limit=None):
+    async def find_near(self,
+                        latitude,
+                        longitude,
+                        limit=None,
+                        batch_size=None,
+                        ttl=None,
+                        stream=False,
+                        fields=None):
         """Return documents near a given coordinate.
 
         Documents returned are sorted according to distance, with the nearest
@@ -750,6 +1074,18 @@ class Collection(APIWrapper):
         :type longitude: int | float
         :param limit: Max number of documents returned.
         :type limit: int
+        :param batch_size: Max number of documents fetched by the cursor in
+            one round trip.
+        :type batch_size: int
+        :param ttl: Time-to-live for the cursor on the server.
+        :type ttl: int
+        :param stream: Compute the documents lazily on the server as they are
+            fetched, instead of upfront. Recommended for large collections.
+            Streaming cursors do not include the document count.
+        :type stream: bool
+        :param fields: Names of the top-level fields to return. Other fields
+            are not read nor transferred.
+        :type fields: [str | unicode]
         :returns: Document cursor.
         :rtype: arango.cursor.Cursor
         :raises arango.exceptions.DocumentGetError: If retrieval fails.
@@ -758,11 +1094,6 @@ class Collection(APIWrapper):
         assert isinstance(longitude, Number), 'longitude must be a number'
         assert is_none_or_int(limit), 'limit must be a non-negative int'
 
-        query = """
-        FOR doc IN NEAR(@collection, @latitude, @longitude{})
-            RETURN doc
-        """.format('' if limit is None else ', @limit ')
-
         bind_vars = {
             'collection': self._name,
             'latitude': latitude,
@@ -771,23 +1102,13 @@ class Collection(APIWrapper):
         if limit is not None:
             bind_vars['limit'] = limit
 
-        request = Request(
-            method='post',
-            endpoint='/_api/cursor',
-            data={
-                'query': query,
-                'bindVars': bind_vars,
-                'count': True
-            },
-            read=self.name
-        )
-
-        def response_handler(resp):
-            if not resp.is_success:
-                raise DocumentGetError(resp, request)
-            return Cursor(self._conn, resp.body)
-
-        return await self._execute(request, response_handler)
+        query = ' '.join([
+            'FOR doc IN NEAR(@collection, @latitude, @longitude{})'.format(
+                '' if limit is None else ', @limit'
+            ),
+            self._return_clause(bind_vars, fields)
+        ])
+        return await self._query(query, bind_vars, batch_size, ttl, stream)
 
     async def find_in_range(
             self,
@@ -795,7 +1116,12 @@ class Collection(APIWrapper):
             lower,
             upper,
             skip=None,
-            limit=None):
+            limit=None,
+            batch_size=None,
+            ttl=None,
+            stream=False,
+            fields=None,
+            index_hint=None):
         """Return documents within a given range in a random order.
 
         A skiplist index must be defined in the collection to use this method.
@@ -810,6 +1136,20 @@ class Collection(APIWrapper):
         :type skip: int
         :param limit: Max number of documents returned.
         :type limit: int
+        :param batch_size: Max number of documents fetched by the cursor in
+            one round trip.
+        :type batch_size: int
+        :param ttl: Time-to-live for the cursor on the server.
+        :type ttl: int
+        :param stream: Compute the documents lazily on the server as they are
+            fetched, instead of upfront. Recommended for large collections.
+            Streaming cursors do not include the document count.
+        :type stream: bool
+        :param fields: Names of the top-level fields to return. Other fields
+            are not read nor transferred.
+        :type fields: [str | unicode]
+        :param index_hint: Name(s) of the index(es) the query should prefer.
+        :type index_hint: str | unicode | [str | unicode]
         :returns: Document cursor.
         :rtype: arango.cursor.Cursor
         :raises arango.exceptions.DocumentGetError: If retrieval fails.
@@ -821,37 +1161,25 @@ class Collection(APIWrapper):
             '@collection': self._name,
             'field': field,
             'lower': lower,
-            'upper': upper,
-            'skip': 0 if skip is None else skip,
-            'limit': 2147483647 if limit is None else limit,  # 2 ^ 31 - 1
+            'upper': upper
         }
-
-        query = """
-        FOR doc IN @@collection
-            FILTER doc.@field >= @lower && doc.@field < @upper
-            LIMIT @skip, @limit
-            RETURN doc
-        """
-
-        request = Request(
-            method='post',
-            endpoint='/_api/cursor',
-            data={
-                'query': query,
-                'bindVars': bind_vars,
-                'count': True
-            },
-            read=self.name
-        )
-
-        def response_handler(resp):
-            if not resp.is_success:
-                raise DocumentGetError(resp, request)
-            return Cursor(self._conn, resp.body)
-
-        return await self._execute(request, response_handler)
-
-    async def find_in_radius(self, latitude, longitude, radius, distance_field=None):
+        query = ' '.join(filter(None, [
+            self._for_clause(bind_vars, index_hint),
+            'FILTER doc.@field >= @lower && doc.@field < @upper',
+            self._limit_clause(bind_vars, skip, limit),
+            self._return_clause(bind_vars, fields)
+        ]))
+        return await self._query(query, bind_vars, batch_size, ttl, stream)
+
+    async def find_in_radius(self,
+                             latitude,
+                             longitude,
+                             radius,
+                             distance_field=None,
+                             batch_size=None,
+                             ttl=None,
+                             stream=False,
+                             fields=None):
         """Return documents within a given radius around a coordinate.
 
         A geo index must be defined in the collection to use this method.
@@ -865,6 +1193,18 @@ class Collection(APIWrapper):
         :param distance_field: Document field used to indicate the distance to
             the given coordinate. This parameter is ignored in transactions.
         :type distance_field: str | unicode
+        :param batch_size: Max number of documents fetched by the cursor in
+            one round trip.
+        :type batch_size: int
+        :param ttl: Time-to-live for the cursor on the server.
+        :type ttl: int
+        :param stream: Compute the documents lazily on the server as they are
+            fetched, instead of upfront. Recommended for large collections.
+            Streaming cursors do not include the document count.
+        :type stream: bool
+        :param fields: Names of the top-level fields to return. Other fields
+            are not read nor transferred.
+        :type fields: [str | unicode]
         :returns: Document cursor.
         :rtype: arango.cursor.Cursor
         :raises arango.exceptions.DocumentGetError: If retrieval fails.
@@ -874,11 +1214,6 @@ class Collection(APIWrapper):
         assert isinstance(radius, Number), 'radius must be a number'
         assert is_none_or_str(distance_field), 'distance_field must be a str'
 
-        query = """
-        FOR doc IN WITHIN(@@collection, @latitude, @longitude, @radius{})
-            RETURN doc
-        """.format('' if distance_field is None else ', @distance')
-
         bind_vars = {
             '@collection': self._name,
             'latitude': latitude,
@@ -888,23 +1223,12 @@ class Collection(APIWrapper):
         if distance_field is not None:
             bind_vars['distance'] = distance_field
 
-        request = Request(
-            method='post',
-            endpoint='/_api/cursor',
-            data={
-                'query': query,
-                'bindVars': bind_vars,
-                'count': True
-            },
-            read=self.name
-        )
-
-        def response_handler(resp):
-            if not resp.is_success:
-                raise DocumentGetError(resp, request)
-            return Cursor(self._conn, resp.body)
-
-        return await self._execute(request, response_handler)
+        query = ' '.join([
+            'FOR doc IN WITHIN(@@collection, @latitude, @longitude, @radius{})'
+            .format('' if distance_field is None else ', @distance'),
+            self._return_clause(bind_vars, fields)
+        ])
+        return await self._query(query, bind_vars, batch_size, ttl, stream)
 
     async def find_in_box(
             self,
@@ -914,7 +1238,11 @@ class Collection(APIWrapper):
             longitude2,
             skip=None,
             limit=None,
-            index=None):
+            index=None,
+            batch_size=None,
+            ttl=None,
+            stream=False,
+            fields=None):
         """Return all documents in an rectangular area.
 
         :param latitude1: First latitude.
@@ -927,11 +1255,23 @@ class Collection(APIWrapper):
         :type longitude2: int | float
         :param skip: Number of documents to skip.
         :type skip: int
-        :param limit: Max number of documents returned.
+        :param limit: Max number of documents returned. A limit of 0 means no
+            limit.
         :type limit: int
-        :param index: ID of the geo index to use (without the collection
-            prefix). This parameter is ignored in transactions.
+        :param index: Deprecated. The geo index is selected by the server.
         :type index: str | unicode
+        :param batch_size: Max number of documents fetched by the cursor in
+            one round trip.
+        :type batch_size: int
+        :param ttl: Time-to-live for the cursor on the server.
+        :type ttl: int
+        :param stream: Compute the documents lazily on the server as they are
+            fetched, instead of upfront. Recommended for large collections.
+            Streaming cursors do not include the document count.
+        :type stream: bool
+        :param fields: Names of the top-level fields to return. Other fields
+            are not read nor transferred.
+        :type fields: [str | unicode]
         :returns: Document cursor.
         :rtype: arango.cursor.Cursor
         :raises arango.exceptions.DocumentGetError: If retrieval fails.
@@ -943,35 +1283,29 @@ class Collection(APIWrapper):
         assert is_none_or_int(skip), 'skip must be a non-negative int'
         assert is_none_or_int(limit), 'limit must be a non-negative int'
 
-        data = {
-            'collection': self._name,
+        bind_vars = {
+            '@collection': self._name,
             'latitude1': latitude1,
             'longitude1': longitude1,
             'latitude2': latitude2,
-            'longitude2': longitude2,
+            'longitude2': longitude2
         }
-        if skip is not None:
-            data['skip'] = skip
-        if limit is not None:
-            data['limit'] = limit
-        if index is not None:
-            data['geo'] = self._name + '/' + index
-
-        request = Request(
-            method='put',
-            endpoint='/_api/simple/within-rectangle',
-            data=data,
-            read=self.name
-        )
-
-        def response_handler(resp):
-            if not resp.is_success:
-                raise DocumentGetError(resp, request)
-            return Cursor(self._conn, resp.body)
-
-        return await self._execute(request, response_handler)
-
-    async def find_by_text(self, field, query, limit=None):
+        query = ' '.join(filter(None, [
+            'FOR doc IN WITHIN_RECTANGLE(@@collection, @latitude1, '
+            '@longitude1, @latitude2, @longitude2)',
+            self._limit_clause(bind_vars, skip, limit or None),
+            self._return_clause(bind_vars, fields)
+        ]))
+        return await self._query(query, bind_vars, batch_size, ttl, stream)
+
+    async def find_by_text(self,
+                           field,
+                           query,
+                           limit=None,
+                           batch_size=None,
+                           ttl=None,
+                           stream=False,
+                           fields=None):
         """Return documents that match the given fulltext query.
 
         :param field: Document field with fulltext index.
@@ -980,6 +1314,18 @@ class Collection(APIWrapper):
         :type query: str | unicode
         :param limit: Max number of documents returned.
         :type limit: int
+        :param batch_size: Max number of documents fetched by the cursor in
+            one round trip.
+        :type batch_size: int
+        :param ttl: Time-to-live for the cursor on the server.
+        :type ttl: int
+        :param stream: Compute the documents lazily on the server as they are
+            fetched, instead of upfront. Recommended for large collections.
+            Streaming cursors do not include the document count.
+        :type stream: bool
+        :param fields: Names of the top-level fields to return. Other fields
+            are not read nor transferred.
+        :type fields: [str | unicode]
         :returns: Document cursor.
         :rtype: arango.cursor.Cursor
         :raises arango.exceptions.DocumentGetError: If retrieval fails.
@@ -994,54 +1340,132 @@ class Collection(APIWrapper):
         if limit is not None:
             bind_vars['limit'] = limit
 
-        aql = """
-        FOR doc IN FULLTEXT(@collection, @field, @query{})
-            RETURN doc
-        """.format('' if limit is None else ', @limit')
-
-        request = Request(
-            method='post',
-            endpoint='/_api/cursor',
-            data={'query': aql, 'bindVars': bind_vars, 'count': True},
-            read=self.name
+        aql = 'FOR doc IN FULLTEXT(@collection, @field, @query{}) {}'.format(
+            '' if limit is None else ', @limit',
+            self._return_clause(bind_vars, fields)
         )
+        return await self._query(aql, bind_vars, batch_size, ttl, stream)
 
-        def response_handler(resp):
-            if not resp.is_success:
-                raise DocumentGetError(resp, request)
-            return Cursor(self._conn, resp.body)
-
-        return await self._execute(request, response_handler)
+    async def get_many(self, documents, chunk_size=1000, concurrency=4):
+        """Return multiple documents.
 
-    async def get_many(self, documents):
-        """Return multiple documents ignoring any missing ones.
+        Large lists are split into chunks of **chunk_size** documents, which
+        are fetched concurrently in the default execution context.
 
         :param documents: List of document keys, IDs or bodies. Document bodies
             must contain the "_id" or "_key" fields.
         :type documents: [str | unicode | dict]
-        :return: Documents. Missing ones are not included.
-        :rtype: [dict]
+        :param chunk_size: Max number of documents per request.
+        :type chunk_size: int
+        :param concurrency: Max number of concurrent requests.
+        :type concurrency: int
+        :return: Documents in the order of **documents**, with None in place of
+            missing ones and exceptions in place of ones which failed.
+        :rtype: [dict | None | arango.exceptions.DocumentGetError]
         :raise arango.exceptions.DocumentGetError: If retrieval fails.
         """
-        handles = [
-            self._extract_id(doc) if isinstance(doc, dict) else doc
-            for doc in documents
+        doc_ids = [
+            self._prep_from_doc(doc, None, False)[0] for doc in documents
         ]
+        cache = self._conn.document_cache
+        if cache is not None and self.context == 'default':
+            return await self._get_many_cached(
+                cache, doc_ids, chunk_size, concurrency
+            )
+        return await self._get_many(doc_ids, chunk_size, concurrency)
+
+    async def _get_many_cached(self, cache, doc_ids, chunk_size, concurrency):
+        """Return multiple documents through the document cache.
+
+        Documents which are not cached or not fresh are fetched in bulk and
+        cached.
+
+        :param cache: Document cache.
+        :type cache: arango.collection.DocumentCache
+        :param doc_ids: Document IDs.
+        :type doc_ids: [str | unicode]
+        :param chunk_size: Max number of documents per request.
+        :type chunk_size: int
+        :param concurrency: Max number of concurrent requests.
+        :type concurrency: int
+        :return: Documents in the order of **doc_ids**, with None in place of
+            missing ones and exceptions in place of ones which failed.
+        :rtype: [dict | None | arango.exceptions.DocumentGetError]
+        :raise arango.exceptions.DocumentGetError: If retrieval fails.
+        """
+        docs = {}
+        missing = OrderedDict()
+        for doc_id in doc_ids:
+            if doc_id in docs or doc_id in missing:
+                continue
+            entry = cache.get(doc_id)
+            if entry is not None and entry[2]:
+                docs[doc_id] = self._conn.deserialize(entry[0])
+            else:
+                missing[doc_id] = True
+
+        if missing:
+            generation = cache.generation(self._id_prefix)
+            missing = list(missing)
+            results = await self._get_many(missing, chunk_size, concurrency)
+            for doc_id, doc in zip(missing, results):
+                if isinstance(doc, dict):
+                    cache.put(
+                        doc_id,
+                        doc['_rev'],
+                        self._conn.serialize(doc),
+                        generation
+                    )
+                docs[doc_id] = doc
+
+        return [docs[doc_id] for doc_id in doc_ids]
+
+    async def _get_many(self, handles, chunk_size, concurrency):
+        """Return multiple documents by key or ID.
+
+        :param handles: Document keys or IDs.
+        :type handles: [str | unicode]
+        :param chunk_size: Max number of documents per request.
+        :type chunk_size: int
+        :param concurrency: Max number of concurrent requests.
+        :type concurrency: int
+        :return: Documents in the order of **handles**, with None in place of
+            missing ones and exceptions in place of ones which failed.
+        :rtype: [dict | None | arango.exceptions.DocumentGetError]
+        :raise arango.exceptions.DocumentGetError: If retrieval fails.
+        """
+        if not handles:
+            return []
 
         request = Request(
             method='put',
-            endpoint='/_api/simple/lookup-by-keys',
-            data={'collection': self.name, 'keys': handles},
+            endpoint='/_api/document/{}'.format(self.name),
+            params={'onlyget': True},
+            data=handles,
             read=self.name
         )
 
         def response_handler(resp):
             if not resp.is_success:
                 raise DocumentGetError(resp, request)
-            docs = resp.body['documents']
-            return [doc for doc in docs if '_id' in doc]
+            results = []
+            for body in resp.body:
+                if '_id' in body:
+                    results.append(body)
+                elif body.get('errorNum') == 1202:
+                    results.append(None)
+                else:
+                    sub_resp = self._conn.prep_bulk_err_response(resp, body)
+                    results.append(DocumentGetError(sub_resp, request))
+            return results
 
-        return await self._execute(request, response_handler)
+        return await self._execute_bulk(
+            request,
+            response_handler,
+            chunk_size,
+            1 << 23,
+            concurrency
+        )
 
     async def random(self):
         """Return a random document from the collection.
@@ -1414,10 +1838,15 @@ class StandardCollection(Collection):
         :raise arango.exceptions.DocumentRevisionError: If revisions mismatch.
         """
         handle, body, headers = self._prep_from_doc(document, rev, check_rev)
+        endpoint = '/_api/document/{}'.format(handle)
+
+        cache = self._conn.document_cache
+        if cache is not None and not headers and self.context == 'default':
+            return await self._get_cached(cache, handle, endpoint)
 
         request = Request(
             method='get',
-            endpoint='/_api/document/{}'.format(handle),
+            endpoint=endpoint,
             headers=headers,
             read=self.name
         )
@@ -1465,10 +1894,11 @@ class StandardCollection(Collection):
             Ignored if parameter **silent** is set to True.
         :type return_old: bool
         :param overwrite_mode: Overwrite behavior used when the document key
-            exists already. Allowed values are "replace" (replace-insert) or
-            "update" (update-insert). Implicitly sets the value of parameter
-            **overwrite**.
-        :type overwrite_mode: str
+            exists already. Allowed values are "replace" (replace-insert),
+            "update" (update-insert), "ignore" (keep the existing document)
+            and "conflict" (fail with a unique constraint violation).
+            Implicitly sets the value of parameter **overwrite**.
+        :type overwrite_mode: str | unicode
         :param keep_none: If set to True, fields with value None are retained
             in the document. Otherwise, they are removed completely. Applies
             only when **overwrite_mode** is set to "update" (update-insert).
@@ -1525,7 +1955,13 @@ class StandardCollection(Collection):
             sync=None,
             silent=False,
             overwrite=False,
-            return_old=False):
+            return_old=False,
+            overwrite_mode=None,
+            keep_none=None,
+            merge=None,
+            chunk_size=10000,
+            chunk_bytes=1 << 23,
+            concurrency=4):
         """Insert multiple documents.
 
         .. note::
@@ -1536,6 +1972,13 @@ class StandardCollection(Collection):
             successfully (returns document metadata) and which were not
             (returns exception object).
 
+        Documents are sent in chunks of at most **chunk_size** documents and
+        **chunk_bytes** serialized characters, with up to **concurrency**
+        requests in flight. If a whole chunk fails, its exception is returned
+        in place of the result of each of its documents (or raised, if all
+        chunks fail). Chunks are written concurrently, so operations on the
+        same document in different chunks are not ordered.
+
         :param documents: List of new documents to insert. If they contain the
             "_key" or "_id" fields, the values are used as the keys of the new
             documents (auto-generated otherwise). Any "_rev" field is ignored.
@@ -1554,6 +1997,27 @@ class StandardCollection(Collection):
         :param return_old: Include body of the old documents if replaced.
             Applies only when value of **overwrite** is set to True.
         :type return_old: bool
+        :param overwrite_mode: Overwrite behavior used when a document key
+            exists already. Allowed values are "replace" (replace-insert),
+            "update" (update-insert), "ignore" (keep the existing document)
+            and "conflict" (fail with a unique constraint violation).
+            Implicitly sets the value of parameter **overwrite**.
+        :type overwrite_mode: str | unicode
+        :param keep_none: If set to True, fields with value None are retained
+            in the documents. Otherwise, they are removed completely. Applies
+            only when **overwrite_mode** is set to "update" (update-insert).
+        :type keep_none: bool
+        :param merge: If set to True (default), sub-dictionaries are merged
+            instead of the new ones overwriting the old ones. Applies only when
+            **overwrite_mode** is set to "update" (update-insert).
+        :type merge: bool
+        :param chunk_size: Max number of documents sent per request.
+        :type chunk_size: int
+        :param chunk_bytes: Max serialized size of the documents sent per
+            request.
+        :type chunk_bytes: int
+        :param concurrency: Max number of concurrent requests.
+        :type concurrency: int
         :return: List of document metadata (e.g. document keys, revisions) and
             any exception, or True if parameter **silent** was set to True.
         :rtype: [dict | ArangoError] | bool
@@ -1569,12 +2033,19 @@ class StandardCollection(Collection):
         }
         if sync is not None:
             params['waitForSync'] = sync
+        if overwrite_mode is not None:
+            params['overwriteMode'] = overwrite_mode
+        if keep_none is not None:
+            params['keepNull'] = keep_none
+        if merge is not None:
+            params['mergeObjects'] = merge
 
         request = Request(
             method='post',
             endpoint='/_api/document/{}'.format(self.name),
             data=documents,
-            params=params
+            params=params,
+            write=self.name
         )
 
         def response_handler(resp):
@@ -1595,27 +2066,102 @@ class StandardCollection(Collection):
 
             return results
 
-        return await self._execute(request, response_handler)
+        return await self._execute_bulk(
+            request,
+            response_handler,
+            chunk_size,
+            chunk_bytes,
+            concurrency
+        )
 
-    async def update(
+    async def upsert_many(
             self,
-            document,
-            check_rev=True,
+            documents,
             merge=True,
             keep_none=True,
+            replace=False,
             return_new=False,
             return_old=False,
             sync=None,
-            silent=False):
-        """Update a document.
+            chunk_size=10000,
+            chunk_bytes=1 << 23,
+            concurrency=4):
+        """Insert multiple documents, or update them if their keys exist.
 
-        :param document: Partial or full document with the updated values. It
-            must contain the "_id" or "_key" field.
-        :type document: dict
-        :param check_rev: If set to True, revision of **document** (if given)
-            is compared against the revision of target document.
-        :type check_rev: bool
-        :param merge: If set to True, sub-dictionaries are merged instead of
+        This sends the documents with :func:`insert_many` in update-insert (or
+        replace-insert) mode, so each document takes a single write on the
+        server without reading it first.
+
+        .. note::
+
+            If upserting a document fails, the exception is not raised but
+            returned as an object in the result list.
+
+        :param documents: Documents to upsert. They should contain the "_key"
+            or "_id" field, otherwise they are inserted with generated keys.
+        :type documents: [dict]
+        :param merge: If set to True, sub-dictionaries of existing documents
+            are merged instead of the new ones overwriting the old ones.
+        :type merge: bool
+        :param keep_none: If set to True, fields with value None are retained
+            in existing documents. Otherwise, they are removed completely.
+        :type keep_none: bool
+        :param replace: If set to True, existing documents are replaced
+            instead of updated. Parameters **merge** and **keep_none** are
+            ignored.
+        :type replace: bool
+        :param return_new: Include bodies of the new documents in the returned
+            metadata.
+        :type return_new: bool
+        :param return_old: Include bodies of the existing documents in the
+            returned metadata.
+        :type return_old: bool
+        :param sync: Block until operation is synchronized to disk.
+        :type sync: bool
+        :param chunk_size: Max number of documents sent per request.
+        :type chunk_size: int
+        :param chunk_bytes: Max serialized size of the documents sent per
+            request.
+        :type chunk_bytes: int
+        :param concurrency: Max number of concurrent requests.
+        :type concurrency: int
+        :return: List of document metadata and any exceptions. The metadata
+            of documents which existed includes the "_old_rev" field.
+        :rtype: [dict | ArangoError]
+        :raise arango.exceptions.DocumentInsertError: If upsert fails.
+        """
+        return await self.insert_many(
+            documents,
+            return_new=return_new,
+            sync=sync,
+            return_old=return_old,
+            overwrite_mode='replace' if replace else 'update',
+            keep_none=None if replace else keep_none,
+            merge=None if replace else merge,
+            chunk_size=chunk_size,
+            chunk_bytes=chunk_bytes,
+            concurrency=concurrency
+        )
+
+    async def update(
+            self,
+            document,
+            check_rev=True,
+            merge=True,
+            keep_none=True,
+            return_new=False,
+            return_old=False,
+            sync=None,
+            silent=False):
+        """Update a document.
+
+        :param document: Partial or full document with the updated values. It
+            must contain the "_id" or "_key" field.
+        :type document: dict
+        :param check_rev: If set to True, revision of **document** (if given)
+            is compared against the revision of target document.
+        :type check_rev: bool
+        :param merge: If set to True, sub-dictionaries are merged instead of
             the new one overwriting the old one.
         :type merge: bool
         :param keep_none: If set to True, fields with value None are retained
@@ -1681,7 +2227,10 @@ class StandardCollection(Collection):
             return_new=False,
             return_old=False,
             sync=None,
-            silent=False):
+            silent=False,
+            chunk_size=10000,
+            chunk_bytes=1 << 23,
+            concurrency=4):
         """Update multiple documents.
 
         .. note::
@@ -1692,6 +2241,13 @@ class StandardCollection(Collection):
             successfully (returns document metadata) and which were not
             (returns exception object).
 
+        Documents are sent in chunks of at most **chunk_size** documents and
+        **chunk_bytes** serialized characters, with up to **concurrency**
+        requests in flight. If a whole chunk fails, its exception is returned
+        in place of the result of each of its documents (or raised, if all
+        chunks fail). Chunks are written concurrently, so operations on the
+        same document in different chunks are not ordered.
+
         :param documents: Partial or full documents with the updated values.
             They must contain the "_id" or "_key" fields.
         :type documents: [dict]
@@ -1715,6 +2271,13 @@ class StandardCollection(Collection):
         :param silent: If set to True, no document metadata is returned. This
             can be used to save resources.
         :type silent: bool
+        :param chunk_size: Max number of documents sent per request.
+        :type chunk_size: int
+        :param chunk_bytes: Max serialized size of the documents sent per
+            request.
+        :type chunk_bytes: int
+        :param concurrency: Max number of concurrent requests.
+        :type concurrency: int
         :return: List of document metadata (e.g. document keys, revisions) and
             any exceptions, or True if parameter **silent** was set to True.
         :rtype: [dict | ArangoError] | bool
@@ -1763,7 +2326,192 @@ class StandardCollection(Collection):
 
             return results
 
-        return await self._execute(request, response_handler)
+        return await self._execute_bulk(
+            request,
+            response_handler,
+            chunk_size,
+            chunk_bytes,
+            concurrency
+        )
+
+    def _unchanged(self, old):
+        """Return the metadata of a document skipped by a diff update.
+
+        :param old: Snapshot of the document.
+        :type old: dict
+        :return: Document metadata.
+        :rtype: dict
+        """
+        doc_id = self._extract_id(old)
+        return {
+            '_id': doc_id,
+            '_key': doc_id[len(self._id_prefix):],
+            '_rev': old.get('_rev')
+        }
+
+    def _diff_body(self, old, new, check_rev):
+        """Return the patch updating a document to a new version.
+
+        :param old: Snapshot of the document.
+        :type old: dict
+        :param new: New version of the document.
+        :type new: dict
+        :param check_rev: Include the revision of **old** in the patch.
+        :type check_rev: bool
+        :return: Patch with the document key, or None if nothing changed.
+        :rtype: dict | None
+        """
+        patch = compute_patch(old, new)
+        if not patch:
+            return None
+        patch['_key'] = self._extract_id(old)[len(self._id_prefix):]
+        if check_rev and '_rev' in old:
+            patch['_rev'] = old['_rev']
+        return patch
+
+    async def update_diff(
+            self,
+            old,
+            new,
+            check_rev=True,
+            return_new=False,
+            return_old=False,
+            sync=None,
+            silent=False):
+        """Update a document by sending only the fields which changed.
+
+        The patch is computed client-side by comparing **new** with the
+        snapshot **old** (see :func:`aioarangodb.utils.compute_patch`). Fields
+        missing from **new** are removed from the document. If nothing
+        changed, no request is sent in the default execution context and the
+        metadata of **old** is returned.
+
+        :param old: Snapshot of the document, as returned by the server. It
+            must contain the "_id" or "_key" field.
+        :type old: dict
+        :param new: New version of the document.
+        :type new: dict
+        :param check_rev: If set to True, the revision of **old** (if given)
+            is compared against the revision of the target document, so the
+            update fails if the document changed since the snapshot.
+        :type check_rev: bool
+        :param return_new: Include body of the new document in the returned
+            metadata. Ignored if parameter **silent** is set to True.
+        :type return_new: bool
+        :param return_old: Include body of the old document in the returned
+            metadata. Ignored if parameter **silent** is set to True.
+        :type return_old: bool
+        :param sync: Block until operation is synchronized to disk.
+        :type sync: bool
+        :param silent: If set to True, no document metadata is returned. This
+            can be used to save resources.
+        :type silent: bool
+        :return: Document metadata (e.g. document key, revision) or True if
+            parameter **silent** was set to True.
+        :rtype: bool | dict
+        :raise arango.exceptions.DocumentUpdateError: If update fails.
+        :raise arango.exceptions.DocumentRevisionError: If revisions mismatch.
+        """
+        patch = self._diff_body(old, new, check_rev)
+        if patch is None and self.context == 'default':
+            return True if silent else self._unchanged(old)
+        if patch is None:
+            # Send an empty patch, so that the job still checks the revision.
+            patch = {'_key': self._unchanged(old)['_key']}
+            if check_rev and '_rev' in old:
+                patch['_rev'] = old['_rev']
+
+        return await self.update(
+            patch,
+            check_rev=check_rev,
+            merge=True,
+            keep_none=False,
+            return_new=return_new,
+            return_old=return_old,
+            sync=sync,
+            silent=silent
+        )
+
+    async def update_diff_many(
+            self,
+            documents,
+            check_rev=True,
+            return_new=False,
+            return_old=False,
+            sync=None,
+            silent=False,
+            chunk_size=10000,
+            chunk_bytes=1 << 23,
+            concurrency=4):
+        """Update multiple documents by sending only the fields which changed.
+
+        Patches are computed as in :func:`update_diff` and sent in bulk via
+        :func:`update_many`. Unchanged documents are skipped and the metadata
+        of their snapshots is returned in place of their results. This method
+        is available only in the default execution context.
+
+        :param documents: Pairs of document snapshots and new versions. The
+            snapshots must contain the "_id" or "_key" fields.
+        :type documents: [(dict, dict)]
+        :param check_rev: If set to True, revisions of the snapshots (if given)
+            are compared against the revisions of target documents.
+        :type check_rev: bool
+        :param return_new: Include body of the new document in the returned
+            metadata. Ignored if parameter **silent** is set to True.
+        :type return_new: bool
+        :param return_old: Include body of the old document in the returned
+            metadata. Ignored if parameter **silent** is set to True.
+        :type return_old: bool
+        :param sync: Block until operation is synchronized to disk.
+        :type sync: bool
+        :param silent: If set to True, no document metadata is returned. This
+            can be used to save resources.
+        :type silent: bool
+        :param chunk_size: Max number of patches sent per request.
+        :type chunk_size: int
+        :param chunk_bytes: Max serialized size of the patches sent per
+            request.
+        :type chunk_bytes: int
+        :param concurrency: Max number of concurrent requests.
+        :type concurrency: int
+        :return: List of document metadata (e.g. document keys, revisions) and
+            any exceptions, or True if parameter **silent** was set to True.
+        :rtype: [dict | ArangoError] | bool
+        :raise arango.exceptions.DocumentUpdateError: If update fails.
+        """
+        assert self.context == 'default', \
+            'update_diff_many is available only in the default context'
+
+        results = []
+        patches = []
+        positions = []
+        for old, new in documents:
+            patch = self._diff_body(old, new, check_rev)
+            if patch is None:
+                results.append(self._unchanged(old))
+            else:
+                positions.append(len(results))
+                results.append(None)
+                patches.append(patch)
+
+        if patches:
+            updated = await self.update_many(
+                patches,
+                check_rev=check_rev,
+                merge=True,
+                keep_none=False,
+                return_new=return_new,
+                return_old=return_old,
+                sync=sync,
+                silent=silent,
+                chunk_size=chunk_size,
+                chunk_bytes=chunk_bytes,
+                concurrency=concurrency
+            )
+            if silent is not True:
+                for position, result in zip(positions, updated):
+                    results[position] = result
+        return True if silent else results
 
     async def update_match(
             self,
@@ -1894,7 +2642,10 @@ class StandardCollection(Collection):
             return_new=False,
             return_old=False,
             sync=None,
-            silent=False):
+            silent=False,
+            chunk_size=10000,
+            chunk_bytes=1 << 23,
+            concurrency=4):
         """Replace multiple documents.
 
         .. note::
@@ -1905,6 +2656,13 @@ class StandardCollection(Collection):
             successfully (returns document metadata) and which were not
             (returns exception object).
 
+        Documents are sent in chunks of at most **chunk_size** documents and
+        **chunk_bytes** serialized characters, with up to **concurrency**
+        requests in flight. If a whole chunk fails, its exception is returned
+        in place of the result of each of its documents (or raised, if all
+        chunks fail). Chunks are written concurrently, so operations on the
+        same document in different chunks are not ordered.
+
         :param documents: New documents to replace the old ones with. They must
             contain the "_id" or "_key" fields. Edge documents must also have
             "_from" and "_to" fields.
@@ -1923,6 +2681,13 @@ class StandardCollection(Collection):
         :param silent: If set to True, no document metadata is returned. This
             can be used to save resources.
         :type silent: bool
+        :param chunk_size: Max number of documents sent per request.
+        :type chunk_size: int
+        :param chunk_bytes: Max serialized size of the documents sent per
+            request.
+        :type chunk_bytes: int
+        :param concurrency: Max number of concurrent requests.
+        :type concurrency: int
         :return: List of document metadata (e.g. document keys, revisions) and
             any exceptions, or True if parameter **silent** was set to True.
         :rtype: [dict | ArangoError] | bool
@@ -1969,7 +2734,13 @@ class StandardCollection(Collection):
 
             return results
 
-        return await self._execute(request, response_handler)
+        return await self._execute_bulk(
+            request,
+            response_handler,
+            chunk_size,
+            chunk_bytes,
+            concurrency
+        )
 
     async def replace_match(self, filters, body, limit=None, sync=None):
         """Replace matching documents.
@@ -2087,7 +2858,10 @@ class StandardCollection(Collection):
             return_old=False,
             check_rev=True,
             sync=None,
-            silent=False):
+            silent=False,
+            chunk_size=10000,
+            chunk_bytes=1 << 23,
+            concurrency=4):
         """Delete multiple documents.
 
         .. note::
@@ -2098,6 +2872,13 @@ class StandardCollection(Collection):
             successfully (returns document metadata) and which were not
             (returns exception object).
 
+        Documents are sent in chunks of at most **chunk_size** documents and
+        **chunk_bytes** serialized characters, with up to **concurrency**
+        requests in flight. If a whole chunk fails, its exception is returned
+        in place of the result of each of its documents (or raised, if all
+        chunks fail). Chunks are written concurrently, so operations on the
+        same document in different chunks are not ordered.
+
         :param documents: Document IDs, keys or bodies. Document bodies must
             contain the "_id" or "_key" fields.
         :type documents: [str | unicode | dict]
@@ -2111,6 +2892,13 @@ class StandardCollection(Collection):
         :param silent: If set to True, no document metadata is returned. This
             can be used to save resources.
         :type silent: bool
+        :param chunk_size: Max number of documents sent per request.
+        :type chunk_size: int
+        :param chunk_bytes: Max serialized size of the documents sent per
+            request.
+        :type chunk_bytes: int
+        :param concurrency: Max number of concurrent requests.
+        :type concurrency: int
         :return: List of document metadata (e.g. document keys, revisions) and
             any exceptions, or True if parameter **silent** was set to True.
         :rtype: [dict | ArangoError] | bool
@@ -2158,7 +2946,13 @@ class StandardCollection(Collection):
 
             return results
 
-        return await self._execute(request, response_handler)
+        return await self._execute_bulk(
+            request,
+            response_handler,
+            chunk_size,
+            chunk_bytes,
+            concurrency
+        )
 
     async def delete_match(self, filters, limit=None, sync=None):
         """Delete matching documents.
@@ -2194,6 +2988,52 @@ class StandardCollection(Collection):
 
         return await self._execute(request, response_handler)
 
+    def buffered_writer(self,
+                        max_batch=1000,
+                        max_bytes=1 << 23,
+                        linger=0.05,
+                        max_buffered=None,
+                        concurrency=1,
+                        check_rev=True,
+                        sync=None):
+        """Return a write-behind buffer for single document operations.
+
+        Buffered operations are coalesced into bulk requests, see
+        :class:`arango.writer.BufferedWriter`.
+
+        :param max_batch: Max number of operations per flush.
+        :type max_batch: int
+        :param max_bytes: Max serialized size of the documents per flush, or
+            None to not serialize documents in advance to measure them.
+        :type max_bytes: int | None
+        :param linger: Max time in seconds an operation is buffered.
+        :type linger: int | float
+        :param max_buffered: Max number of buffered and in-flight operations.
+            If not given, four times the value of **max_batch** is used.
+        :type max_buffered: int
+        :param concurrency: Max number of flushes in flight. Flushes are
+            applied in order only if set to 1.
+        :type concurrency: int
+        :param check_rev: If set to True, revisions of updated, replaced and
+            deleted documents (if given) are compared against the revisions
+            of target documents.
+        :type check_rev: bool
+        :param sync: Block until operations are synchronized to disk.
+        :type sync: bool
+        :return: Buffered writer.
+        :rtype: arango.writer.BufferedWriter
+        """
+        return BufferedWriter(
+            self,
+            max_batch=max_batch,
+            max_bytes=max_bytes,
+            linger=linger,
+            max_buffered=max_buffered,
+            concurrency=concurrency,
+            check_rev=check_rev,
+            sync=sync
+        )
+
     async def import_bulk(
             self,
             documents,
@@ -2203,17 +3043,26 @@ class StandardCollection(Collection):
             to_prefix=None,
             overwrite=None,
             on_duplicate=None,
-            sync=None):
+            sync=None,
+            chunk_bytes=1 << 25,
+            concurrency=4):
         """Insert multiple documents into the collection.
 
         This method is faster than
         :func:`arango.collection.StandardCollection.insert_many` but does not
         return as many details.
 
-        :param documents: List of new documents to insert. If they contain the
-            "_key" or "_id" fields, the values are used as the keys of the new
-            documents (auto-generated otherwise). Any "_rev" field is ignored.
-        :type documents: [dict]
+        Multi-gigabyte JSON lines files can be imported by path. The file is
+        memory-mapped and split on line boundaries into ranges of about
+        **chunk_bytes** bytes, which are sent without being parsed, with up to
+        **concurrency** requests in flight. Each range is imported on its
+        own: if one fails, the others may remain imported.
+
+        :param documents: List of new documents to insert, or path of a file
+            with one document per line. If they contain the "_key" or "_id"
+            fields, the values are used as the keys of the new documents
+            (auto-generated otherwise). Any "_rev" field is ignored.
+        :type documents: [dict] | str | unicode | os.PathLike
         :param halt_on_error: Halt the entire import on an error.
         :type halt_on_error: bool
         :param details: If set to True, the returned result will include an
@@ -2244,16 +3093,89 @@ class StandardCollection(Collection):
         :type on_duplicate: str | unicode
         :param sync: Block until operation is synchronized to disk.
         :type sync: bool
-        :return: Result of the bulk import.
+        :param chunk_bytes: Approximate size in bytes of each request when
+            importing a file.
+        :type chunk_bytes: int
+        :param concurrency: Max number of concurrent requests when importing
+            a file.
+        :type concurrency: int
+        :return: Result of the bulk import. For files, the results of all
+            requests are combined and their number is included.
         :rtype: dict
         :raise arango.exceptions.DocumentInsertError: If import fails.
         """
+        if isinstance(documents, (string_types, os.PathLike)):
+            assert self.context == 'default', \
+                'file imports are available only in the default context'
+            params = self._import_params(
+                'documents',
+                halt_on_error,
+                details,
+                from_prefix,
+                to_prefix,
+                overwrite,
+                on_duplicate,
+                sync
+            )
+            return await self._import_file(
+                documents,
+                params,
+                details,
+                chunk_bytes,
+                concurrency
+            )
+
         documents = [self._ensure_key_from_id(doc) for doc in documents]
 
-        params = {
-            'type': 'array',
-            'collection': self.name
-        }
+        params = self._import_params(
+            'array',
+            halt_on_error,
+            details,
+            from_prefix,
+            to_prefix,
+            overwrite,
+            on_duplicate,
+            sync
+        )
+
+        request = Request(
+            method='post',
+            endpoint='/_api/import',
+            data=documents,
+            params=params,
+            write=self.name
+        )
+
+        def response_handler(resp):
+            if not resp.is_success:
+                raise DocumentInsertError(resp, request)
+            return resp.body
+
+        return await self._execute(request, response_handler)
+
+    def _import_params(self,
+                       import_type,
+                       halt_on_error,
+                       details,
+                       from_prefix,
+                       to_prefix,
+                       overwrite,
+                       on_duplicate,
+                       sync):
+        """Return the URL parameters of an import request.
+
+        See :func:`arango.collection.StandardCollection.import_bulk` for the
+        other parameters.
+
+        :param import_type: Import type ("array" or "documents"), or None
+            for a header line of attribute names followed by lines of values.
+        :type import_type: str | unicode | None
+        :return: URL parameters.
+        :rtype: dict
+        """
+        params = {'collection': self.name}
+        if import_type is not None:
+            params['type'] = import_type
         if halt_on_error is not None:
             params['complete'] = halt_on_error
         if details is not None:
@@ -2268,12 +3190,25 @@ class StandardCollection(Collection):
             params['onDuplicate'] = on_duplicate
         if sync is not None:
             params['waitForSync'] = sync
+        return params
+
+    async def _import(self, params, data):
+        """Send an import request.
 
+        :param params: URL parameters.
+        :type params: dict
+        :param data: Request payload.
+        :type data: str | unicode | bytes | memoryview | list |
+            collections.abc.AsyncIterable
+        :return: Import result.
+        :rtype: dict
+        :raise arango.exceptions.DocumentInsertError: If import fails.
+        """
         request = Request(
             method='post',
             endpoint='/_api/import',
-            data=documents,
-            params=params,
+            data=data,
+            params=dict(params),
             write=self.name
         )
 
@@ -2284,6 +3219,291 @@ class StandardCollection(Collection):
 
         return await self._execute(request, response_handler)
 
+    async def _import_requests(self, params, bodies, details):
+        """Send import requests one at a time and combine their results.
+
+        :param params: URL parameters of the requests. Any "overwrite"
+            parameter applies to the first request only.
+        :type params: dict
+        :param bodies: Async iterator of request payloads.
+        :type bodies: collections.abc.AsyncIterator
+        :param details: Whether detailed error messages are included.
+        :type details: bool
+        :return: Combined import result, with the number of requests sent.
+        :rtype: dict
+        :raise arango.exceptions.DocumentInsertError: If import fails.
+        """
+        results = []
+        async for data in bodies:
+            results.append(await self._import(params, data))
+            # Existing documents are removed by the first request only.
+            params.pop('overwrite', None)
+        return _combine_imports(results, details)
+
+    async def _import_file(self, path, params, details, chunk_bytes,
+                           concurrency):
+        """Import a JSON lines file in concurrent requests.
+
+        The file is memory-mapped and split on line boundaries into ranges of
+        about **chunk_bytes** bytes, which are sent as is without parsing.
+        Only the ranges being sent are held in memory.
+
+        :param path: File path.
+        :type path: str | unicode | os.PathLike
+        :param params: URL parameters of the requests. Any "overwrite"
+            parameter applies to the first request only, which is sent before
+            the others.
+        :type params: dict
+        :param details: Whether detailed error messages are included.
+        :type details: bool
+        :param chunk_bytes: Approximate size in bytes of each request.
+        :type chunk_bytes: int
+        :param concurrency: Max number of concurrent requests.
+        :type concurrency: int
+        :return: Combined import result, with the number of requests sent.
+        :rtype: dict
+        :raise arango.exceptions.DocumentInsertError: If import fails.
+        """
+        assert chunk_bytes > 0, 'chunk_bytes must be a positive int'
+        assert concurrency > 0, 'concurrency must be a positive int'
+
+        with open(path, 'rb') as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return _combine_imports([], details)
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        ranges = []
+        start = 0
+        while start < len(mapped):
+            end = start + chunk_bytes
+            if end < len(mapped):
+                newline = mapped.find(b'\n', end - 1)
+                end = len(mapped) if newline == -1 else newline + 1
+            ranges.append((start, end))
+            start = end
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def send(start, end):
+            # Each range is copied only while it is sent, and no view of the
+            # map outlives it (e.g. in the request of a raised error).
+            async with semaphore:
+                return await self._import(params, mapped[start:end])
+
+        tasks = []
+        try:
+            results = []
+            if params.get('overwrite'):
+                results.append(await send(*ranges[0]))
+                params.pop('overwrite')
+                rest = ranges[1:]
+            else:
+                rest = ranges
+            tasks = [asyncio.ensure_future(send(*bounds)) for bounds in rest]
+            results.extend(await asyncio.gather(*tasks))
+        finally:
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                await asyncio.wait(tasks)
+            mapped.close()
+        return _combine_imports(results, details)
+
+    async def import_stream(
+            self,
+            documents,
+            request_size=1 << 25,
+            buffer_size=1 << 16,
+            halt_on_error=True,
+            details=True,
+            from_prefix=None,
+            to_prefix=None,
+            overwrite=None,
+            on_duplicate=None,
+            sync=None):
+        """Import documents from an (async) iterable with constant memory.
+
+        Documents are serialized one at a time as JSON lines and streamed to
+        the server with chunked transfer encoding. Once a request body reaches
+        **request_size** bytes, the import continues with a new request. The
+        import results of all requests are combined.
+
+        Each request is imported on its own: if one fails, the documents of
+        the previous requests remain imported. Streamed request bodies cannot
+        be sent again, so with JWT authentication an expired token is
+        refreshed before each request rather than retried after it is
+        rejected.
+
+        :param documents: Async iterable (e.g. async generator) or iterable of
+            new documents. If they contain the "_key" or "_id" fields, the
+            values are used as the keys of the new documents (auto-generated
+            otherwise). Any "_rev" field is ignored.
+        :type documents: collections.abc.AsyncIterable |
+            collections.abc.Iterable
+        :param request_size: Size in bytes after which a new request is
+            started. Documents are never split across requests.
+        :type request_size: int
+        :param buffer_size: Size in bytes of the blocks written to the
+            request body.
+        :type buffer_size: int
+        :param halt_on_error: Halt the import of a request on an error.
+        :type halt_on_error: bool
+        :param details: If set to True, the returned result will include an
+            additional list of detailed error messages.
+        :type details: bool
+        :param from_prefix: String prefix prepended to the value of "_from"
+            field in each edge document inserted. Applies only to edge
+            collections.
+        :type from_prefix: str | unicode
+        :param to_prefix: String prefix prepended to the value of "_to" field
+            in edge document inserted. Applies only to edge collections.
+        :type to_prefix: str | unicode
+        :param overwrite: If set to True, all existing documents are removed
+            prior to the import. Indexes are still preserved.
+        :type overwrite: bool
+        :param on_duplicate: Action to take on unique key constraint violations
+            (see :func:`arango.collection.StandardCollection.import_bulk`).
+        :type on_duplicate: str | unicode
+        :param sync: Block until operation is synchronized to disk.
+        :type sync: bool
+        :return: Combined result of the imports, with the number of requests
+            sent.
+        :rtype: dict
+        :raise arango.exceptions.DocumentInsertError: If import fails.
+        """
+        assert self.context == 'default', \
+            'import_stream is available only in the default context'
+        assert request_size > 0, 'request_size must be a positive int'
+
+        if hasattr(documents, '__aiter__'):
+            iterator = documents.__aiter__()
+        else:
+            iterator = _iterate(documents)
+        pending = await _anext(iterator)
+
+        async def body():
+            nonlocal pending
+            sent = 0
+            block = []
+            block_size = 0
+            while pending is not _END and sent < request_size:
+                line = self._conn.serialize(self._ensure_key_from_id(pending))
+                line = (line + '\n').encode('utf-8')
+                block.append(line)
+                block_size += len(line)
+                sent += len(line)
+                if block_size >= buffer_size:
+                    yield b''.join(block)
+                    block = []
+                    block_size = 0
+                pending = await _anext(iterator)
+            if block:
+                yield b''.join(block)
+
+        async def bodies():
+            while pending is not _END:
+                yield body()
+
+        params = self._import_params(
+            'documents',
+            halt_on_error,
+            details,
+            from_prefix,
+            to_prefix,
+            overwrite,
+            on_duplicate,
+            sync
+        )
+        return await self._import_requests(params, bodies(), details)
+
+    async def import_values(
+            self,
+            fields,
+            values,
+            chunk_size=10000,
+            halt_on_error=True,
+            details=True,
+            from_prefix=None,
+            to_prefix=None,
+            overwrite=None,
+            on_duplicate=None,
+            sync=None):
+        """Import documents given as attribute names and rows of values.
+
+        The documents are sent in the compact import format, where the first
+        line holds the attribute names and each following line is an array
+        of values, instead of repeating the attribute names in every
+        document. This shrinks the payload of wide, homogeneous documents
+        considerably.
+
+        Values may also be given by column, e.g. as NumPy arrays or a pandas
+        DataFrame, which are converted to Python values via their ``tolist``
+        methods.
+
+        :param fields: Attribute names (e.g. "_key", "name").
+        :type fields: [str | unicode]
+        :param values: Rows of values in the order of **fields** (e.g. list of
+            tuples or 2D NumPy array), or mapping of attribute names to
+            columns of values (e.g. dict of NumPy arrays or pandas DataFrame).
+        :type values: collections.abc.Iterable | collections.abc.Mapping
+        :param chunk_size: Max number of rows sent per request.
+        :type chunk_size: int
+        :param halt_on_error: Halt the import of a request on an error.
+        :type halt_on_error: bool
+        :param details: If set to True, the returned result will include an
+            additional list of detailed error messages.
+        :type details: bool
+        :param from_prefix: String prefix prepended to the value of "_from"
+            field in each edge document inserted. Applies only to edge
+            collections.
+        :type from_prefix: str | unicode
+        :param to_prefix: String prefix prepended to the value of "_to" field
+            in edge document inserted. Applies only to edge collections.
+        :type to_prefix: str | unicode
+        :param overwrite: If set to True, all existing documents are removed
+            prior to the import. Indexes are still preserved.
+        :type overwrite: bool
+        :param on_duplicate: Action to take on unique key constraint violations
+            (see :func:`arango.collection.StandardCollection.import_bulk`).
+        :type on_duplicate: str | unicode
+        :param sync: Block until operation is synchronized to disk.
+        :type sync: bool
+        :return: Combined result of the imports, with the number of requests
+            sent.
+        :rtype: dict
+        :raise arango.exceptions.DocumentInsertError: If import fails.
+        """
+        assert self.context == 'default', \
+            'import_values is available only in the default context'
+        assert chunk_size > 0, 'chunk_size must be a positive int'
+
+        fields = list(fields)
+        if hasattr(values, 'keys'):
+            values = zip(*[_to_list(values[field]) for field in fields])
+        header = self._conn.serialize(fields)
+
+        async def bodies():
+            lines = [header]
+            for row in values:
+                lines.append(self._conn.serialize(_to_list(row)))
+                if len(lines) > chunk_size:
+                    yield '\n'.join(lines)
+                    lines = [header]
+            if len(lines) > 1:
+                yield '\n'.join(lines)
+
+        params = self._import_params(
+            None,
+            halt_on_error,
+            details,
+            from_prefix,
+            to_prefix,
+            overwrite,
+            on_duplicate,
+            sync
+        )
+        return await self._import_requests(params, bodies(), details)
+
 
 class VertexCollection(Collection):
     """Vertex collection API wrapper.
@@ -2332,12 +3552,15 @@ class VertexCollection(Collection):
         :raise arango.exceptions.DocumentRevisionError: If revisions mismatch.
         """
         handle, body, headers = self._prep_from_doc(vertex, rev, check_rev)
+        endpoint = '/_api/gharial/{}/vertex/{}'.format(self._graph, handle)
+
+        cache = self._conn.document_cache
+        if cache is not None and not headers and self.context == 'default':
+            return await self._get_cached(cache, handle, endpoint, 'vertex')
 
         request = Request(
             method='get',
-            endpoint='/_api/gharial/{}/vertex/{}'.format(
-                self._graph, handle
-            ),
+            endpoint=endpoint,
             headers=headers,
             read=self.name
         )
@@ -2646,12 +3869,15 @@ class EdgeCollection(Collection):
         :raise arango.exceptions.DocumentRevisionError: If revisions mismatch.
         """
         handle, body, headers = self._prep_from_doc(edge, rev, check_rev)
+        endpoint = '/_api/gharial/{}/edge/{}'.format(self._graph, handle)
+
+        cache = self._conn.document_cache
+        if cache is not None and not headers and self.context == 'default':
+            return await self._get_cached(cache, handle, endpoint, 'edge')
 
         request = Request(
             method='get',
-            endpoint='/_api/gharial/{}/edge/{}'.format(
-                self._graph, handle
-            ),
+            endpoint=endpoint,
             headers=headers,
             read=self.name
         )
@@ -2995,3 +4221,299 @@ class EdgeCollection(Collection):
             }
 
         return await self._execute(request, response_handler)
+
+
+class DocumentCache(object):
+    """In-process read-through cache of documents, keyed by document ID.
+
+    Documents are stored serialized, so every read returns a new copy which
+    the caller may modify. Entries older than the freshness window are not
+    dropped but revalidated against the server with their revision, which
+    costs a round trip without transferring the document if it is unchanged.
+
+    :param max_size: Max number of cached documents. The least recently used
+        documents are evicted first.
+    :type max_size: int
+    :param max_bytes: Max total size of the cached documents in bytes, or
+        None for no limit.
+    :type max_bytes: int | None
+    :param ttl: Freshness window in seconds. Older entries are revalidated
+        before being returned. Set to 0 to always revalidate.
+    :type ttl: int | float
+    """
+
+    def __init__(self, max_size=10000, max_bytes=None, ttl=1):
+        assert max_size > 0, 'max_size must be a positive int'
+        assert max_bytes is None or max_bytes > 0, \
+            'max_bytes must be a positive int'
+        assert ttl >= 0, 'ttl must not be negative'
+        self._max_size = max_size
+        self._max_bytes = max_bytes
+        self._ttl = ttl
+        self._entries = OrderedDict()
+        self._ids = {}
+        self._bytes = 0
+        self._generations = {}
+        self._epoch = 0
+        self._hits = 0
+        self._misses = 0
+        self._revalidations = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, doc_id):
+        return doc_id in self._entries
+
+    def __repr__(self):
+        return '<DocumentCache {}>'.format(len(self._entries))
+
+    @property
+    def ttl(self):
+        """Return the freshness window in seconds.
+
+        :return: Freshness window.
+        :rtype: int | float
+        """
+        return self._ttl
+
+    def get(self, doc_id):
+        """Return the cached entry of a document.
+
+        :param doc_id: Document ID.
+        :type doc_id: str | unicode
+        :return: Serialized document, its revision and whether it is still
+            fresh, or None if not cached. Entries which are not fresh must be
+            revalidated (see :func:`DocumentCache.touch`) before use.
+        :rtype: (str | unicode, str | unicode, bool) | None
+        """
+        entry = self._entries.get(doc_id)
+        if entry is None:
+            self._misses += 1
+            return None
+        self._entries.move_to_end(doc_id)
+        fresh = monotonic() - entry[2] < self._ttl
+        if fresh:
+            self._hits += 1
+        else:
+            self._misses += 1
+        return entry[0], entry[1], fresh
+
+    def generation(self, doc_id):
+        """Return the write generation of the collection of a document.
+
+        :param doc_id: Document ID.
+        :type doc_id: str | unicode
+        :return: Opaque value which changes whenever the collection of the
+            document is invalidated.
+        :rtype: tuple
+        """
+        name = doc_id.split('/', 1)[0]
+        return self._epoch, self._generations.get(name, 0)
+
+    def put(self, doc_id, rev, data, generation=None):
+        """Cache a document.
+
+        :param doc_id: Document ID.
+        :type doc_id: str | unicode
+        :param rev: Document revision.
+        :type rev: str | unicode
+        :param data: Serialized document.
+        :type data: str | unicode | bytes
+        :param generation: Write generation taken before the document was
+            fetched. If the collection was invalidated since, the document is
+            not cached.
+        :type generation: tuple
+        :return: True if the document was cached.
+        :rtype: bool
+        """
+        if generation is not None and generation != self.generation(doc_id):
+            return False
+        self.discard(doc_id)
+        self._entries[doc_id] = (data, rev, monotonic())
+        self._ids.setdefault(doc_id.split('/', 1)[0], set()).add(doc_id)
+        self._bytes += len(data)
+        while len(self._entries) > self._max_size or (
+                self._max_bytes is not None and
+                self._bytes > self._max_bytes and
+                len(self._entries) > 1):
+            self.discard(next(iter(self._entries)))
+            self._evictions += 1
+        return True
+
+    def touch(self, doc_id):
+        """Mark a cached document as fresh after a successful revalidation.
+
+        :param doc_id: Document ID.
+        :type doc_id: str | unicode
+        """
+        entry = self._entries.get(doc_id)
+        if entry is not None:
+            self._entries[doc_id] = (entry[0], entry[1], monotonic())
+        self._revalidations += 1
+
+    def discard(self, doc_id):
+        """Drop a cached document.
+
+        :param doc_id: Document ID.
+        :type doc_id: str | unicode
+        :return: True if the document was cached.
+        :rtype: bool
+        """
+        entry = self._entries.pop(doc_id, None)
+        if entry is None:
+            return False
+        self._bytes -= len(entry[0])
+        name = doc_id.split('/', 1)[0]
+        ids = self._ids.get(name)
+        if ids is not None:
+            ids.discard(doc_id)
+            if not ids:
+                del self._ids[name]
+        return True
+
+    def invalidate(self, *collections):
+        """Drop the cached documents of the collections.
+
+        :param collections: Collection names, or lists of names. None values
+            are ignored.
+        :type collections: str | unicode | [str | unicode] | None
+        :return: Number of cached documents dropped.
+        :rtype: int
+        """
+        count = 0
+        for names in collections:
+            if names is None:
+                continue
+            if isinstance(names, string_types):
+                names = [names]
+            for name in names:
+                self._generations[name] = self._generations.get(name, 0) + 1
+                for doc_id in list(self._ids.get(name, ())):
+                    count += self.discard(doc_id)
+        self._invalidations += count
+        return count
+
+    def clear(self):
+        """Drop all cached documents."""
+        self._epoch += 1
+        self._invalidations += len(self._entries)
+        self._entries.clear()
+        self._ids.clear()
+        self._bytes = 0
+
+    def stats(self):
+        """Return the cache statistics.
+
+        :return: Number and total size of cached documents, hits (served
+            without a request), misses (including entries which had to be
+            revalidated), revalidations (stale entries which turned out to be
+            unchanged), evictions (due to the size limits) and invalidations
+            (due to writes).
+        :rtype: dict
+        """
+        return {
+            'size': len(self._entries),
+            'bytes': self._bytes,
+            'max_size': self._max_size,
+            'max_bytes': self._max_bytes,
+            'ttl': self._ttl,
+            'hits': self._hits,
+            'misses': self._misses,
+            'revalidations': self._revalidations,
+            'evictions': self._evictions,
+            'invalidations': self._invalidations
+        }
+
+
+def _filter_paths(filters, prefix=()):
+    """Flatten document filters into field paths and values.
+
+    :param filters: Document filters. Nested dictionaries and field names
+        with dots match nested fields.
+    :type filters: dict
+    :param prefix: Path of the filters.
+    :type prefix: tuple
+    :return: Field paths and the values they must equal.
+    :rtype: [(tuple, object)]
+    """
+    paths = []
+    for name, value in filters.items():
+        path = prefix + tuple(name.split('.'))
+        if isinstance(value, dict) and value:
+            paths.extend(_filter_paths(value, path))
+        else:
+            paths.append((path, value))
+    return paths
+
+
+_END = object()
+
+
+def _combine_imports(results, details):
+    """Combine the results of several import requests.
+
+    :param results: Import results.
+    :type results: [dict]
+    :param details: Whether detailed error messages are included.
+    :type details: bool
+    :return: Combined import result, with the number of requests sent.
+    :rtype: dict
+    """
+    result = {
+        'created': 0,
+        'errors': 0,
+        'empty': 0,
+        'updated': 0,
+        'ignored': 0,
+        'requests': len(results)
+    }
+    if details:
+        result['details'] = []
+    for body in results:
+        for key in ('created', 'errors', 'empty', 'updated', 'ignored'):
+            result[key] += body.get(key, 0)
+        if details:
+            result['details'].extend(body.get('details', ()))
+    return result
+
+
+def _to_list(values):
+    """Return the values as a list of plain Python values.
+
+    :param values: Sequence, NumPy array or pandas Series.
+    :type values: collections.abc.Iterable
+    :return: Values.
+    :rtype: list
+    """
+    if hasattr(values, 'tolist'):
+        return values.tolist()
+    return list(values)
+
+
+async def _iterate(items):
+    """Return an async iterator over the items of a regular iterable.
+
+    :param items: Iterable.
+    :type items: collections.abc.Iterable
+    :return: Async iterator.
+    :rtype: collections.abc.AsyncIterator
+    """
+    for item in items:
+        yield item
+
+
+async def _anext(iterator):
+    """Return the next item of an async iterator.
+
+    :param iterator: Async iterator.
+    :type iterator: collections.abc.AsyncIterator
+    :return: Next item, or a sentinel if the iterator is exhausted.
+    :rtype: object
+    """
+    try:
+        return await iterator.__anext__()
+    except StopAsyncIteration:
+        return _END
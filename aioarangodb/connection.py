@@ -3,11 +3,13 @@ from __future__ import absolute_import, unicode_literals
 from abc import ABCMeta, abstractmethod
 from calendar import timegm
 from datetime import datetime
+from time import monotonic
 
 import jwt
 from six import string_types
 from aiohttp import MultipartWriter
 
+from .cursor import CursorRegistry
 from .exceptions import (
     ServerConnectionError,
     JWTAuthError,
@@ -57,6 +59,12 @@ class Connection(object):
         self._http = http_client
         self._serializer = serializer
         self._deserializer = deserializer
+        self._cursors = CursorRegistry(self)
+        self._result_cache = None
+        self._batch_tuner = None
+        self._profiler = None
+        self._plan_cache = None
+        self._document_cache = None
 
     @property
     def db_name(self):
@@ -67,6 +75,80 @@ class Connection(object):
         """
         return self._db_name
 
+    @property
+    def cursors(self):
+        """Return the registry of open cursors.
+
+        :returns: Cursor registry.
+        :rtype: arango.cursor.CursorRegistry
+        """
+        return self._cursors
+
+    @property
+    def result_cache(self):
+        """Return the in-process AQL result cache.
+
+        :returns: AQL result cache, or None if not enabled.
+        :rtype: arango.aql.AQLResultCache | None
+        """
+        return self._result_cache
+
+    @result_cache.setter
+    def result_cache(self, cache):
+        self._result_cache = cache
+
+    @property
+    def batch_tuner(self):
+        """Return the adaptive batch size tuner.
+
+        :returns: Batch size tuner, or None if not enabled.
+        :rtype: arango.aql.BatchSizeTuner | None
+        """
+        return self._batch_tuner
+
+    @batch_tuner.setter
+    def batch_tuner(self, tuner):
+        self._batch_tuner = tuner
+
+    @property
+    def profiler(self):
+        """Return the client-side AQL query profiler.
+
+        :returns: Query profiler, or None if not enabled.
+        :rtype: arango.aql.QueryProfiler | None
+        """
+        return self._profiler
+
+    @profiler.setter
+    def profiler(self, profiler):
+        self._profiler = profiler
+
+    @property
+    def plan_cache(self):
+        """Return the AQL query plan cache.
+
+        :returns: Query plan cache, or None if not enabled.
+        :rtype: arango.aql.QueryPlanCache | None
+        """
+        return self._plan_cache
+
+    @plan_cache.setter
+    def plan_cache(self, cache):
+        self._plan_cache = cache
+
+    @property
+    def document_cache(self):
+        """Return the in-process document cache.
+
+        :returns: Document cache, or None if not enabled.
+        :rtype: arango.collection.DocumentCache | None
+        """
+        return self._document_cache
+
+    @document_cache.setter
+    def document_cache(self, cache):
+        self._document_cache = cache
+
     def serialize(self, obj):
         """Serialize the object and return the string.
 
@@ -101,7 +183,9 @@ class Connection(object):
         :rtype: arango.response.Response
         """
         if deserialize:
+            start = monotonic()
             resp.body = self.deserialize(resp.raw_body)
+            resp.deserialize_time = monotonic() - start
             if isinstance(resp.body, dict):
                 resp.error_code = resp.body.get('errorNum')
                 resp.error_message = resp.body.get('errorMessage')
@@ -146,7 +230,11 @@ class Connection(object):
         """
         if request.data is None:
             return request.data
-        elif isinstance(request.data, (string_types, MultipartWriter)):
+        elif isinstance(request.data,
+                        (string_types, bytes, memoryview, MultipartWriter)):
+            return request.data
+        elif hasattr(request.data, '__aiter__'):
+            # Streamed with chunked transfer encoding.
             return request.data
         else:
             return self.serialize(request.data)
@@ -306,6 +394,15 @@ class JWTConnection(Connection):
         :return: HTTP response.
         :rtype: arango.response.Response
         """
+        # Streamed bodies (async iterables) are consumed when sent, so they
+        # cannot be sent again after refreshing the token. Refresh it upfront
+        # instead if it has expired.
+        streamed = hasattr(request.data, '__aiter__')
+        if streamed:
+            now = timegm(datetime.utcnow().utctimetuple())
+            if self._token_exp <= now + self.exp_leeway:
+                await self.refresh_token()
+
         host_index = self._host_resolver.get_host_index()
         request.headers['Authorization'] = self._auth_header
 
@@ -322,6 +419,9 @@ class JWTConnection(Connection):
         # Refresh the token and retry on HTTP 401 and error code 11.
         if resp.error_code != 11 or resp.status_code != 401:
             return resp
+        if streamed:
+            # The body was consumed, so return the error instead.
+            return resp
 
         now = timegm(datetime.utcnow().utctimetuple())
         if self._token_exp < now - self.exp_leeway:  # pragma: no cover
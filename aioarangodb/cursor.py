@@ -1,16 +1,28 @@
 from __future__ import absolute_import, unicode_literals
 
-__all__ = ['Cursor']
+__all__ = [
+    'Cursor',
+    'RawCursor',
+    'MergedCursor',
+    'ParallelCursor',
+    'CursorRegistry'
+]
 
+import asyncio
+import heapq
+import weakref
 from collections import deque
+from time import monotonic
 
 from .exceptions import (
+    AQLQueryTimeoutError,
     CursorCloseError,
     CursorEmptyError,
     CursorNextError,
     CursorStateError,
     CursorCountError
 )
+from .pipeline import Pipeline
 from .request import Request
 
 
@@ -27,6 +39,21 @@ class Cursor(object):
     :type init_data: dict | list
     :param cursor_type: Cursor type ("cursor" or "export").
     :type cursor_type: str | unicode
+    :param ttl: Server side time-to-live for the cursor in seconds. If not
+        given, the server default (30 seconds) is assumed.
+    :type ttl: int | float
+    :param response: HTTP response carrying **init_data**, used to record
+        the client-side timings of the first batch.
+    :type response: arango.response.Response
+    :param started: Time (as returned by :func:`time.monotonic`) the query
+        was sent, used to record the time to first batch.
+    :type started: float
+    :param deadline: Time (as returned by :func:`time.monotonic`) by which
+        all batches must be fetched. If it expires, the cursor is closed.
+    :type deadline: float
+    :param kill_on_cancel: If set to True, the cursor is closed if a fetch is
+        cancelled.
+    :type kill_on_cancel: bool
     """
 
     __slots__ = [
@@ -39,10 +66,33 @@ class Cursor(object):
         '_profile',
         '_warnings',
         '_has_more',
-        '_batch'
+        '_batch',
+        '_ttl',
+        '_created',
+        '_accessed',
+        '_consumed',
+        '_owner',
+        '_prefetch',
+        '_started',
+        '_received',
+        '_timings',
+        '_callbacks',
+        '_deadline',
+        '_kill_on_cancel',
+        '__weakref__'
     ]
 
-    def __init__(self, connection, init_data, cursor_type='cursor'):
+    _deserialize = True
+
+    def __init__(self,
+                 connection,
+                 init_data,
+                 cursor_type='cursor',
+                 ttl=None,
+                 response=None,
+                 started=None,
+                 deadline=None,
+                 kill_on_cancel=False):
         self._conn = connection
         self._type = cursor_type
         self._batch = deque()
@@ -52,7 +102,27 @@ class Cursor(object):
         self._stats = None
         self._profile = None
         self._warnings = None
-        self._update(init_data)
+        self._ttl = ttl or CursorRegistry.default_ttl
+        self._created = self._accessed = monotonic()
+        self._consumed = False
+        self._owner = _current_task()
+        self._prefetch = None
+        self._started = started
+        self._timings = []
+        self._callbacks = []
+        self._deadline = deadline
+        self._kill_on_cancel = kill_on_cancel
+        result = self._update(init_data)
+        self._received = monotonic()
+        if response is not None:
+            self._record(
+                result,
+                response,
+                self._created - started if started is not None else None,
+                self._received - self._created
+            )
+        if self._id is not None and self._has_more:
+            connection.cursors.register(self)
 
     def __aiter__(self):
         return self
@@ -128,6 +198,15 @@ class Cursor(object):
 
         return result
 
+    @property
+    def ttl(self):
+        """Return the server side time-to-live of the cursor in seconds.
+
+        :return: Cursor time-to-live.
+        :rtype: int | float
+        """
+        return self._ttl
+
     @property
     def id(self):
         """Return the cursor ID.
@@ -203,6 +282,69 @@ class Cursor(object):
         """
         return self._warnings
 
+    def timings(self):
+        """Return the client-side timings of the cursor.
+
+        The timings are recorded per fetched batch and merged with the
+        server-side execution time, to tell whether reading the results is
+        bound by the server, the network, deserialization or the consumer.
+        All times are in seconds.
+
+        :return: Client-side timings. The "batches" field holds the latency,
+            deserialization time, body size, number of items and preceding
+            consumer idle time of each batch.
+        :rtype: dict
+        """
+        batches = self._timings
+        first = batches[0]['latency'] if batches else None
+        execution_time = None
+        if self._stats is not None:
+            execution_time = self._stats.get('execution_time')
+        return {
+            'time_to_first_batch': first,
+            'fetch_time': sum(b['latency'] or 0.0 for b in batches),
+            'deserialize_time': sum(b['deserialize'] for b in batches),
+            'idle_time': sum(b['idle'] for b in batches),
+            'size': sum(b['size'] for b in batches),
+            'count': sum(b['count'] for b in batches),
+            'execution_time': execution_time,
+            'batches': batches
+        }
+
+    def _record(self, result, resp, latency, decode_time, idle=0.0):
+        """Record the client-side timings of a fetched batch.
+
+        :param result: Batch details returned by :func:`Cursor._update`.
+        :type result: dict
+        :param resp: HTTP response of the batch.
+        :type resp: arango.response.Response
+        :param latency: Round-trip time of the request in seconds, or None if
+            unknown.
+        :type latency: float | None
+        :param decode_time: Time spent updating the cursor in seconds.
+        :type decode_time: float
+        :param idle: Time between the previous batch and the request.
+        :type idle: float
+        """
+        deserialize_time = resp.deserialize_time
+        if latency is not None:
+            latency = max(latency - deserialize_time, 0.0)
+        self._timings.append({
+            'latency': latency,
+            'deserialize': deserialize_time + decode_time,
+            'size': len(resp.raw_body or ''),
+            'count': len(result['batch']),
+            'idle': idle
+        })
+
+    def pipeline(self):
+        """Return a streaming pipeline over the cursor results.
+
+        :return: Pipeline.
+        :rtype: aioarangodb.pipeline.Pipeline
+        """
+        return Pipeline(self)
+
     def empty(self):
         """Check if the current batch is empty.
 
@@ -224,9 +366,12 @@ class Cursor(object):
         :raise arango.exceptions.CursorStateError: If cursor ID is not set.
         """
         if self.empty():
-            if not self.has_more():
-                raise StopAsyncIteration
-            await self.fetch()
+            if self._prefetch is not None:
+                await self.fetch()
+            if self.empty():
+                if not self.has_more():
+                    raise StopAsyncIteration
+                await self.fetch()
 
         return self.pop()
 
@@ -243,27 +388,136 @@ class Cursor(object):
         """
         if len(self._batch) == 0:
             raise CursorEmptyError('current batch is empty')
+        self._consumed = True
         return self._batch.popleft()
 
     async def fetch(self):
         """Fetch the next batch from server and update the cursor.
 
+        If the deadline of the cursor expires, or the fetch is cancelled and
+        the cursor has a deadline or was created with **kill_on_cancel**, the
+        cursor is closed in the background. This also aborts streaming
+        queries on the server.
+
         :return: New batch details.
         :rtype: dict
         :raise arango.exceptions.CursorNextError: If batch retrieval fails.
         :raise arango.exceptions.CursorStateError: If cursor ID is not set.
+        :raise arango.exceptions.AQLQueryTimeoutError: If the deadline of the
+            cursor expires.
+        """
+        self._owner = _current_task() or self._owner
+        # A pending prefetch is already fetching the next batch.
+        if self._deadline is None:
+            try:
+                return await (self._prefetch or self._fetch())
+            except asyncio.CancelledError:
+                if self._kill_on_cancel:
+                    self._abandon()
+                raise
+        try:
+            timeout = self._deadline - monotonic()
+            if timeout <= 0:
+                raise asyncio.TimeoutError
+            return await asyncio.wait_for(
+                self._prefetch or self._fetch(),
+                timeout
+            )
+        except asyncio.TimeoutError:
+            # Timeouts of the HTTP client itself are not the deadline.
+            if monotonic() < self._deadline:
+                raise
+            self._abandon()
+            raise AQLQueryTimeoutError('cursor deadline expired')
+        except asyncio.CancelledError:
+            self._abandon()
+            raise
+
+    def prefetch(self):
+        """Start fetching the next batch from server in the background.
+
+        The fetched items are appended to the current batch once the request
+        completes. Calling :func:`arango.cursor.Cursor.next` waits for any
+        pending prefetch before deciding whether another fetch is needed.
+
+        :return: Pending fetch, or None if there is nothing left to fetch.
+        :rtype: asyncio.Future | None
+        """
+        if self._prefetch is None and self._id is not None and self._has_more:
+            self._prefetch = asyncio.ensure_future(self._fetch_ahead())
+            self._prefetch.add_done_callback(self._prefetch_done)
+        return self._prefetch
+
+    def add_done_callback(self, callback):
+        """Add a callback to run once the cursor is depleted or closed.
+
+        The callback is called with the cursor as its only argument. If the
+        server has no more results already, it is called immediately.
+
+        :param callback: Callback.
+        :type callback: callable
         """
+        if self._callbacks is None or not self._has_more:
+            callback(self)
+        else:
+            self._callbacks.append(callback)
+
+    def _abandon(self):
+        """Close the cursor in the background after an interrupted fetch."""
+        if self._id is not None and self._has_more:
+            self._conn.cursors.discard(self)
+            self._done()
+
+    def _done(self):
+        callbacks, self._callbacks = self._callbacks, None
+        for callback in callbacks or ():
+            callback(self)
+
+    async def _fetch_ahead(self):
+        # Clear the prefetch as soon as its batch is appended. The done
+        # callback runs later, possibly after the batch was consumed.
+        try:
+            return await self._fetch()
+        finally:
+            self._prefetch = None
+
+    def _prefetch_done(self, future):
+        if self._prefetch is future:
+            self._prefetch = None
+        if not future.cancelled():
+            # Mark the error as retrieved. It is raised again to any consumer
+            # awaiting the prefetch.
+            future.exception()
+
+    async def _fetch(self):
         if self._id is None:
             raise CursorStateError('cursor ID not set')
         request = Request(
             method='put',
-            endpoint='/_api/{}/{}'.format(self._type, self._id)
+            endpoint='/_api/{}/{}'.format(self._type, self._id),
+            deserialize=self._deserialize
         )
+        self._accessed = start = monotonic()
         resp = await self._conn.send_request(request)
+        end = monotonic()
 
         if not resp.is_success:
+            if not request.deserialize:
+                resp = self._conn.prep_response(resp)
             raise CursorNextError(resp, request)
-        return self._update(resp.body)
+        result = self._update(resp.body)
+        self._record(
+            result,
+            resp,
+            end - start,
+            monotonic() - end,
+            max(start - self._received, 0.0)
+        )
+        self._received = monotonic()
+        if not self._has_more:
+            self._conn.cursors.unregister(self)
+            self._done()
+        return result
 
     async def close(self, ignore_missing=False):
         """Close the cursor and free any server resources tied to it.
@@ -280,6 +534,10 @@ class Cursor(object):
         """
         if self._id is None:
             return None
+        self._conn.cursors.unregister(self)
+        self._done()
+        if self._prefetch is not None:
+            self._prefetch.cancel()
         request = Request(
             method='delete',
             endpoint='/_api/{}/{}'.format(self._type, self._id)
@@ -290,3 +548,559 @@ class Cursor(object):
         if resp.status_code == 404 and ignore_missing:
             return False
         raise CursorCloseError(resp, request)
+
+
+class RawCursor(Cursor):
+    """Cursor API wrapper returning undecoded result batches.
+
+    Instead of individual documents, each item of a raw cursor is the
+    ``result`` array of one batch as raw JSON bytes, ready to be passed on
+    as is. Only the small envelope of each response (cursor ID, count, stats
+    etc.) is deserialized.
+
+    :param connection: HTTP connection.
+    :type connection: arango.connection.Connection
+    :param init_data: Raw response body of the cursor initialization.
+    :type init_data: str | unicode
+    :param cursor_type: Cursor type ("cursor" or "export").
+    :type cursor_type: str | unicode
+    :param ttl: Server side time-to-live for the cursor in seconds.
+    :type ttl: int | float
+    """
+
+    __slots__ = []
+
+    _deserialize = False
+
+    _prefix = '{"result":'
+    _suffix = '],"hasMore":'
+
+    def __repr__(self):
+        return '<RawCursor {}>'.format(self._id) if self._id else '<RawCursor>'
+
+    def _split(self, raw):
+        """Split the raw response body into its envelope and result array.
+
+        :param raw: Raw cursor response body.
+        :type raw: str | unicode
+        :return: Deserialized envelope and serialized result array.
+        :rtype: (dict, str | unicode)
+        """
+        # ArangoDB sends the result array first, followed by the envelope.
+        # Any match inside the array is followed by further documents and
+        # hence fails to deserialize as the envelope.
+        if raw.startswith(self._prefix):
+            end = raw.rfind(self._suffix)
+            if end != -1:
+                envelope = self._conn.deserialize('{' + raw[end + 2:])
+                if isinstance(envelope, dict) and 'hasMore' in envelope:
+                    return envelope, raw[len(self._prefix):end + 1]
+
+        envelope = self._conn.deserialize(raw)
+        return envelope, self._conn.serialize(envelope.pop('result'))
+
+    def _update(self, data):
+        """Update the cursor using the raw data from ArangoDB server.
+
+        :param data: Raw cursor response body.
+        :type data: str | unicode
+        """
+        envelope, batch = self._split(data)
+        envelope['result'] = [batch.encode('utf-8')]
+        return super(RawCursor, self)._update(envelope)
+
+
+class _Reversed(object):
+    """Key wrapper inverting the order of the wrapped key."""
+
+    __slots__ = ['key']
+
+    def __init__(self, key):
+        self.key = key
+
+    def __lt__(self, other):
+        return other.key < self.key
+
+    def __eq__(self, other):
+        return self.key == other.key
+
+
+class MergedCursor(object):
+    """Cursor merging several sorted cursors into one sorted stream.
+
+    The items are merged lazily with a heap, so only the current batch of
+    each input cursor is held in memory. When the batch of an input cursor
+    is depleted, its next batch is prefetched in the background.
+
+    Each input must be sorted by the same key (e.g. by running the same
+    sorted query per partition or per database).
+
+    :param cursors: Sorted cursors (or other async iterators).
+    :type cursors: [arango.cursor.Cursor]
+    :param key: Function returning the sort key of an item. If not given,
+        the items themselves are compared.
+    :type key: callable
+    :param reverse: If set to True, the inputs are sorted in descending
+        order.
+    :type reverse: bool
+    """
+
+    def __init__(self, cursors, key=None, reverse=False):
+        self._cursors = list(cursors)
+        self._key = key
+        self._reverse = reverse
+        self._heap = None
+        self._pending = None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):  # pragma: no cover
+        return await self.next()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_):
+        await self.close()
+
+    def __repr__(self):
+        return '<MergedCursor {}>'.format(len(self._cursors))
+
+    async def _push(self, index):
+        """Push the next item of an input cursor onto the heap.
+
+        :param index: Index of the input cursor.
+        :type index: int
+        """
+        cursor = self._cursors[index]
+        try:
+            item = await cursor.__anext__()
+        except StopAsyncIteration:
+            return
+        if getattr(cursor, 'empty', None) and cursor.empty():
+            cursor.prefetch()
+        key = item if self._key is None else self._key(item)
+        if self._reverse:
+            key = _Reversed(key)
+        heapq.heappush(self._heap, (key, index, item))
+
+    async def next(self):
+        """Return the next item in sort order.
+
+        :return: Next item.
+        :rtype: str | unicode | bool | int | list | dict
+        :raise StopAsyncIteration: If all input cursors are depleted.
+        :raise arango.exceptions.CursorNextError: If batch retrieval fails.
+        """
+        if self._heap is None:
+            self._heap = []
+            await asyncio.gather(*[
+                self._push(index) for index in range(len(self._cursors))
+            ])
+        elif self._pending is not None:
+            # Refill lazily, so the previous item is returned without
+            # waiting for the next one.
+            await self._push(self._pending)
+        self._pending = None
+        if not self._heap:
+            raise StopAsyncIteration
+        _, index, item = heapq.heappop(self._heap)
+        self._pending = index
+        return item
+
+    async def close(self):
+        """Close the input cursors with results pending on the server."""
+        self._heap = []
+        self._pending = None
+        for cursor in self._cursors:
+            if getattr(cursor, 'has_more', None) and cursor.has_more():
+                await cursor.close(ignore_missing=True)
+
+
+class _Failure(object):
+    """Exception raised by a source of a parallel cursor."""
+
+    __slots__ = ['error']
+
+    def __init__(self, error):
+        self.error = error
+
+
+_END = object()
+
+
+class ParallelCursor(object):
+    """Cursor merging the results of several cursors fetched concurrently.
+
+    Each source is a coroutine function returning a cursor (e.g. a partial
+    of :func:`arango.aql.AQL.execute`). Sources are executed in order, by up
+    to **concurrency** workers at a time. A worker picks the next source as
+    soon as it has fetched all the batches of its current one, which
+    balances the work if sources take different amounts of time.
+
+    If a source fails, the other workers are cancelled, their cursors are
+    closed and the error is raised to the consumer.
+
+    :param sources: Coroutine functions without arguments returning cursors.
+    :type sources: [callable]
+    :param concurrency: Max number of sources fetched concurrently.
+    :type concurrency: int
+    :param ordered: If set to True, the results of the sources are yielded
+        in the order of the sources. Otherwise batches are yielded in the
+        order they are fetched.
+    :type ordered: bool
+    :param queue_size: Max number of batches buffered (per source, if
+        **ordered** is set to True).
+    :type queue_size: int
+    """
+
+    def __init__(self, sources, concurrency=4, ordered=False, queue_size=16):
+        assert concurrency > 0, 'concurrency must be a positive int'
+        self._sources = list(sources)
+        self._concurrency = min(concurrency, len(self._sources)) or 1
+        self._ordered = ordered
+        if ordered:
+            self._queues = [
+                asyncio.Queue(maxsize=queue_size) for _ in self._sources
+            ]
+        else:
+            self._queues = [asyncio.Queue(maxsize=queue_size)]
+        self._indexes = iter(range(len(self._sources)))
+        self._batch = deque()
+        self._current = 0
+        self._ended = 0
+        self._tasks = None
+        self._stats = {}
+        self._warnings = []
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):  # pragma: no cover
+        return await self.next()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_):
+        await self.close()
+
+    def __repr__(self):
+        return '<ParallelCursor {}>'.format(len(self._sources))
+
+    def statistics(self):
+        """Return the statistics summed over the depleted source cursors.
+
+        :return: Cursor statistics.
+        :rtype: dict
+        """
+        return dict(self._stats)
+
+    def warnings(self):
+        """Return the warnings of the depleted source cursors.
+
+        :return: Warnings.
+        :rtype: list
+        """
+        return list(self._warnings)
+
+    def _start(self):
+        self._tasks = [
+            asyncio.ensure_future(self._work())
+            for _ in range(self._concurrency)
+        ]
+
+    async def _work(self):
+        for index in self._indexes:
+            queue = self._queues[index if self._ordered else 0]
+            try:
+                await self._read(await self._sources[index](), queue)
+            except asyncio.CancelledError:
+                raise
+            except Exception as err:
+                await queue.put(_Failure(err))
+                return
+            await queue.put(_END)
+
+    async def _read(self, cursor, queue):
+        try:
+            while True:
+                batch = cursor.batch()
+                if batch:
+                    items = list(batch)
+                    batch.clear()
+                    await queue.put(items)
+                if not cursor.has_more():
+                    break
+                await cursor.fetch()
+        finally:
+            if cursor.has_more():
+                await cursor.close(ignore_missing=True)
+
+        for key, value in (cursor.statistics() or {}).items():
+            if isinstance(value, (int, float)) and \
+                    not isinstance(value, bool):
+                self._stats[key] = self._stats.get(key, 0) + value
+        self._warnings.extend(cursor.warnings() or ())
+
+    async def next(self):
+        """Return the next item.
+
+        :return: Next item.
+        :rtype: str | unicode | bool | int | list | dict
+        :raise StopAsyncIteration: If all sources are depleted.
+        """
+        if self._tasks is None:
+            self._start()
+        while not self._batch:
+            if self._ended == len(self._sources):
+                raise StopAsyncIteration
+            queue = self._queues[self._current if self._ordered else 0]
+            entry = await queue.get()
+            if entry is _END:
+                self._ended += 1
+                self._current += 1
+            elif isinstance(entry, _Failure):
+                await self.close()
+                raise entry.error
+            else:
+                self._batch.extend(entry)
+        return self._batch.popleft()
+
+    async def close(self):
+        """Cancel the workers and close the cursors of the open sources."""
+        tasks, self._tasks = self._tasks or [], []
+        self._ended = len(self._sources)
+        self._batch.clear()
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.wait(tasks)
+
+
+def _current_task():
+    """Return the task running in the current event loop, if any.
+
+    :return: Current task or None.
+    :rtype: asyncio.Task | None
+    """
+    try:
+        return asyncio.current_task()
+    except RuntimeError:
+        return None
+
+
+class CursorRegistry(object):
+    """Registry of the open server-side cursors of a connection.
+
+    Every cursor with results pending on the server is registered here until
+    it is depleted or closed. Cursors which are garbage collected or whose
+    consuming task is cancelled before that are considered abandoned and
+    closed in the background. Once started, the registry also keeps slow but
+    active consumers alive by prefetching the next batch before the cursor
+    expires on the server.
+
+    :param connection: HTTP connection.
+    :type connection: arango.connection.Connection
+    :param keepalive_ratio: Fraction of the cursor time-to-live after which an
+        idle but actively consumed cursor is kept alive.
+    :type keepalive_ratio: float
+    """
+
+    default_ttl = 30
+
+    def __init__(self, connection, keepalive_ratio=0.5):
+        self._conn = connection
+        self._keepalive_ratio = keepalive_ratio
+        self._entries = {}
+        self._task = None
+        self._reaped = 0
+        self._background = set()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return '<CursorRegistry {}>'.format(len(self._entries))
+
+    @staticmethod
+    def _key(cursor):
+        return cursor.type, cursor.id
+
+    def _cursors(self):
+        """Return the registered cursors which are still alive.
+
+        :return: Registered cursors.
+        :rtype: [arango.cursor.Cursor]
+        """
+        cursors = []
+        for finalizer in list(self._entries.values()):
+            item = finalizer.peek()
+            if item is not None:
+                cursors.append(item[0])
+        return cursors
+
+    def register(self, cursor):
+        """Start tracking an open cursor.
+
+        :param cursor: Cursor with results pending on the server.
+        :type cursor: arango.cursor.Cursor
+        """
+        key = self._key(cursor)
+        loop = asyncio.get_event_loop()
+        finalizer = weakref.finalize(cursor, self._collect, key, loop)
+        finalizer.atexit = False
+        self._entries[key] = finalizer
+
+    def unregister(self, cursor):
+        """Stop tracking a cursor (e.g. after it was depleted or closed).
+
+        :param cursor: Cursor.
+        :type cursor: arango.cursor.Cursor
+        """
+        finalizer = self._entries.pop(self._key(cursor), None)
+        if finalizer is not None:
+            finalizer.detach()
+
+    def discard(self, cursor):
+        """Stop tracking a cursor and close it in the background.
+
+        :param cursor: Cursor.
+        :type cursor: arango.cursor.Cursor
+        :return: Background task closing the cursor.
+        :rtype: asyncio.Task
+        """
+        self.unregister(cursor)
+        self._reaped += 1
+        return self.spawn(self._close(cursor.type, cursor.id))
+
+    def spawn(self, coro):
+        """Run a cleanup coroutine in the background.
+
+        A reference to the task is kept until it completes, so that it is not
+        garbage collected while pending.
+
+        :param coro: Coroutine.
+        :type coro: collections.abc.Coroutine
+        :return: Background task.
+        :rtype: asyncio.Task
+        """
+        task = asyncio.ensure_future(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+        return task
+
+    def _collect(self, key, loop):
+        """Close the server cursor of a garbage collected cursor object.
+
+        Finalizers may run in another thread or after the event loop which
+        owned the cursor was closed, so the cursor is closed in that loop and
+        only while it is still open.
+        """
+        if self._entries.pop(key, None) is None:  # pragma: no cover
+            return
+        if loop.is_closed():  # pragma: no cover
+            return
+        self._reaped += 1
+        try:
+            loop.call_soon_threadsafe(
+                lambda: self.spawn(self._close(*key))
+            )
+        except RuntimeError:  # pragma: no cover
+            # The loop was closed in the meantime.
+            pass
+
+    async def _close(self, cursor_type, cursor_id):
+        request = Request(
+            method='delete',
+            endpoint='/_api/{}/{}'.format(cursor_type, cursor_id)
+        )
+        try:
+            await self._conn.send_request(request)
+        except Exception:  # pragma: no cover
+            pass
+
+    def report(self):
+        """Return the number and ages of the open cursors.
+
+        :return: Open cursor details. Ages and idle times are in seconds.
+        :rtype: dict
+        """
+        now = monotonic()
+        cursors = [
+            {
+                'id': cursor.id,
+                'type': cursor.type,
+                'age': now - cursor._created,
+                'idle': now - cursor._accessed,
+                'ttl': cursor.ttl
+            }
+            for cursor in self._cursors()
+        ]
+        return {
+            'count': len(cursors),
+            'reaped': self._reaped,
+            'cursors': cursors
+        }
+
+    async def sweep(self):
+        """Close abandoned cursors and keep actively consumed ones alive.
+
+        This is called periodically once the registry is started, but can
+        also be called manually.
+
+        :return: Number of cursors closed and kept alive.
+        :rtype: dict
+        """
+        now = monotonic()
+        closed = kept_alive = 0
+        for cursor in self._cursors():
+            owner = cursor._owner
+            if owner is not None and owner.cancelled():
+                self.unregister(cursor)
+                self._reaped += 1
+                await self._close(cursor.type, cursor.id)
+                closed += 1
+            elif now - cursor._accessed > cursor.ttl:
+                # The server has expired the cursor already.
+                self.unregister(cursor)
+            elif cursor._consumed and (
+                    now - cursor._accessed >
+                    cursor.ttl * self._keepalive_ratio):
+                cursor._consumed = False
+                if cursor.prefetch() is not None:
+                    kept_alive += 1
+        return {'closed': closed, 'kept_alive': kept_alive}
+
+    async def _run(self, interval):
+        while True:
+            await asyncio.sleep(interval)
+            await self.sweep()
+
+    def start(self, interval=1.0):
+        """Start sweeping the registry periodically in the background.
+
+        :param interval: Seconds between sweeps.
+        :type interval: int | float
+        """
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run(interval))
+
+    async def stop(self):
+        """Stop the background sweeps."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.wait([self._task])
+            self._task = None
+
+    async def close_all(self):
+        """Close all open cursors.
+
+        :return: Number of cursors closed.
+        :rtype: int
+        """
+        cursors = self._cursors()
+        for cursor in cursors:
+            await cursor.close(ignore_missing=True)
+        return len(cursors)
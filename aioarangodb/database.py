@@ -13,7 +13,7 @@ from .executor import (
     TransactionExecutor,
 )
 from .cluster import Cluster
-from .collection import StandardCollection
+from .collection import DocumentCache, StandardCollection
 from .exceptions import (
     AnalyzerCreateError,
     AnalyzerDeleteError,
@@ -1055,7 +1055,10 @@ class Database(APIWrapper):
             params["isSystem"] = system
 
         request = Request(
-            method="delete", endpoint="/_api/collection/{}".format(name), params=params
+            method="delete",
+            endpoint="/_api/collection/{}".format(name),
+            params=params,
+            write=name
         )
 
         def response_handler(resp):
@@ -1242,6 +1245,44 @@ class Database(APIWrapper):
     # Document Management #
     #######################
 
+    def enable_document_cache(self, max_size=10000, max_bytes=None, ttl=1):
+        """Enable the in-process document cache.
+
+        The cache is shared by all API wrappers of the connection and is used
+        when getting documents, vertices and edges by ID or key without an
+        expected revision. Documents older than **ttl** are revalidated with
+        a conditional request, which is answered without the document body if
+        it is unchanged. Cached documents are invalidated whenever this client
+        writes to their collection.
+
+        :param max_size: Max number of cached documents. The least recently
+            used documents are evicted first.
+        :type max_size: int
+        :param max_bytes: Max total size of the cached documents in bytes, or
+            None for no limit.
+        :type max_bytes: int | None
+        :param ttl: Freshness window in seconds. Set to 0 to revalidate on
+            every read.
+        :type ttl: int | float
+        :return: Document cache.
+        :rtype: arango.collection.DocumentCache
+        """
+        self._conn.document_cache = DocumentCache(max_size, max_bytes, ttl)
+        return self._conn.document_cache
+
+    def disable_document_cache(self):
+        """Disable and clear the in-process document cache."""
+        self._conn.document_cache = None
+
+    @property
+    def document_cache(self):
+        """Return the in-process document cache.
+
+        :return: Document cache, or None if not enabled.
+        :rtype: arango.collection.DocumentCache | None
+        """
+        return self._conn.document_cache
+
     async def has_document(self, document, rev=None, check_rev=True):
         """Check if a document exists.
 
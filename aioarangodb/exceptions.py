@@ -106,6 +106,10 @@ class AQLQueryKillError(ArangoServerError):
     """Failed to kill the query."""
 
 
+class AQLQueryTimeoutError(ArangoClientError, TimeoutError):
+    """The query did not complete before the client-side deadline."""
+
+
 class AQLQueryClearError(ArangoServerError):
     """Failed to clear slow AQL queries."""
 
@@ -352,6 +356,10 @@ class DocumentRevisionError(ArangoServerError):
     """The expected and actual document revisions mismatched."""
 
 
+class DocumentWriterStateError(ArangoClientError):
+    """The buffered document writer was in a bad state."""
+
+
 ###################
 # Foxx Exceptions #
 ###################
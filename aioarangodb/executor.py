@@ -157,8 +157,12 @@ class BatchExecutor(Executor):
                 buffer.append('{}: {}'.format(key, value))
 
         if request.data is not None:
-            serialized = self._conn.serialize(request.data)
-            buffer.append('\r\n' + serialized)
+            # Payloads serialized ahead (e.g. by prepared queries) are sent
+            # unchanged instead of being encoded again as a JSON string.
+            data = self._conn.get_normalized_data(request)
+            if isinstance(data, (bytes, memoryview)):
+                data = bytes(data).decode('utf-8')
+            buffer.append('\r\n' + data)
 
         return '\r\n'.join(buffer)
 
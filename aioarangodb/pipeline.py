@@ -0,0 +1,398 @@
+from __future__ import absolute_import, unicode_literals
+
+__all__ = ['Pipeline', 'fan_out']
+
+import asyncio
+from functools import partial
+from inspect import isawaitable
+from time import monotonic
+
+_DONE = object()
+
+
+async def _close_source(source):
+    """Release the server resources held by an abandoned source.
+
+    :param source: Cursor or async generator.
+    :type source: arango.cursor.Cursor | collections.abc.AsyncGenerator
+    """
+    if hasattr(source, 'has_more'):
+        if source.has_more():
+            await source.close(ignore_missing=True)
+    elif hasattr(source, 'aclose'):
+        await source.aclose()
+
+
+async def _call(func, item):
+    """Call a regular or coroutine function with the item.
+
+    :param func: Regular or coroutine function.
+    :type func: callable
+    :param item: Item to pass.
+    :type item: object
+    :return: Function result.
+    :rtype: object
+    """
+    result = func(item)
+    if isawaitable(result):
+        result = await result
+    return result
+
+
+async def _cancel(tasks):
+    """Cancel the tasks and wait for them to finish.
+
+    :param tasks: Tasks to cancel.
+    :type tasks: [asyncio.Task]
+    """
+    for task in tasks:
+        task.cancel()
+    if tasks:
+        await asyncio.wait(tasks)
+
+
+async def fan_out(source, worker, concurrency=4, queue_size=None,
+                  ordered=False):
+    """Run an async worker function over the items of a cursor concurrently.
+
+    A single fetcher task reads the items from **source** (so the cursor is
+    never shared) and keeps a bounded queue filled for **concurrency** worker
+    tasks. The worker results are yielded as an async generator.
+
+    If a worker raises an exception, the remaining workers are cancelled and
+    the exception is raised to the consumer. If the consumer stops early (or
+    is cancelled), all tasks are cancelled and the cursor is closed.
+
+    :param source: Cursor or any other async iterable.
+    :type source: arango.cursor.Cursor | collections.abc.AsyncIterable
+    :param worker: Coroutine function called with each item.
+    :type worker: callable
+    :param concurrency: Number of worker tasks.
+    :type concurrency: int
+    :param queue_size: Max number of items fetched but not yet processed. If
+        not given, twice the value of **concurrency** is used.
+    :type queue_size: int
+    :param ordered: If set to True, results are yielded in the order of the
+        items in **source**. Otherwise they are yielded as they complete.
+    :type ordered: bool
+    :return: Async generator of worker results.
+    :rtype: collections.abc.AsyncGenerator
+    """
+    assert concurrency > 0, 'concurrency must be a positive int'
+    queue_size = queue_size or concurrency * 2
+
+    items = asyncio.Queue(maxsize=queue_size)
+    results = asyncio.Queue()
+    # Bounds the items in flight, including results waiting for their turn
+    # when ordered, so a slow item cannot make the buffers grow unbounded.
+    window = asyncio.Semaphore(queue_size + concurrency)
+    exhausted = []
+
+    async def fetch():
+        index = 0
+        async for item in source:
+            await window.acquire()
+            await items.put((index, item))
+            index += 1
+        exhausted.append(True)
+        for _ in range(concurrency):
+            await items.put(_DONE)
+
+    async def work():
+        while True:
+            entry = await items.get()
+            if entry is _DONE:
+                await results.put(_DONE)
+                return
+            index, item = entry
+            try:
+                result = await worker(item)
+            except Exception as err:
+                await results.put((index, err, True))
+                return
+            await results.put((index, result, False))
+
+    async def watch_fetcher(task):
+        # Surface errors from the cursor (e.g. a failed batch fetch).
+        try:
+            await task
+        except asyncio.CancelledError:
+            raise
+        except Exception as err:
+            await results.put((None, err, True))
+
+    fetcher = asyncio.ensure_future(fetch())
+    tasks = [asyncio.ensure_future(watch_fetcher(fetcher))]
+    tasks.extend(asyncio.ensure_future(work()) for _ in range(concurrency))
+
+    pending = {}
+    next_index = 0
+    running = concurrency
+    try:
+        while running:
+            entry = await results.get()
+            if entry is _DONE:
+                running -= 1
+                continue
+            index, value, failed = entry
+            if failed:
+                raise value
+            if not ordered:
+                window.release()
+                yield value
+                continue
+            pending[index] = value
+            while next_index in pending:
+                window.release()
+                yield pending.pop(next_index)
+                next_index += 1
+    finally:
+        await _cancel([fetcher] + tasks)
+        if not exhausted:
+            await _close_source(source)
+
+
+async def _map(source, func):
+    try:
+        async for item in source:
+            yield await _call(func, item)
+    finally:
+        await _close_source(source)
+
+
+async def _filter(source, predicate):
+    try:
+        async for item in source:
+            if await _call(predicate, item):
+                yield item
+    finally:
+        await _close_source(source)
+
+
+async def _chunk(source, size):
+    try:
+        chunk = []
+        async for item in source:
+            chunk.append(item)
+            if len(chunk) == size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    finally:
+        await _close_source(source)
+
+
+async def _rate_limit(source, rate, per):
+    interval = per / rate
+    try:
+        next_time = monotonic()
+        async for item in source:
+            delay = next_time - monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            next_time = max(next_time, monotonic() - interval) + interval
+            yield item
+    finally:
+        await _close_source(source)
+
+
+class _Tee(object):
+    """Shared state of the branches created by :func:`Pipeline.tee`.
+
+    :param source: Pipeline to read from.
+    :type source: aioarangodb.pipeline.Pipeline
+    :param count: Number of branches.
+    :type count: int
+    :param queue_size: Max number of items buffered per branch.
+    :type queue_size: int
+    """
+
+    def __init__(self, source, count, queue_size):
+        self._source = source
+        self._queues = [asyncio.Queue(maxsize=queue_size) for _ in range(count)]
+        self._open = set(range(count))
+        self._pump = None
+
+    async def _run(self):
+        try:
+            async for item in self._source:
+                for index in list(self._open):
+                    await self._queues[index].put((item, False))
+            entry = (_DONE, False)
+        except Exception as err:
+            entry = (err, True)
+        for index in list(self._open):
+            await self._queues[index].put(entry)
+
+    async def branch(self, index):
+        if self._pump is None:
+            self._pump = asyncio.ensure_future(self._run())
+        queue = self._queues[index]
+        try:
+            while True:
+                item, failed = await queue.get()
+                if failed:
+                    raise item
+                if item is _DONE:
+                    return
+                yield item
+        finally:
+            await self.close(index)
+
+    async def close(self, index):
+        """Close a branch, and the source once all branches are closed.
+
+        :param index: Branch index.
+        :type index: int
+        """
+        if index not in self._open:
+            return
+        self._open.discard(index)
+        # Unblock the pump if it is waiting on this branch.
+        queue = self._queues[index]
+        while not queue.empty():
+            queue.get_nowait()
+        if not self._open:
+            if self._pump is not None:
+                await _cancel([self._pump])
+            await self._source.aclose()
+
+
+class Pipeline(object):
+    """Composable streaming stages over cursor results.
+
+    Each stage returns a new pipeline wrapping an async generator, so items
+    are processed one at a time as they are read from the cursor and no
+    intermediate lists are built. Stages are only run when the pipeline is
+    iterated. If the iteration stops early, call :func:`Pipeline.aclose` (or
+    use the pipeline as an async context manager) to stop the stages and
+    close the cursor.
+
+    Functions passed to the stages may be regular or coroutine functions.
+
+    :param source: Cursor or any other async iterable.
+    :type source: arango.cursor.Cursor | collections.abc.AsyncIterable
+    """
+
+    def __init__(self, source, on_close=None):
+        self._source = source
+        self._on_close = on_close
+        self._started = False
+
+    def __aiter__(self):
+        self._started = True
+        return self._source.__aiter__()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        """Stop the pipeline and close the cursor if it has results pending.
+
+        This is called automatically when the pipeline is used as an async
+        context manager. Closing one branch of :func:`Pipeline.tee` closes the
+        cursor only once all its branches are closed.
+        """
+        await _close_source(self._source)
+        if not self._started and self._on_close is not None:
+            # The stage never ran, so it did not close the previous ones.
+            await self._on_close()
+
+    def __repr__(self):
+        return '<Pipeline {!r}>'.format(self._source)
+
+    def map(self, func, concurrency=1, ordered=True):
+        """Apply a function to each item.
+
+        :param func: Function called with each item.
+        :type func: callable
+        :param concurrency: Max number of concurrent calls. Values greater
+            than 1 apply only to coroutine functions (see
+            :func:`aioarangodb.pipeline.fan_out`).
+        :type concurrency: int
+        :param ordered: If set to False and **concurrency** is greater than 1,
+            results are yielded as they complete instead of in order.
+        :type ordered: bool
+        :return: New pipeline.
+        :rtype: aioarangodb.pipeline.Pipeline
+        """
+        assert concurrency > 0, 'concurrency must be a positive int'
+        if concurrency == 1:
+            return Pipeline(_map(self._source, func), self.aclose)
+
+        async def worker(item):
+            return await _call(func, item)
+
+        return Pipeline(fan_out(
+            self._source,
+            worker,
+            concurrency=concurrency,
+            ordered=ordered
+        ), self.aclose)
+
+    def filter(self, predicate):
+        """Keep only the items for which the predicate returns True.
+
+        :param predicate: Function called with each item.
+        :type predicate: callable
+        :return: New pipeline.
+        :rtype: aioarangodb.pipeline.Pipeline
+        """
+        return Pipeline(_filter(self._source, predicate), self.aclose)
+
+    def chunk(self, size):
+        """Group the items into lists (e.g. for bulk inserts).
+
+        :param size: Max number of items per list. The last list may have
+            fewer items.
+        :type size: int
+        :return: New pipeline.
+        :rtype: aioarangodb.pipeline.Pipeline
+        """
+        assert size > 0, 'size must be a positive int'
+        return Pipeline(_chunk(self._source, size), self.aclose)
+
+    def rate_limit(self, rate, per=1.0):
+        """Limit the rate at which items are passed on.
+
+        :param rate: Max number of items per period.
+        :type rate: int | float
+        :param per: Period in seconds.
+        :type per: int | float
+        :return: New pipeline.
+        :rtype: aioarangodb.pipeline.Pipeline
+        """
+        assert rate > 0, 'rate must be a positive number'
+        return Pipeline(_rate_limit(self._source, rate, per), self.aclose)
+
+    def tee(self, count=2, queue_size=100):
+        """Split the pipeline into several independent branches.
+
+        Every branch receives all the items. The branches must be consumed
+        concurrently: when the buffer of one branch is full, reading from the
+        source is paused until it catches up.
+
+        :param count: Number of branches.
+        :type count: int
+        :param queue_size: Max number of items buffered per branch.
+        :type queue_size: int
+        :return: Branch pipelines.
+        :rtype: [aioarangodb.pipeline.Pipeline]
+        """
+        tee = _Tee(self, count, queue_size)
+        return [
+            Pipeline(tee.branch(index), partial(tee.close, index))
+            for index in range(count)
+        ]
+
+    async def collect(self):
+        """Run the pipeline and return all items.
+
+        :return: Items.
+        :rtype: list
+        """
+        return [item async for item in self]
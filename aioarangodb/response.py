@@ -39,6 +39,8 @@ class Response(object):
     :vartype error_message: str | unicode
     :ivar is_success: True if response status code was 2XX.
     :vartype is_success: bool
+    :ivar deserialize_time: Time spent deserializing the body in seconds.
+    :vartype deserialize_time: float
     """
 
     __slots__ = (
@@ -52,6 +54,7 @@ class Response(object):
         'error_code',
         'error_message',
         'is_success',
+        'deserialize_time',
     )
 
     def __init__(self,
@@ -73,3 +76,4 @@ class Response(object):
         self.error_code = None
         self.error_message = None
         self.is_success = None
+        self.deserialize_time = 0.0
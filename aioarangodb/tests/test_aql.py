@@ -1,5 +1,13 @@
 from __future__ import absolute_import, unicode_literals
+import asyncio
+import io
+import json
+
+import mock
 import pytest
+from aiohttp import ServerTimeoutError
+from aioarangodb.aql import AQL
+from aioarangodb.cursor import Cursor
 from aioarangodb.exceptions import (
     AQLCacheClearError,
     AQLCacheConfigureError,
@@ -15,9 +23,15 @@ from aioarangodb.exceptions import (
     AQLQueryTrackingGetError,
     AQLQueryTrackingSetError,
     AQLQueryKillError,
+    AQLQueryTimeoutError,
     AQLQueryValidateError
 )
-from aioarangodb.tests.helpers import assert_raises, extract
+from aioarangodb.utils import get_query_fingerprint
+from aioarangodb.tests.helpers import (
+    assert_raises,
+    extract,
+    generate_col_name
+)
 pytestmark = pytest.mark.asyncio
 
 
@@ -350,3 +364,454 @@ async def test_aql_cache_management(db, bad_db):
     with assert_raises(AQLCacheClearError) as err:
         await bad_db.aql.cache.clear()
     assert err.value.error_code in {11, 1228}
+
+
+async def test_aql_result_cache(db, col, docs):
+    await col.truncate()
+    await col.insert_many(docs)
+    query = 'FOR d IN {} RETURN d'.format(col.name)
+
+    assert db.aql.result_cache is None
+    cache = db.aql.enable_result_cache(max_size=2, ttl=60)
+    assert repr(cache) == '<AQLResultCache 0>'
+    try:
+        # Test cache miss with collections detected via explain
+        cursor = await db.aql.execute(query, batch_size=1, local_cache=True)
+        assert cursor.cached() is False
+        assert cursor.has_more() is False
+        assert len(cursor.batch()) == len(docs)
+        assert len(cache) == 1
+
+        # Test cache hit
+        cursor = await db.aql.execute(query, local_cache=True)
+        assert cursor.cached() is True
+        assert await extract('_key', cursor) == await extract('_key', docs)
+        assert cache.stats()['hits'] == 1
+        assert cache.stats()['misses'] == 1
+
+        # Test modifying the results of a cache hit
+        cursor = await db.aql.execute(query, local_cache=True)
+        for doc in cursor.batch():
+            doc['val'] = 'modified'
+        cursor.batch()[0].pop('_key')
+        cursor = await db.aql.execute(query, local_cache=True)
+        assert cursor.cached() is True
+        assert all(doc['val'] != 'modified' for doc in cursor.batch())
+        assert await extract('_key', cursor) == await extract('_key', docs)
+
+        # Test queries not using the cache
+        cursor = await db.aql.execute(query)
+        assert cursor.cached() is False
+
+        # Test invalidation on write
+        await col.insert({'_key': 'new'})
+        assert len(cache) == 0
+        assert cache.stats()['invalidations'] == 1
+        cursor = await db.aql.execute(query, local_cache=True)
+        assert len(cursor.batch()) == len(docs) + 1
+
+        # Test invalidation on undeclared write query
+        await db.aql.execute(
+            'REMOVE "new" IN {}'.format(col.name)
+        )
+        assert len(cache) == 0
+
+        # Test write queries are not cached
+        await db.aql.execute(
+            'INSERT {{_key: "new"}} IN {}'.format(col.name),
+            local_cache=True
+        )
+        assert len(cache) == 0
+
+        # Test read_collections and eviction
+        for limit in range(3):
+            await db.aql.execute(
+                '{} LIMIT {} RETURN d'.format(query[:-9], limit),
+                read_collections=[col.name],
+                local_cache=True
+            )
+        assert len(cache) == 2
+        assert cache.stats()['evictions'] == 1
+
+        cache.clear()
+        assert len(cache) == 0
+    finally:
+        db.aql.disable_result_cache()
+    assert db.aql.result_cache is None
+
+
+async def test_aql_prepared_query(db, col, docs):
+    await col.truncate()
+    await col.insert_many(docs)
+
+    # Test prepare invalid query
+    with assert_raises(AQLQueryValidateError) as err:
+        await db.aql.prepare('INVALID QUERY')
+    assert err.value.error_code == 1501
+
+    # Test prepare and execute read query
+    query = await db.aql.prepare(
+        'FOR d IN @@col FILTER d.val >= @val SORT d._key RETURN d._key',
+        batch_size=2,
+        count=True
+    )
+    assert repr(query) == '<PreparedQuery in {}>'.format(db.name)
+    assert set(query.bind_vars) == {'@col', 'val'}
+    for val in range(1, 4):
+        cursor = await query.execute({'@col': col.name, 'val': val})
+        assert cursor.count() == len([d for d in docs if d['val'] >= val])
+
+    # Test execute with bad bind vars
+    with assert_raises(AQLQueryExecuteError):
+        await query.execute({'@col': generate_col_name(), 'val': 1})
+
+    # Test collections of a write query
+    query = await db.aql.prepare(
+        'FOR d IN {} INSERT {{val: d.val}} INTO @@col'.format(col.name)
+    )
+    target = generate_col_name()
+    assert query.collections({'@col': target}) == {
+        'read': [col.name],
+        'write': [target]
+    }
+
+
+async def test_aql_batch_tuning(db, col, docs):
+    await col.truncate()
+    await col.insert_many(docs)
+    query = 'FOR d IN {} FILTER d.val > {} RETURN d'
+
+    assert get_query_fingerprint(query.format(col.name, 0)) == \
+        get_query_fingerprint(query.format(col.name, '"a"') + ' // comment')
+
+    assert db.aql.batch_tuner is None
+    tuner = db.aql.enable_batch_tuning(target_size=300, min_size=1)
+    assert repr(tuner) == '<BatchSizeTuner 0>'
+    try:
+        fingerprint = get_query_fingerprint(query.format(col.name, 0))
+        assert tuner.batch_size(fingerprint) is None
+
+        cursor = await db.aql.execute(query.format(col.name, 0))
+        assert len(cursor.batch()) == len(docs)
+        batch_size = tuner.batch_size(fingerprint)
+        assert 1 <= batch_size < len(docs)
+        assert tuner.report()[fingerprint]['samples'] == 1
+
+        # Test tuned batch size is used for the same fingerprint
+        cursor = await db.aql.execute(query.format(col.name, -1))
+        assert len(cursor.batch()) == batch_size
+        assert len([doc async for doc in cursor]) == len(docs)
+        assert tuner.report()[fingerprint]['samples'] == 2
+
+        # Test explicit batch size is not tuned
+        cursor = await db.aql.execute(query.format(col.name, 0), batch_size=6)
+        assert len(cursor.batch()) == 6
+        assert tuner.report()[fingerprint]['samples'] == 2
+    finally:
+        db.aql.disable_batch_tuning()
+    assert db.aql.batch_tuner is None
+
+
+async def test_aql_profiler(db, col, docs):
+    await col.truncate()
+    await col.insert_many(docs)
+    query = 'FOR d IN {} FILTER d.val > {} RETURN d'
+
+    assert db.aql.profiler is None
+    profiler = db.aql.enable_profiler(call_sites=True)
+    assert repr(profiler) == '<QueryProfiler 0>'
+    try:
+        for val in range(3):
+            cursor = await db.aql.execute(
+                query.format(col.name, val),
+                batch_size=2
+            )
+            assert len([doc async for doc in cursor]) == len(docs) - val
+
+        with assert_raises(AQLQueryExecuteError):
+            await db.aql.execute(query.format(generate_col_name(), 0))
+
+        rows = profiler.report()
+        assert len(rows) == 2
+        row = rows[0]
+        assert row['fingerprint'] == get_query_fingerprint(
+            query.format(col.name, 0)
+        )
+        assert row['calls'] == 3
+        assert row['errors'] == 0
+        assert row['rows'] == len(docs) * 3 - 3
+        assert row['bytes'] > 0
+        assert row['scanned_full'] == len(docs) * 3
+        assert row['p50_time'] <= row['p99_time']
+        assert row['server_time'] > 0
+        assert list(row['call_sites'].values()) == [3]
+        assert rows[1]['errors'] == 1
+        assert profiler.report(sort_by='errors')[0]['errors'] == 1
+
+        with assert_raises(AssertionError):
+            profiler.report(sort_by='fingerprint')
+
+        output = io.StringIO()
+        profiler.export(output, fmt='json', limit=1)
+        assert json.loads(output.getvalue())[0]['calls'] == 3
+
+        output = io.StringIO()
+        profiler.export(output, fmt='csv')
+        assert output.getvalue().startswith(','.join(profiler.fields))
+
+        profiler.reset()
+        assert len(profiler) == 0
+    finally:
+        db.aql.disable_profiler()
+    assert db.aql.profiler is None
+
+
+async def test_aql_execute_partitioned(db, col, docs):
+    await col.truncate()
+    await col.insert_many(docs)
+
+    cursor = await db.aql.execute_partitioned(
+        'FOR d IN @@col FILTER d._key >= @lower AND d._key < @upper RETURN d',
+        collection=col.name,
+        partitions=4,
+        concurrency=2,
+        bind_vars={'@col': col.name},
+        batch_size=1
+    )
+    assert 'ParallelCursor' in repr(cursor)
+    assert await extract('_key', [d async for d in cursor]) == \
+        await extract('_key', docs)
+    assert cursor.statistics()['modified'] == 0
+
+    # Test partitioning on a numeric attribute
+    cursor = await db.aql.execute_partitioned(
+        'FOR d IN {} FILTER d.val >= @lower AND d.val < @upper '
+        'RETURN d.val'.format(col.name),
+        collection=col.name,
+        attribute='val',
+        concurrency=3
+    )
+    assert sorted([val async for val in cursor]) == \
+        sorted(doc['val'] for doc in docs)
+
+    # Test execute partitioned with an invalid query
+    with assert_raises(AQLQueryExecuteError):
+        cursor = await db.aql.execute_partitioned(
+            'INVALID QUERY',
+            collection=col.name
+        )
+        await cursor.next()
+
+
+async def test_aql_execute_many(db, col, docs):
+    await col.truncate()
+    await col.insert_many(docs)
+    query = 'FOR d IN {} FILTER d.val == @val RETURN d._key'.format(col.name)
+
+    results = await db.aql.execute_many(
+        [(query, {'val': doc['val']}) for doc in docs] + [
+            'INVALID QUERY',
+            {'query': query, 'bind_vars': {'val': -1}},
+            'RETURN 1'
+        ],
+        concurrency=2,
+        batch_size=1
+    )
+    assert len(results) == len(docs) + 3
+    for doc, result in zip(docs, results):
+        assert result == [doc['_key']]
+    assert isinstance(results[-3], AQLQueryExecuteError)
+    assert results[-2] == []
+    assert results[-1] == [1]
+
+    # Test execute many with a partitioned bind variable
+    results = await db.aql.execute_many(
+        [{
+            'query': 'FOR key IN @keys RETURN key',
+            'bind_vars': {'keys': [doc['_key'] for doc in docs]},
+            'partition_bind_var': 'keys',
+            'partition_size': 2
+        }],
+        batch_size=1
+    )
+    assert sorted(results[0]) == sorted(doc['_key'] for doc in docs)
+
+
+async def test_aql_execute_with_partitioned_bind_var(db, col, docs):
+    await col.truncate()
+    await col.insert_many(docs)
+    keys = [doc['_key'] for doc in docs] + ['missing']
+
+    cursor = await db.aql.execute(
+        'FOR key IN @keys RETURN DOCUMENT(@@col, key)._key',
+        bind_vars={'keys': keys, '@col': col.name},
+        batch_size=1,
+        partition_bind_var='keys',
+        partition_size=2,
+        partition_concurrency=2
+    )
+    assert [key async for key in cursor] == keys[:-1] + [None]
+
+    # Test execute with partitioned bind var and an invalid query
+    cursor = await db.aql.execute(
+        'FOR key IN @keys RETURN DOCUMENT(@@col, key)',
+        bind_vars={'keys': keys},
+        partition_bind_var='keys',
+        partition_size=2
+    )
+    with assert_raises(AQLQueryExecuteError):
+        await cursor.next()
+
+
+async def test_aql_execute_with_deadline(db, col, docs):
+    await col.truncate()
+    await col.insert_many(docs)
+    query = 'FOR doc IN @@col RETURN doc._key'
+    bind_vars = {'@col': col.name}
+
+    # Test execute with a deadline which does not expire
+    cursor = await db.aql.execute(query, bind_vars=bind_vars, timeout=30)
+    assert len([key async for key in cursor]) == len(docs)
+
+    # Test execute with an expired deadline
+    with assert_raises(AQLQueryTimeoutError) as err:
+        await db.aql.execute(
+            'FOR doc IN @@col LET x = SLEEP(5) RETURN doc',
+            bind_vars=bind_vars,
+            timeout=0.5
+        )
+    assert isinstance(err.value, TimeoutError)
+    await asyncio.sleep(1)
+    queries = await db.aql.queries()
+    assert not any('SLEEP(5)' in q['query'] for q in queries)
+
+    # Test cancelling a query which is killed on cancellation
+    task = asyncio.ensure_future(db.aql.execute(
+        'FOR doc IN @@col LET x = SLEEP(5) RETURN doc',
+        bind_vars=bind_vars,
+        kill_on_cancel=True
+    ))
+    await asyncio.sleep(0.5)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    await asyncio.sleep(1)
+    queries = await db.aql.queries()
+    assert not any('SLEEP(5)' in q['query'] for q in queries)
+
+    # Test cursor deadline expiring between batches
+    cursor = await db.aql.execute(
+        query,
+        bind_vars=bind_vars,
+        batch_size=1,
+        stream=True,
+        timeout=0.5
+    )
+    await cursor.next()
+    await asyncio.sleep(1)
+    with assert_raises(AQLQueryTimeoutError):
+        await cursor.next()
+    assert len(db.conn.cursors) == 0
+
+    # Test cancelling a fetch keeps the cursor open by default
+    for kill_on_cancel in (False, True):
+        cursor = await db.aql.execute(
+            query,
+            bind_vars=bind_vars,
+            batch_size=1,
+            kill_on_cancel=kill_on_cancel
+        )
+        await cursor.next()
+        task = asyncio.ensure_future(cursor.fetch())
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert len(db.conn.cursors) == (0 if kill_on_cancel else 1)
+        await cursor.close(ignore_missing=True)
+
+    # Test timeouts of the HTTP client are not mistaken for the deadline
+    for timeout in (None, 30):
+        cursor = await db.aql.execute(
+            query,
+            bind_vars=bind_vars,
+            batch_size=1,
+            timeout=timeout
+        )
+        await cursor.next()
+        with mock.patch.object(
+            Cursor, '_fetch', side_effect=ServerTimeoutError()
+        ):
+            with pytest.raises(ServerTimeoutError) as err:
+                await cursor.fetch()
+        assert not isinstance(err.value, AQLQueryTimeoutError)
+        assert len(db.conn.cursors) == 1
+        await cursor.close(ignore_missing=True)
+
+
+async def test_aql_plan_cache(db, docs):
+    col_name = generate_col_name()
+    col = await db.create_collection(col_name)
+    await col.insert_many(docs)
+    index = await col.add_persistent_index(fields=['val'], name='val_index')
+    query = 'FOR doc IN @@col FILTER doc.val == @val RETURN doc'
+    fingerprint = get_query_fingerprint(query)
+
+    plan_cache = db.aql.enable_plan_cache(cost_threshold=2)
+    assert db.aql.plan_cache is plan_cache
+    assert repr(plan_cache) == '<QueryPlanCache 0>'
+
+    # Test the plan of a new fingerprint is explained once
+    for val in (1, 2):
+        cursor = await db.aql.execute(
+            query,
+            bind_vars={'@col': col_name, 'val': val}
+        )
+        assert len([doc async for doc in cursor]) == 1
+    await asyncio.sleep(0.5)
+    assert fingerprint in plan_cache
+    entry = plan_cache.get(fingerprint)
+    assert entry['bind_vars'] == {'@col': col_name, 'val': 1}
+    assert entry['baseline']['indexes'] == [col_name + '/val_index']
+    assert entry['baseline']['full_scans'] == []
+    assert await db.aql.check_plans() == []
+
+    # Test dropping the index is flagged as a regression
+    await col.delete_index(index['id'])
+    regressions = await db.aql.check_plans()
+    assert len(regressions) == 1
+    assert regressions[0]['fingerprint'] == fingerprint
+    assert regressions[0]['plan']['full_scans'] == [col_name]
+    assert 'full scan of collection "{}"'.format(col_name) in \
+        regressions[0]['reasons']
+    assert plan_cache.regressions() == regressions
+
+    # Test accepting the latest plans
+    plan_cache.accept()
+    assert await db.aql.check_plans() == []
+
+    # Test queries failing to explain are flagged as regressions
+    await db.delete_collection(col_name)
+    regressions = await db.aql.check_plans()
+    assert regressions[0]['reasons'][0].startswith('explain failed')
+
+    # Test plans dropped from the cache while explaining
+    explain = db.aql.explain
+
+    async def explain_cleared(*args, **kwargs):
+        plan_cache.clear()
+        return await explain(*args, **kwargs)
+
+    with mock.patch.object(AQL, 'explain', side_effect=explain_cleared):
+        regressions = await db.aql.check_plans()
+    assert regressions[0]['baseline'] is not None
+
+    # Test a new fingerprint failing to explain is explained again later
+    query = 'FOR doc IN @@col FILTER doc.foo == @val RETURN doc'
+    with assert_raises(AQLQueryExecuteError):
+        await db.aql.execute(query, bind_vars={'@col': col_name, 'val': 1})
+    await asyncio.sleep(0.5)
+    assert plan_cache.claim(get_query_fingerprint(query)) is True
+
+    db.aql.disable_plan_cache()
+    assert db.aql.plan_cache is None
@@ -7,6 +7,7 @@ from aioarangodb.connection import (
     JWTSuperuserConnection
 )
 from aioarangodb.exceptions import (
+    DocumentInsertError,
     JWTAuthError,
     # JWTSecretListError,
     # JWTSecretReloadError,
@@ -123,3 +124,28 @@ async def test_auth_jwt_expiry(client, sys_db, db_name, root_password, secret):
     with assert_raises(ServerVersionError) as err:
         await db.version()
     assert err.value.error_code == FORBIDDEN
+
+
+async def test_auth_jwt_expiry_streamed(client, col, db_name, root_password,
+                                        secret):
+    db = await client.db(db_name, 'root', root_password, auth_method='jwt')
+    collection = db.collection(col.name)
+    expired_token = generate_jwt(secret, exp=0)
+
+    async def documents(start):
+        for number in range(start, start + 10):
+            yield {'_key': str(number)}
+
+    # Test token refresh before sending a streamed body.
+    db.conn._token_exp = 0
+    db.conn._auth_header = 'bearer {}'.format(expired_token)
+    result = await collection.import_stream(documents(0))
+    assert result['created'] == 10
+    assert await col.count() == 10
+
+    # Test streamed bodies are not sent again after the token is rejected.
+    db.conn._auth_header = 'bearer {}'.format(expired_token)
+    with assert_raises(DocumentInsertError) as err:
+        await collection.import_stream(documents(10))
+    assert err.value.http_code == 401
+    assert await col.count() == 10
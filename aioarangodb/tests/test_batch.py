@@ -84,6 +84,21 @@ async def test_batch_execute_with_result(db, col, docs):
     assert err.value.error_code == 1210
 
 
+async def test_batch_prepared_query(db, col, docs):
+    await col.import_bulk(docs)
+    query = await db.aql.prepare(
+        'FOR d IN @@col FILTER d._key == @key RETURN d'
+    )
+    async with db.begin_batch_execution(return_result=True) as batch_db:
+        query = query.using(batch_db)
+        job1 = await query.execute({'@col': col.name, 'key': docs[0]['_key']})
+        job2 = await query.execute({'@col': col.name, 'key': docs[1]['_key']})
+        assert job1.status() == 'pending'
+
+    assert await extract('_key', job1.result()) == [docs[0]['_key']]
+    assert await extract('_key', job2.result()) == [docs[1]['_key']]
+
+
 async def test_batch_empty_commit(db):
     batch_db = db.begin_batch_execution(return_result=False)
     assert await batch_db.commit() is None
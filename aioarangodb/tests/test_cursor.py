@@ -1,14 +1,21 @@
 from __future__ import absolute_import, unicode_literals
 
+import asyncio
+import gc
+import json
+
 import pytest
 
+from aioarangodb.cursor import MergedCursor, RawCursor
 from aioarangodb.exceptions import (
+    AQLQueryExecuteError,
     CursorCloseError,
     CursorCountError,
     CursorEmptyError,
     CursorNextError,
     CursorStateError,
 )
+from aioarangodb.request import Request
 from aioarangodb.tests.helpers import clean_doc
 pytestmark = pytest.mark.asyncio
 
@@ -291,3 +298,145 @@ async def test_cursor_no_count(db, col):
             _ = bool(cursor)
         assert err.value.message == 'cursor count not enabled'
         assert await cursor.fetch()
+
+
+async def test_cursor_registry(db, col, docs):
+    registry = db.conn.cursors
+    cursor = await db.aql.execute(
+        'FOR d IN {} SORT d._key RETURN d'.format(col.name),
+        batch_size=2,
+        ttl=1000
+    )
+    assert cursor.ttl == 1000
+    report = registry.report()
+    assert report['count'] == len(registry) == 1
+    assert report['cursors'][0]['id'] == cursor.id
+    assert report['cursors'][0]['ttl'] == 1000
+    assert report['cursors'][0]['age'] >= 0
+
+    # Depleted cursors are removed from the registry.
+    assert len([d async for d in cursor]) == len(docs)
+    assert registry.report()['count'] == 0
+
+    # Cursors garbage collected before depletion are closed in background.
+    cursor = await db.aql.execute(
+        'FOR d IN {} RETURN d'.format(col.name),
+        batch_size=2
+    )
+    cursor_id = cursor.id
+    del cursor
+    gc.collect()
+    assert registry.report()['count'] == 0
+    assert registry.report()['reaped'] == 1
+    await asyncio.sleep(0.1)
+    resp = await db.conn.send_request(
+        Request(method='put', endpoint='/_api/cursor/{}'.format(cursor_id))
+    )
+    assert resp.error_code == 1600
+
+    cursor = await db.aql.execute(
+        'FOR d IN {} RETURN d'.format(col.name),
+        batch_size=2
+    )
+    assert await registry.close_all() == 1
+    with pytest.raises(CursorCloseError) as err:
+        await cursor.close(ignore_missing=False)
+    assert err.value.error_code == 1600
+
+
+async def test_cursor_prefetch(db, col, docs):
+    cursor = await db.aql.execute(
+        'FOR d IN {} SORT d._key RETURN d'.format(col.name),
+        batch_size=2
+    )
+    assert cursor.prefetch() is cursor.prefetch()
+    await cursor.prefetch()
+    assert len(cursor.batch()) == 4
+    assert await clean_doc(cursor) == docs
+    assert cursor.prefetch() is None
+
+
+async def test_raw_cursor(db, col, docs):
+    cursor = await db.aql.execute(
+        'FOR d IN {} SORT d._key RETURN d'.format(col.name),
+        count=True,
+        batch_size=4,
+        raw=True
+    )
+    assert isinstance(cursor, RawCursor)
+    assert 'RawCursor' in repr(cursor)
+    assert cursor.count() == len(cursor) == 6
+    assert cursor.has_more() is True
+
+    batches = [batch async for batch in cursor]
+    assert len(batches) == 2
+    assert all(isinstance(batch, bytes) for batch in batches)
+    results = [doc for batch in batches for doc in json.loads(batch)]
+    assert await clean_doc(results) == docs
+    assert cursor.has_more() is False
+    assert cursor.statistics()['modified'] == 0
+
+    with pytest.raises(AQLQueryExecuteError) as err:
+        await db.aql.execute('INVALID QUERY', raw=True)
+    assert err.value.error_code == 1501
+
+
+async def test_cursor_timings(db, col, docs):
+    cursor = await db.aql.execute(
+        'FOR d IN {} SORT d._key RETURN d'.format(col.name),
+        batch_size=2
+    )
+    timings = cursor.timings()
+    assert timings['time_to_first_batch'] > 0
+    assert timings['count'] == 2
+    assert len(timings['batches']) == 1
+
+    assert len([doc async for doc in cursor]) == len(docs)
+    timings = cursor.timings()
+    assert timings['count'] == len(docs)
+    assert timings['size'] > 0
+    assert timings['execution_time'] > 0
+    assert timings['fetch_time'] >= timings['time_to_first_batch']
+    assert len(timings['batches']) == 3
+    for batch in timings['batches']:
+        assert batch['count'] == 2
+        assert batch['latency'] > 0
+        assert batch['deserialize'] > 0
+        assert batch['idle'] >= 0
+
+
+async def test_merged_cursor(db, col, docs):
+    query = 'FOR d IN {} FILTER d.val % 2 == @rem SORT d.val {} RETURN d'
+    cursors = [
+        await db.aql.execute(
+            query.format(col.name, 'ASC'),
+            bind_vars={'rem': rem},
+            batch_size=1
+        )
+        for rem in (0, 1)
+    ]
+    cursor = MergedCursor(cursors, key=lambda doc: doc['val'])
+    assert 'MergedCursor' in repr(cursor)
+    values = [doc['val'] async for doc in cursor]
+    assert values == sorted(doc['val'] for doc in docs)
+
+    # Test descending order and early close
+    cursors = [
+        await db.aql.execute(
+            query.format(col.name, 'DESC'),
+            bind_vars={'rem': rem},
+            batch_size=1
+        )
+        for rem in (0, 1)
+    ]
+    async with MergedCursor(
+            cursors, key=lambda doc: doc['val'], reverse=True) as cursor:
+        first = await cursor.next()
+        second = await cursor.next()
+    assert first['val'] == max(doc['val'] for doc in docs)
+    assert first['val'] > second['val']
+    for closed_cursor in cursors:
+        with pytest.raises(CursorNextError):
+            await closed_cursor.fetch()
+    with pytest.raises(StopAsyncIteration):
+        await cursor.next()
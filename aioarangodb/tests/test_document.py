@@ -1,5 +1,7 @@
 from __future__ import absolute_import, unicode_literals
 
+import json
+
 import pytest
 from six import string_types
 
@@ -14,6 +16,7 @@ from aioarangodb.exceptions import (
     DocumentReplaceError,
     DocumentRevisionError,
     DocumentUpdateError,
+    DocumentWriterStateError,
     DocumentKeysError,
     DocumentIDsError,
     DocumentParseError
@@ -26,6 +29,7 @@ from aioarangodb.tests.helpers import (
     generate_col_name,
     empty_collection
 )
+from aioarangodb.utils import compute_patch
 pytestmark = pytest.mark.asyncio
 
 
@@ -240,12 +244,113 @@ async def test_document_insert_many(col, bad_col, docs):
         assert isinstance(result['old'], dict)
         assert isinstance(result['_old_rev'], string_types)
 
+    # Test insert_many with overwrite modes
+    patches = [{'_key': doc['_key'], 'sub': {'a': 1}} for doc in docs]
+    results = await col.insert_many(patches, overwrite_mode='update')
+    assert all('_old_rev' in result for result in results)
+    patches = [
+        {'_key': doc['_key'], 'val': None, 'sub': {'b': 2}} for doc in docs
+    ]
+    await col.insert_many(
+        patches,
+        overwrite_mode='update',
+        keep_none=False,
+        merge=False
+    )
+    for doc in docs:
+        stored = await col.get(doc['_key'])
+        assert 'val' not in stored
+        assert stored['sub'] == {'b': 2}
+
+    results = await col.insert_many(docs, overwrite_mode='ignore')
+    assert all(isinstance(result, dict) for result in results)
+    assert 'val' not in await col.get(docs[0]['_key'])
+
+    results = await col.insert_many(docs, overwrite_mode='conflict')
+    for error in results:
+        assert isinstance(error, DocumentInsertError)
+        assert error.error_code == 1210
+
     # Test get with bad database
     with assert_raises(DocumentInsertError) as err:
         await bad_col.insert_many(docs)
     assert err.value.error_code in {11, 1228}
 
 
+async def test_document_upsert_many(col, bad_col, docs):
+    # Test upsert_many inserting new documents
+    results = await col.upsert_many(docs[:3])
+    assert [result['_key'] for result in results] == \
+        [doc['_key'] for doc in docs[:3]]
+    assert all('_old_rev' not in result for result in results)
+
+    # Test upsert_many updating existing documents in chunks
+    patches = [
+        {'_key': doc['_key'], 'val': doc['val'] * 10, 'sub': {'a': 1}}
+        for doc in docs
+    ]
+    results = await col.upsert_many(patches, chunk_size=2, concurrency=2)
+    assert ['_old_rev' in result for result in results] == \
+        [True] * 3 + [False] * (len(docs) - 3)
+    for doc in docs:
+        stored = await col.get(doc['_key'])
+        assert stored['val'] == doc['val'] * 10
+        assert stored['sub'] == {'a': 1}
+    assert (await col.get(docs[0]['_key']))['text'] == docs[0]['text']
+
+    # Test upsert_many with merge and keep_none
+    results = await col.upsert_many(
+        [{'_key': docs[0]['_key'], 'text': None, 'sub': {'b': 2}}],
+        keep_none=False,
+        return_new=True
+    )
+    assert 'text' not in results[0]['new']
+    assert results[0]['new']['sub'] == {'a': 1, 'b': 2}
+
+    # Test upsert_many replacing existing documents
+    results = await col.upsert_many(
+        [{'_key': docs[0]['_key'], 'foo': 1}],
+        replace=True,
+        return_old=True
+    )
+    assert results[0]['old']['val'] == docs[0]['val'] * 10
+    assert 'val' not in await col.get(docs[0]['_key'])
+
+    # Test upsert_many with bad database
+    with assert_raises(DocumentInsertError) as err:
+        await bad_col.upsert_many(docs)
+    assert err.value.error_code in {11, 1228}
+
+
+async def test_document_bulk_chunks(col, bad_col, docs):
+    keys = [doc['_key'] for doc in docs]
+
+    # Test insert_many split by document count
+    results = await col.insert_many(docs, chunk_size=2, concurrency=2)
+    assert [result['_key'] for result in results] == keys
+    assert await col.count() == len(docs)
+
+    # Test update_many split by serialized size
+    updates = [{'_key': key, 'val': 0} for key in keys]
+    results = await col.update_many(updates, chunk_bytes=1)
+    assert [result['_key'] for result in results] == keys
+    assert all((await col.get(key))['val'] == 0 for key in keys)
+
+    # Test replace_many with silent set to True
+    assert await col.replace_many(docs, chunk_size=4, silent=True) is True
+    assert (await col.get(keys[0]))['val'] == docs[0]['val']
+
+    # Test delete_many with a missing document in one chunk
+    results = await col.delete_many(keys + ['missing'], chunk_size=3)
+    assert [result['_key'] for result in results[:-1]] == keys
+    assert isinstance(results[-1], DocumentDeleteError)
+    assert await col.count() == 0
+
+    # Test chunks failing as a whole
+    with assert_raises(DocumentInsertError):
+        await bad_col.insert_many(docs, chunk_size=2)
+
+
 async def test_document_update(col, docs):
     doc = docs[0]
     await col.insert(doc)
@@ -561,6 +666,71 @@ async def test_document_update_many(col, bad_col, docs):
     assert str(err.value) == 'field "_key" or "_id" required'
 
 
+async def test_document_update_diff(col, bad_col, docs):
+    doc = docs[0]
+    await col.insert({
+        '_key': doc['_key'],
+        'val': doc['val'],
+        'text': doc['text'],
+        'sub': {'a': 1, 'b': 2}
+    })
+    old = await col.get(doc['_key'])
+
+    # Test compute_patch with changed, removed and nested fields
+    new = {'_key': doc['_key'], 'val': 100, 'sub': {'a': 1, 'c': 3}}
+    assert compute_patch(old, new) == {
+        'val': 100,
+        'text': None,
+        'sub': {'b': None, 'c': 3}
+    }
+    assert compute_patch(old, dict(old)) == {}
+    assert compute_patch({'val': 1}, {'val': True}) == {'val': True}
+    assert compute_patch({'val': None}, {}) == {'val': None}
+
+    # Test update_diff sending the patch
+    result = await col.update_diff(old, new, return_new=True)
+    assert result['_old_rev'] == old['_rev']
+    assert await clean_doc(result['new']) == await clean_doc(new)
+    assert await clean_doc(await col.get(doc['_key'])) == \
+        await clean_doc(new)
+
+    # Test update_diff with no changes
+    current = await col.get(doc['_key'])
+    result = await col.update_diff(current, dict(current))
+    assert result['_rev'] == current['_rev']
+    assert (await col.get(doc['_key']))['_rev'] == current['_rev']
+
+    # Test update_diff with a stale snapshot
+    with assert_raises(DocumentRevisionError) as err:
+        await col.update_diff(old, {'val': 200})
+    assert err.value.error_code == 1200
+    assert await col.update_diff(old, {'val': 200}, check_rev=False)
+    assert (await col.get(doc['_key']))['val'] == 200
+
+    # Test update_diff_many with changed and unchanged documents
+    await col.insert_many(docs[1:])
+    olds = [await col.get(d['_key']) for d in docs[1:]]
+    pairs = [(o, dict(o, val=o['val'] * 10)) for o in olds[:2]]
+    pairs.append((olds[2], dict(olds[2])))
+    results = await col.update_diff_many(pairs, chunk_size=1)
+    assert [result['_key'] for result in results] == \
+        [o['_key'] for o in olds[:3]]
+    assert '_old_rev' in results[0] and '_old_rev' in results[1]
+    assert results[2]['_rev'] == olds[2]['_rev']
+    for o in olds[:2]:
+        assert (await col.get(o['_key']))['val'] == o['val'] * 10
+
+    # Test update_diff_many with stale snapshots
+    results = await col.update_diff_many(pairs[:1])
+    assert isinstance(results[0], DocumentRevisionError)
+    assert await col.update_diff_many(pairs[:1], silent=True) is True
+
+    # Test update_diff with bad database
+    with assert_raises(DocumentUpdateError) as err:
+        await bad_col.update_diff(old, new)
+    assert err.value.error_code in {11, 1228}
+
+
 async def test_document_update_match(col, bad_col, docs):
     # Set up test documents
     await col.import_bulk(docs)
@@ -1133,6 +1303,13 @@ async def test_document_find(col, bad_col, docs):
     assert [x async for x in await col.find({'val': 3})] == []
     assert [x async for x in await col.find({'val': 4})] == []
 
+    # Test find with nested filters and projections
+    await col.insert({'_key': 'nested', 'val': 1, 'sub': {'a': 1, 'b': 2}})
+    cursor = await col.find({'sub': {'a': 1}}, fields=['_key'])
+    assert [x async for x in cursor] == [{'_key': 'nested'}]
+    found = [x async for x in await col.find({'sub.b': 2, 'val': 1})]
+    assert [doc['_key'] for doc in found] == ['nested']
+
     # Test find with bad database
     with assert_raises(DocumentGetError) as err:
         await bad_col.find({'val': 1})
@@ -1592,7 +1769,7 @@ async def test_document_get_many(col, bad_col, docs):
     await col.import_bulk(docs)
 
     # Test get_many missing documents
-    assert await col.get_many([generate_doc_key()]) == []
+    assert await col.get_many([generate_doc_key()]) == [None]
 
     # Test get_many existing documents
     result = await col.get_many(docs[:1])
@@ -1602,11 +1779,35 @@ async def test_document_get_many(col, bad_col, docs):
     result = await col.get_many(docs)
     assert await clean_doc(result) == docs
 
+    # Test get_many with keys, IDs and missing documents in input order
+    missing_key = generate_doc_key()
+    handles = [
+        docs[2]['_key'],
+        missing_key,
+        col.name + '/' + docs[0]['_key'],
+        {'_id': col.name + '/' + docs[1]['_key']},
+    ]
+    result = await col.get_many(handles)
+    assert result[1] is None
+    assert [doc['_key'] for doc in result if doc is not None] == \
+        [docs[2]['_key'], docs[0]['_key'], docs[1]['_key']]
+
+    # Test get_many with IDs of another collection
+    for handle in ('foo/' + docs[0]['_key'], {'_id': 'foo/bar'}, {}):
+        with assert_raises(DocumentParseError):
+            await col.get_many([docs[0]['_key'], handle])
+
+    # Test get_many in concurrent chunks
+    keys = [doc['_key'] for doc in reversed(docs)] + [missing_key]
+    result = await col.get_many(keys, chunk_size=2, concurrency=2)
+    assert result[-1] is None
+    assert [doc['_key'] for doc in result[:-1]] == keys[:-1]
+
     # Test get_many in empty collection
     await empty_collection(col)
     assert await col.get_many([]) == []
-    assert await col.get_many(docs[:1]) == []
-    assert await col.get_many(docs[:3]) == []
+    assert await col.get_many(docs[:1]) == [None]
+    assert await col.get_many(docs[:3]) == [None, None, None]
 
     with assert_raises(DocumentGetError) as err:
         await bad_col.get_many(docs)
@@ -1673,6 +1874,19 @@ async def test_document_all(col, bad_col, docs):
     assert cursor.count() == len(result) == 1
     assert all([await clean_doc(d) in docs for d in result])
 
+    # Test all with a streaming cursor and small batches
+    cursor = await col.all(batch_size=2, stream=True)
+    result = [x async for x in cursor]
+    assert cursor.count() is None
+    assert await clean_doc(result) == docs
+
+    # Test all with projections and an index hint
+    cursor = await col.all(fields=['_key', 'val'], index_hint='primary')
+    result = [x async for x in cursor]
+    assert sorted(result, key=lambda doc: doc['_key']) == [
+        {'_key': doc['_key'], 'val': doc['val']} for doc in docs
+    ]
+
     # Test export with bad database
     with assert_raises(DocumentGetError) as err:
         await bad_col.all()
@@ -1930,6 +2144,194 @@ async def test_document_import_bulk(col, bad_col, docs):
     assert (await col.get(doc['_key']))['bar'] == '3'
 
 
+async def test_document_import_stream(col, bad_col, docs):
+    async def generate():
+        for doc in docs:
+            yield doc
+
+    # Test import_stream from an async generator in several requests
+    result = await col.import_stream(generate(), request_size=100)
+    assert result['created'] == len(docs)
+    assert result['errors'] == 0
+    assert result['requests'] > 1
+    assert 'details' in result
+    for doc in docs:
+        assert (await col.get(doc['_key']))['val'] == doc['val']
+
+    # Test import_stream from a list with overwrite set to True
+    result = await col.import_stream(
+        [{'_id': col.name + '/' + doc['_key']} for doc in docs[:2]],
+        overwrite=True,
+        details=False
+    )
+    assert result['created'] == 2
+    assert result['requests'] == 1
+    assert 'details' not in result
+    assert await col.count() == 2
+
+    # Test import_stream with duplicates
+    result = await col.import_stream(
+        docs[:3],
+        halt_on_error=False,
+        on_duplicate='ignore'
+    )
+    assert result['created'] == 1
+    assert result['ignored'] == 2
+
+    # Test import_stream with bad database
+    with assert_raises(DocumentInsertError):
+        await bad_col.import_stream(generate())
+
+
+async def test_document_import_bulk_file(col, bad_col, docs, tmp_path):
+    path = tmp_path / 'docs.jsonl'
+    path.write_text(''.join(json.dumps(doc) + '\n' for doc in docs))
+
+    # Test import_bulk from a file in several concurrent requests
+    result = await col.import_bulk(str(path), chunk_bytes=100, concurrency=2)
+    assert result['created'] == len(docs)
+    assert result['errors'] == 0
+    assert result['requests'] > 1
+    for doc in docs:
+        assert (await col.get(doc['_key']))['val'] == doc['val']
+
+    # Test import_bulk from a file with overwrite set to True
+    result = await col.import_bulk(path, overwrite=True, chunk_bytes=100)
+    assert result['created'] == len(docs)
+    assert await col.count() == len(docs)
+
+    # Test import_bulk from an empty file
+    empty_path = tmp_path / 'empty.jsonl'
+    empty_path.write_text('')
+    result = await col.import_bulk(empty_path)
+    assert result['created'] == 0
+    assert result['requests'] == 0
+
+    # Test import_bulk from a file with bad database
+    with assert_raises(DocumentInsertError) as err:
+        await bad_col.import_bulk(path, chunk_bytes=100)
+    assert isinstance(err.value.request.data, bytes)
+
+
+async def test_document_import_values(col, bad_col, docs):
+    fields = ['_key', 'val', 'text']
+
+    # Test import_values from rows in several requests
+    rows = [(doc['_key'], doc['val'], doc['text']) for doc in docs]
+    result = await col.import_values(fields, rows, chunk_size=4)
+    assert result['created'] == len(docs)
+    assert result['errors'] == 0
+    assert result['requests'] == 2
+    for doc in docs:
+        stored = await col.get(doc['_key'])
+        assert stored['val'] == doc['val']
+        assert stored['text'] == doc['text']
+
+    # Test import_values from columns with overwrite set to True
+    columns = {
+        '_key': [doc['_key'] for doc in docs[:2]],
+        'val': [doc['val'] * 10 for doc in docs[:2]],
+        'text': ['baz', 'baz']
+    }
+    result = await col.import_values(fields, columns, overwrite=True)
+    assert result['created'] == 2
+    assert await col.count() == 2
+    assert (await col.get(docs[0]['_key']))['val'] == docs[0]['val'] * 10
+
+    # Test import_values with bad database
+    with assert_raises(DocumentInsertError):
+        await bad_col.import_values(fields, rows)
+
+
+async def test_document_cache(db, col, docs):
+    await col.import_bulk(docs)
+    doc = docs[0]
+    cache = db.enable_document_cache(max_size=2, ttl=60)
+    try:
+        assert db.document_cache is cache
+
+        # Test get populating the cache and returning copies
+        result = await col.get(doc['_key'])
+        result['val'] = -1
+        assert (await col.get(doc['_key']))['val'] == doc['val']
+        assert (await db.document(col.name + '/' + doc['_key']))['val'] == \
+            doc['val']
+        assert cache.stats()['hits'] == 2
+        assert cache.stats()['misses'] == 1
+
+        # Test get revalidating stale documents
+        cache._ttl = 0
+        assert (await col.get(doc['_key']))['val'] == doc['val']
+        assert cache.stats()['revalidations'] == 1
+        cache._ttl = 60
+
+        # Test writes invalidating the cached documents
+        await col.update({'_key': doc['_key'], 'val': 100})
+        assert len(cache) == 0
+        assert (await col.get(doc['_key']))['val'] == 100
+
+        # Test get_many with cached and missing documents
+        keys = [doc['_key'] for doc in docs[:3]] + ['missing']
+        result = await col.get_many(keys)
+        assert [d['_key'] for d in result[:3]] == keys[:3]
+        assert result[3] is None
+        assert len(cache) == 2
+        assert cache.stats()['evictions'] == 1
+        assert await col.get('missing') is None
+
+        # Test get with expected revision bypassing the cache
+        with assert_raises(DocumentRevisionError):
+            await col.get(doc['_key'], rev='0')
+    finally:
+        db.disable_document_cache()
+    assert db.document_cache is None
+
+
+async def test_document_buffered_writer(col, docs):
+    writer = col.buffered_writer(max_batch=4, linger=0.01, max_buffered=8)
+    assert writer.collection is col
+
+    # Test buffered inserts coalesced into bulk requests
+    futures = [await writer.insert(doc) for doc in docs]
+    await writer.flush()
+    assert [(await future)['_key'] for future in futures] == \
+        [doc['_key'] for doc in docs]
+    assert writer.stats()['flushes'] == 2
+    assert await col.count() == len(docs)
+
+    # Test mixed operations applied in order
+    update = await writer.update({'_key': docs[0]['_key'], 'val': 100})
+    delete = await writer.delete(docs[0]['_key'])
+    duplicate = await writer.insert(docs[1])
+    await writer.close()
+    assert (await update)['_key'] == docs[0]['_key']
+    assert (await delete)['_key'] == docs[0]['_key']
+    assert await col.count() == len(docs) - 1
+    with assert_raises(DocumentInsertError) as err:
+        await duplicate
+    assert err.value.error_code == 1210
+    assert writer.stats()['errors'] == 1
+
+    # Test operations after close
+    with assert_raises(DocumentWriterStateError):
+        await writer.insert({})
+
+    # Test documents which cannot be serialized are not buffered
+    async with col.buffered_writer(linger=0.01) as writer:
+        with pytest.raises(TypeError):
+            await writer.insert({'_key': 'bad', 'val': object()})
+        assert len(writer) == 0
+        future = await writer.insert({'_key': 'good'})
+    assert (await future)['_key'] == 'good'
+
+    # Test flush on linger and on exit of the context
+    async with col.buffered_writer(linger=0.01) as writer:
+        future = await writer.insert({'_key': 'linger'})
+        assert (await future)['_key'] == 'linger'
+        future = await writer.delete('linger')
+    assert future.done()
+
+
 async def test_document_management_via_db(db, col):
     doc1_id = col.name + '/foo'
     doc2_id = col.name + '/bar'
@@ -0,0 +1,143 @@
+from __future__ import absolute_import, unicode_literals
+
+import asyncio
+
+import pytest
+
+from aioarangodb.pipeline import fan_out
+from aioarangodb.tests.helpers import clean_doc, generate_col_name
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture(autouse=True)
+async def setup_collection(col, docs):
+    await col.import_bulk(docs)
+
+
+async def test_fan_out_ordered(db, col, docs):
+    cursor = await db.aql.execute(
+        'FOR d IN {} SORT d._key RETURN d'.format(col.name),
+        batch_size=2
+    )
+
+    async def worker(doc):
+        await asyncio.sleep(0.01 * (len(docs) - int(doc['_key'])))
+        return doc['_key']
+
+    results = [
+        key async for key in
+        fan_out(cursor, worker, concurrency=3, ordered=True)
+    ]
+    assert results == [doc['_key'] for doc in docs]
+
+
+async def test_fan_out_unordered(db, col, docs):
+    cursor = await db.aql.execute(
+        'FOR d IN {} RETURN d'.format(col.name),
+        batch_size=2
+    )
+
+    async def worker(doc):
+        return doc['_key']
+
+    results = [key async for key in fan_out(cursor, worker, concurrency=2)]
+    assert sorted(results) == sorted(doc['_key'] for doc in docs)
+
+
+async def test_fan_out_error(db, col, docs):
+    cursor = await db.aql.execute(
+        'FOR d IN {} SORT d._key RETURN d'.format(col.name),
+        batch_size=1
+    )
+
+    async def worker(doc):
+        if doc['_key'] == '2':
+            raise ValueError('bad document')
+        return doc
+
+    with pytest.raises(ValueError) as err:
+        async for _ in fan_out(cursor, worker, concurrency=2):
+            pass
+    assert str(err.value) == 'bad document'
+
+    # The abandoned cursor is closed on the server.
+    assert db.conn.cursors.report()['count'] == 0
+
+
+async def test_pipeline_stages(db, col, docs):
+    cursor = await db.aql.execute(
+        'FOR d IN {} SORT d._key RETURN d'.format(col.name),
+        batch_size=2
+    )
+    assert 'Pipeline' in repr(cursor.pipeline())
+
+    async def to_key(doc):
+        return doc['_key']
+
+    chunks = await (
+        cursor.pipeline()
+        .filter(lambda doc: doc['val'] > 1)
+        .map(to_key, concurrency=3)
+        .chunk(2)
+        .rate_limit(100)
+        .collect()
+    )
+    assert chunks == [['2', '3'], ['4', '5'], ['6']]
+
+
+async def test_pipeline_bulk_copy(db, col, docs):
+    cursor = await db.aql.execute(
+        'FOR d IN {} RETURN d'.format(col.name),
+        batch_size=2
+    )
+    target = await db.create_collection(generate_col_name())
+    async for chunk in cursor.pipeline().map(clean_doc).chunk(4):
+        await target.insert_many(chunk)
+    assert await clean_doc(await target.all()) == docs
+    await db.delete_collection(target.name)
+
+
+async def test_pipeline_tee(db, col, docs):
+    cursor = await db.aql.execute(
+        'FOR d IN {} SORT d._key RETURN d'.format(col.name),
+        batch_size=2
+    )
+    keys, values = cursor.pipeline().tee(2, queue_size=1)
+    keys, values = await asyncio.gather(
+        keys.map(lambda doc: doc['_key']).collect(),
+        values.map(lambda doc: doc['val']).collect(),
+    )
+    assert keys == [doc['_key'] for doc in docs]
+    assert values == [doc['val'] for doc in docs]
+
+
+async def test_pipeline_early_exit(db, col, docs):
+    cursor = await db.aql.execute(
+        'FOR d IN {} RETURN d'.format(col.name),
+        batch_size=1
+    )
+    stages = cursor.pipeline().map(lambda doc: doc['_key'])
+    async with stages:
+        async for _ in stages:
+            break
+    assert cursor.has_more() is True
+    assert db.conn.cursors.report()['count'] == 0
+
+    # Test closing a pipeline which was never iterated
+    cursor = await db.aql.execute(
+        'FOR d IN {} RETURN d'.format(col.name),
+        batch_size=1
+    )
+    await cursor.pipeline().filter(bool).chunk(2).aclose()
+    assert db.conn.cursors.report()['count'] == 0
+
+    # Test closing tee branches
+    cursor = await db.aql.execute(
+        'FOR d IN {} RETURN d'.format(col.name),
+        batch_size=1
+    )
+    first, second = cursor.pipeline().tee(2)
+    await first.aclose()
+    assert db.conn.cursors.report()['count'] == 1
+    await second.aclose()
+    assert db.conn.cursors.report()['count'] == 0
@@ -1,7 +1,9 @@
 from __future__ import absolute_import, unicode_literals
 
 import logging
+import re
 from contextlib import contextmanager
+from functools import lru_cache
 
 from six import string_types
 
@@ -73,3 +75,75 @@ def is_none_or_str(obj):
     :rtype: bool
     """
     return obj is None or isinstance(obj, string_types)
+
+
+_QUERY_TOKENS = re.compile(
+    r'(?P<space>(?:\s|//[^\n]*|/\*.*?\*/)+)'
+    r'|(?P<name>`(?:[^`\\]|\\.)*`|\u00b4(?:[^\u00b4\\]|\\.)*\u00b4)'
+    r'|(?P<string>\'(?:[^\'\\]|\\.)*\'|"(?:[^"\\]|\\.)*")'
+    r'|(?P<number>\b\d+(?:\.\d+)?(?:[eE][+-]?\d+)?\b)',
+    re.DOTALL
+)
+
+
+def _replace_query_token(match):
+    kind = match.lastgroup
+    if kind == 'space':
+        return ' '
+    if kind == 'name':
+        return match.group()
+    return '?'
+
+
+@lru_cache(maxsize=1024)
+def get_query_fingerprint(query):
+    """Return the fingerprint of an AQL query.
+
+    Comments are stripped, whitespace is collapsed and string and number
+    literals are replaced with "?", so that queries which differ only in
+    their literal values share the same fingerprint.
+
+    :param query: AQL query.
+    :type query: str | unicode
+    :return: Normalized query text.
+    :rtype: str | unicode
+    """
+    return _QUERY_TOKENS.sub(_replace_query_token, query).strip()
+
+
+def compute_patch(old, new):
+    """Return the minimal patch which updates a document to a new version.
+
+    Changed and added fields are set to their new values, and fields missing
+    from **new** are set to None. Sub-dictionaries are compared recursively,
+    so only their changed fields are included. The patch must be applied with
+    merge set to True and keep_none set to False (i.e. fields with value None
+    are treated as missing). System fields "_id", "_key" and "_rev" are
+    ignored.
+
+    :param old: Snapshot of the document.
+    :type old: dict
+    :param new: New version of the document.
+    :type new: dict
+    :return: Patch, empty if the versions are equal.
+    :rtype: dict
+    """
+    return _compute_patch(old, new, ('_id', '_key', '_rev'))
+
+
+def _compute_patch(old, new, ignored=()):
+    patch = {}
+    for field, value in new.items():
+        if field in ignored:
+            continue
+        old_value = old.get(field)
+        if isinstance(value, dict) and isinstance(old_value, dict):
+            sub_patch = _compute_patch(old_value, value)
+            if sub_patch:
+                patch[field] = sub_patch
+        elif value != old_value or type(value) is not type(old_value):
+            patch[field] = value
+    for field in old:
+        if field not in new and field not in ignored:
+            patch[field] = None
+    return patch
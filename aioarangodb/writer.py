@@ -0,0 +1,287 @@
+from __future__ import absolute_import, unicode_literals
+
+__all__ = ['BufferedWriter']
+
+import asyncio
+
+from .exceptions import DocumentWriterStateError
+
+
+class BufferedWriter(object):
+    """Write-behind buffer coalescing document operations into bulk requests.
+
+    Operations are buffered and sent with the bulk methods of the collection
+    (e.g. :func:`arango.collection.StandardCollection.insert_many`) once
+    **max_batch** operations or **max_bytes** serialized characters are
+    buffered, or **linger** seconds after the first buffered operation.
+    Consecutive operations of the same type are sent in one request, and
+    runs of different types are sent in order.
+
+    Each operation returns a future which resolves to the document metadata,
+    or to the exception if the operation fails. Buffered and in-flight
+    operations count towards **max_buffered**. Once the limit is reached,
+    new operations wait for earlier ones to complete.
+
+    :param collection: Standard collection API wrapper.
+    :type collection: arango.collection.StandardCollection
+    :param max_batch: Max number of operations per flush.
+    :type max_batch: int
+    :param max_bytes: Max serialized size of the documents per flush, or None
+        to not serialize documents in advance to measure them.
+    :type max_bytes: int | None
+    :param linger: Max time in seconds an operation is buffered.
+    :type linger: int | float
+    :param max_buffered: Max number of buffered and in-flight operations. If
+        not given, four times the value of **max_batch** is used.
+    :type max_buffered: int
+    :param concurrency: Max number of flushes in flight. Flushes are applied
+        in order only if set to 1.
+    :type concurrency: int
+    :param check_rev: If set to True, revisions of updated, replaced and
+        deleted documents (if given) are compared against the revisions of
+        target documents.
+    :type check_rev: bool
+    :param sync: Block until operations are synchronized to disk.
+    :type sync: bool
+    """
+
+    def __init__(self,
+                 collection,
+                 max_batch=1000,
+                 max_bytes=1 << 23,
+                 linger=0.05,
+                 max_buffered=None,
+                 concurrency=1,
+                 check_rev=True,
+                 sync=None):
+        assert max_batch > 0, 'max_batch must be a positive int'
+        assert max_bytes is None or max_bytes > 0, \
+            'max_bytes must be a positive int'
+        assert linger >= 0, 'linger must not be negative'
+        assert concurrency > 0, 'concurrency must be a positive int'
+        assert collection.context == 'default', \
+            'buffered writes require the default execution context'
+        if max_buffered is None:
+            max_buffered = max_batch * 4
+        assert max_buffered >= max_batch, 'max_buffered must be >= max_batch'
+
+        self._collection = collection
+        self._max_batch = max_batch
+        self._max_bytes = max_bytes
+        self._linger = linger
+        self._check_rev = check_rev
+        self._sync = sync
+        self._space = asyncio.Semaphore(max_buffered)
+        self._senders = asyncio.Semaphore(concurrency)
+        self._buffer = []
+        self._bytes = 0
+        self._timer = None
+        self._tasks = set()
+        self._closed = False
+        self._in_flight = 0
+        self._flushes = 0
+        self._errors = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_):
+        await self.close()
+
+    def __len__(self):
+        return len(self._buffer)
+
+    def __repr__(self):
+        return '<BufferedWriter {}>'.format(self._collection.name)
+
+    @property
+    def collection(self):
+        """Return the collection written to.
+
+        :return: Standard collection API wrapper.
+        :rtype: arango.collection.StandardCollection
+        """
+        return self._collection
+
+    async def insert(self, document):
+        """Buffer the insert of a new document.
+
+        :param document: New document. If it contains the "_key" or "_id"
+            field, the value is used as the key of the new document.
+        :type document: dict
+        :return: Future resolving to the document metadata.
+        :rtype: asyncio.Future
+        :raise arango.exceptions.DocumentWriterStateError: If closed.
+        """
+        assert isinstance(document, dict), 'document must be a dict'
+        return await self._add('insert', document)
+
+    async def update(self, document):
+        """Buffer the update of a document.
+
+        :param document: Partial or full document with the updated values. It
+            must contain the "_id" or "_key" field.
+        :type document: dict
+        :return: Future resolving to the document metadata.
+        :rtype: asyncio.Future
+        :raise arango.exceptions.DocumentWriterStateError: If closed.
+        """
+        assert isinstance(document, dict), 'document must be a dict'
+        return await self._add('update', document)
+
+    async def replace(self, document):
+        """Buffer the replacement of a document.
+
+        :param document: New document to replace the old one with. It must
+            contain the "_id" or "_key" field.
+        :type document: dict
+        :return: Future resolving to the document metadata.
+        :rtype: asyncio.Future
+        :raise arango.exceptions.DocumentWriterStateError: If closed.
+        """
+        assert isinstance(document, dict), 'document must be a dict'
+        return await self._add('replace', document)
+
+    async def delete(self, document):
+        """Buffer the deletion of a document.
+
+        :param document: Document ID, key or body. Document body must contain
+            the "_id" or "_key" field.
+        :type document: str | unicode | dict
+        :return: Future resolving to the document metadata.
+        :rtype: asyncio.Future
+        :raise arango.exceptions.DocumentWriterStateError: If closed.
+        """
+        return await self._add('delete', document)
+
+    async def _add(self, operation, document):
+        """Buffer an operation, waiting for space if the buffer is full.
+
+        :param operation: Operation name.
+        :type operation: str | unicode
+        :param document: Document or document handle.
+        :type document: str | unicode | dict
+        :return: Future resolving to the operation result.
+        :rtype: asyncio.Future
+        """
+        if self._closed:
+            raise DocumentWriterStateError('writer is closed')
+        # Serialize upfront, so that a document which cannot be serialized
+        # fails on its own instead of failing the whole batch on flush.
+        size = len(self._collection.conn.serialize(document))
+        await self._space.acquire()
+        if self._closed:
+            self._space.release()
+            raise DocumentWriterStateError('writer is closed')
+
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+        self._buffer.append((operation, document, future))
+        self._bytes += size
+
+        if len(self._buffer) >= self._max_batch or (
+                self._max_bytes is not None and
+                self._bytes >= self._max_bytes):
+            self._flush_buffer()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._linger, self._flush_buffer)
+        return future
+
+    def _flush_buffer(self):
+        """Send the buffered operations in the background."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._buffer:
+            return
+        batch, self._buffer, self._bytes = self._buffer, [], 0
+        self._in_flight += len(batch)
+        self._flushes += 1
+        task = asyncio.ensure_future(self._send(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, batch):
+        """Send runs of operations of the same type in order.
+
+        :param batch: Buffered operations.
+        :type batch: [(str | unicode, str | unicode | dict, asyncio.Future)]
+        """
+        start = 0
+        try:
+            async with self._senders:
+                while start < len(batch):
+                    end = start + 1
+                    while end < len(batch) and \
+                            batch[end][0] == batch[start][0]:
+                        end += 1
+                    await self._send_run(batch[start:end])
+                    start = end
+        finally:
+            # Operations are left over only if the flush was cancelled.
+            for _, _, future in batch[start:]:
+                self._in_flight -= 1
+                self._space.release()
+                future.cancel()
+
+    async def _send_run(self, run):
+        """Send operations of the same type in a single bulk request.
+
+        :param run: Buffered operations of the same type.
+        :type run: [(str | unicode, str | unicode | dict, asyncio.Future)]
+        """
+        operation = run[0][0]
+        kwargs = {
+            'sync': self._sync,
+            'chunk_size': len(run),
+            'concurrency': 1
+        }
+        if self._max_bytes is not None:
+            kwargs['chunk_bytes'] = max(self._max_bytes, 1 << 23)
+        if operation != 'insert':
+            kwargs['check_rev'] = self._check_rev
+        method = getattr(self._collection, operation + '_many')
+
+        try:
+            results = await method([item[1] for item in run], **kwargs)
+        except Exception as err:
+            results = [err] * len(run)
+        for (_, _, future), result in zip(run, results):
+            self._in_flight -= 1
+            self._space.release()
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                self._errors += 1
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    async def flush(self):
+        """Send all buffered operations and wait for all in-flight ones.
+
+        Errors of individual operations are not raised, but set on their
+        futures.
+        """
+        self._flush_buffer()
+        while self._tasks:
+            await asyncio.wait(list(self._tasks))
+
+    async def close(self):
+        """Flush all buffered operations and stop accepting new ones."""
+        self._closed = True
+        await self.flush()
+
+    def stats(self):
+        """Return the writer statistics.
+
+        :return: Number of buffered and in-flight operations, flushes and
+            failed operations.
+        :rtype: dict
+        """
+        return {
+            'buffered': len(self._buffer),
+            'in_flight': self._in_flight,
+            'flushes': self._flushes,
+            'errors': self._errors
+        }